@@ -5,11 +5,127 @@ Uninstall Helper GUI - Graphical user interface for the uninstall helper tool.
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-import subprocess
 import threading
+import queue
 import sys
 import os
 
+from result_model import COLUMNS, KINDS, ResultModel, ResultRow
+from uninstall_helper import UninstallHelper
+from uninstall_helper.user_residue import format_size, tree_size
+
+KIND_LABELS = {"process": "进程", "path": "路径", "package": "软件包"}
+
+
+class VirtualTable(ttk.Frame):
+    """
+    Treeview that only holds the rows currently on screen.
+    
+    The rows live in a ResultModel; scrolling moves a window over the
+    model's view and rewrites the few Treeview items in place, so tens of
+    thousands of results cost no more than a screenful.  Clicking a row
+    toggles its selection, clicking a heading sorts by that column.
+    """
+    
+    def __init__(self, parent, model, on_change=None):
+        super().__init__(parent)
+        self.model = model
+        self.on_change = on_change
+        self.offset = 0
+        self._keys = []
+        
+        self.tree = ttk.Treeview(self, columns=COLUMNS, show="headings", selectmode="none", height=15)
+        headings = {"kind": "类型", "name": "名称", "detail": "详情", "size": "大小"}
+        widths = {"kind": 70, "name": 300, "detail": 300, "size": 90}
+        for column in COLUMNS:
+            self.tree.heading(column, text=headings[column], command=lambda c=column: self.sort(c))
+            self.tree.column(column, width=widths[column], stretch=column in ("name", "detail"),
+                             anchor=tk.E if column == "size" else tk.W)
+        self.tree.tag_configure("selected", background="#cde8ff")
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        
+        self.tree.bind("<Configure>", lambda event: self.redraw())
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-1))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(1))
+    
+    def page_size(self):
+        """Number of rows that fit in the widget."""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        height = self.tree.winfo_height()
+        if height <= 1:
+            return int(self.tree.cget("height"))
+        # One row's worth of height goes to the headings
+        return max(1, height // row_height - 1)
+    
+    def redraw(self):
+        """Rewrite the on-screen items from the model's view."""
+        total = len(self.model)
+        page = self.page_size()
+        self.offset = max(0, min(self.offset, total - page))
+        rows = self.model.visible(self.offset, page)
+        
+        items = self.tree.get_children()
+        for i, row in enumerate(rows):
+            values = (KIND_LABELS[row.kind], row.name, row.detail,
+                      "" if row.size is None else format_size(row.size))
+            tags = ("selected",) if row.key in self.model.selected else ()
+            if i < len(items):
+                self.tree.item(items[i], values=values, tags=tags)
+            else:
+                self.tree.insert("", tk.END, values=values, tags=tags)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        self._keys = [row.key for row in rows]
+        
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(rows)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+    
+    def yview(self, *args):
+        """Scrollbar callback."""
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.model))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.offset += step * self.page_size() if args[2] == "pages" else step
+        self.redraw()
+    
+    def scroll(self, rows):
+        """Scroll by a number of rows."""
+        self.offset += rows * 3
+        self.redraw()
+        return "break"
+    
+    def sort(self, column):
+        """Sort by a column; clicking the same heading again reverses the order."""
+        reverse = self.model.sort_column == column and not self.model.sort_reverse
+        self.model.sort_by(column, reverse)
+        self.offset = 0
+        self.redraw()
+    
+    def _on_click(self, event):
+        if self.tree.identify_region(event.x, event.y) != "cell":
+            return None
+        item = self.tree.identify_row(event.y)
+        if not item:
+            return "break"
+        index = self.tree.index(item)
+        if index < len(self._keys):
+            self.model.toggle(self._keys[index])
+            self.redraw()
+            if self.on_change:
+                self.on_change()
+        return "break"
+
+
 class UninstallHelperGUI:
     def __init__(self, root):
         self.root = root
@@ -25,6 +141,11 @@ class UninstallHelperGUI:
         # 设置样式
         self.setup_styles()
         
+        # 检测结果（表格只显示其中可见的行）
+        self.model = ResultModel()
+        self.results_queue = queue.Queue()
+        self.helper = None
+        
         # 创建界面
         self.create_widgets()
         
@@ -33,7 +154,7 @@ class UninstallHelperGUI:
         
         # 权限状态
         self.has_permissions = self.check_permissions()
-        
+    
     def setup_styles(self):
         """设置界面样式"""
         style = ttk.Style()
@@ -180,14 +301,55 @@ class UninstallHelperGUI:
         # 结果显示区域
         ttk.Label(main_frame, text="检测结果:").grid(row=6, column=0, sticky=tk.W, pady=(10, 5))
         
-        # 创建带滚动条的文本区域
-        result_frame = ttk.Frame(main_frame)
-        result_frame.grid(row=7, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
-        
-        # 配置网格权重使文本区域可扩展
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.grid(row=7, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         main_frame.rowconfigure(7, weight=1)
+        
+        # 结果列表：过滤栏 + 虚拟表格 + 选择操作
+        table_frame = ttk.Frame(self.notebook, padding=5)
+        table_frame.columnconfigure(0, weight=1)
+        table_frame.rowconfigure(1, weight=1)
+        self.notebook.add(table_frame, text="结果列表")
+        
+        filter_frame = ttk.Frame(table_frame)
+        filter_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 5))
+        ttk.Label(filter_frame, text="过滤:").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *args: self.apply_filter())
+        ttk.Entry(filter_frame, textvariable=self.filter_var, width=30).pack(side=tk.LEFT, padx=5)
+        self.kind_vars = {}
+        for kind in KINDS:
+            self.kind_vars[kind] = tk.BooleanVar(value=True)
+            ttk.Checkbutton(
+                filter_frame,
+                text=KIND_LABELS[kind],
+                variable=self.kind_vars[kind],
+                command=self.apply_filter
+            ).pack(side=tk.LEFT, padx=(5, 0))
+        self.count_label = ttk.Label(filter_frame, text="", foreground="gray")
+        self.count_label.pack(side=tk.RIGHT)
+        
+        self.table = VirtualTable(table_frame, self.model, on_change=self.update_counts)
+        self.table.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        action_frame = ttk.Frame(table_frame)
+        action_frame.grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Button(action_frame, text="全选", command=lambda: self.select_all(True), width=8).pack(side=tk.LEFT)
+        ttk.Button(action_frame, text="取消选择", command=lambda: self.select_all(False), width=8).pack(
+            side=tk.LEFT, padx=5)
+        self.act_btn = ttk.Button(
+            action_frame,
+            text="⚡ 处理所选项",
+            command=self.act_on_selection,
+            width=15
+        )
+        self.act_btn.pack(side=tk.LEFT, padx=5)
+        
+        # 运行日志：命令行工具及所选项操作的输出
+        result_frame = ttk.Frame(self.notebook, padding=5)
         result_frame.columnconfigure(0, weight=1)
         result_frame.rowconfigure(0, weight=1)
+        self.notebook.add(result_frame, text="运行日志")
         
         self.result_text = scrolledtext.ScrolledText(
             result_frame,
@@ -230,7 +392,7 @@ class UninstallHelperGUI:
             messagebox.showwarning("警告", "请输入软件名称")
             return
         
-        self.run_command(software, "safe")
+        self.run_detection(software)
     
     def start_uninstall(self):
         """开始卸载"""
@@ -265,7 +427,7 @@ class UninstallHelperGUI:
         
         if mode == "safe":
             # 安全模式就是检测
-            self.run_command(software, "safe")
+            self.run_detection(software)
         elif mode == "standard":
             # 标准模式需要确认
             if messagebox.askyesno("确认", f"确定要卸载 '{software}' 吗？\n\n标准模式会询问每一步操作。"):
@@ -283,74 +445,259 @@ class UninstallHelperGUI:
             ):
                 self.run_command(software, "aggressive")
     
-    def run_command(self, software, mode_flag):
-        """运行命令行工具"""
+    def set_running(self, running, status=None):
+        """切换运行状态（按钮、进度条、状态标签）"""
+        self.is_running = running
+        state = "disabled" if running else "normal"
+        self.detect_btn.config(state=state)
+        self.uninstall_btn.config(state=state)
+        self.act_btn.config(state=state)
+        if running:
+            self.progress.start()
+            self.status_label.config(text=status or "运行中...", foreground="orange")
+        else:
+            self.progress.stop()
+    
+    def log_output(self, text):
+        """从任意线程向运行日志追加输出"""
+        self.root.after(0, self.append_output, text)
+    
+    def emit_output(self, *args, **kwargs):
+        """UninstallHelper 的输出钩子（可在任意线程调用）"""
+        self.log_output(" ".join(str(arg) for arg in args) + kwargs.get("end", "\n"))
+    
+    def ask_user(self, prompt=""):
+        """UninstallHelper 的确认钩子：从工作线程在主线程弹出确认框"""
+        answer = {}
+        done = threading.Event()
+        
+        def show():
+            answer["value"] = "y" if messagebox.askyesno("确认", prompt.strip()) else "n"
+            done.set()
+        
+        self.root.after(0, show)
+        done.wait()
+        return answer["value"]
+    
+    def new_helper(self):
+        """创建输出写入运行日志、确认改为弹窗的 UninstallHelper"""
+        helper = UninstallHelper()
+        helper.emit = self.emit_output
+        helper.ask = self.ask_user
+        return helper
+    
+    def run_detection(self, software):
+        """在本进程内检测，结果边发现边加入表格"""
         if self.is_running:
             messagebox.showwarning("警告", "已有任务正在运行")
             return
         
-        # 构建命令
-        cmd = [sys.executable, "main.py", software]
-        if mode_flag == "safe":
-            cmd.append("--safe")
-        elif mode_flag == "aggressive":
-            cmd.append("--aggressive")
+        self.set_running(True, "检测中...")
+        self.model.clear()
+        self.table.offset = 0
+        self.table.redraw()
+        self.update_counts()
+        self.notebook.select(0)
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, f"正在检测: {software}\n" + "=" * 60 + "\n\n")
+        
+        thread = threading.Thread(target=self.stream_detection, args=(software,))
+        thread.daemon = True
+        thread.start()
+        self.root.after(100, self.drain_results)
+    
+    def stream_detection(self, software):
+        """工作线程：运行检测并把结果放入队列"""
+        put = self.results_queue.put
+        try:
+            helper = self.helper = self.new_helper()
+            
+            paths = []
+            for finding in helper.iter_discovery(software):
+                if finding.kind == "process":
+                    proc = finding.detail
+                    detail = proc.get('exe') or " ".join(proc.get('cmdline') or [])
+                    put(("row", ResultRow("process", f"{proc['name']} (PID {proc['pid']})", detail,
+                                          None, ("process", proc['pid']))))
+                else:
+                    paths.append(finding.value)
+                    # describe_path() appends the owning user for per-user residue
+                    detail = helper.describe_path(finding.value)[len(finding.value):].strip()
+                    put(("row", ResultRow("path", finding.value, detail or (finding.source or ""),
+                                          None, ("path", finding.value))))
+            
+            graph = helper.get_package_graph()
+            package = helper.resolve_package_name(software)
+            if graph is not None and package in graph:
+                put(("row", ResultRow("package", package, "软件包", graph.size([package]),
+                                      ("package", package))))
+                for orphan in graph.orphaned_by([package]):
+                    put(("row", ResultRow("package", orphan, "孤立依赖", graph.size([orphan]),
+                                          ("package", orphan))))
+            
+            # 目录大小最后计算，不拖慢结果的出现
+            for path in paths:
+                put(("size", ("path", path), tree_size(path)))
+            put(("done", None))
+        except Exception as e:
+            put(("error", str(e)))
+    
+    def drain_results(self):
+        """把队列中已到达的结果批量加入表格"""
+        rows = []
+        finished = None
+        try:
+            while len(rows) < 5000:
+                message = self.results_queue.get_nowait()
+                if message[0] == "row":
+                    rows.append(message[1])
+                elif message[0] == "size":
+                    self.model.update_size(message[1], message[2])
+                else:
+                    finished = message
+                    break
+        except queue.Empty:
+            pass
+        
+        self.model.add(rows)
+        if self.model.sort_column == "size":
+            self.model.refresh()
+        self.table.redraw()
+        self.update_counts()
+        
+        if finished is None:
+            self.root.after(100, self.drain_results)
+            return
+        self.set_running(False)
+        if finished[0] == "error":
+            self.status_label.config(text="失败 ✗", foreground="red")
+            self.append_output(f"\n[异常] {finished[1]}\n")
+        else:
+            self.status_label.config(text="检测完成 ✓", foreground="green")
+            self.append_output("\n安全模式：未执行任何更改\n")
+    
+    def apply_filter(self):
+        """按过滤文本和类型刷新表格"""
+        kinds = [kind for kind, var in self.kind_vars.items() if var.get()]
+        self.model.set_filter(self.filter_var.get(), kinds)
+        self.table.offset = 0
+        self.table.redraw()
+        self.update_counts()
+    
+    def select_all(self, selected):
+        """选择或取消选择当前显示的全部行"""
+        self.model.select_all(selected)
+        self.table.redraw()
+        self.update_counts()
+    
+    def update_counts(self):
+        """更新结果数量显示"""
+        self.count_label.config(
+            text=f"显示 {len(self.model)} / {len(self.model.rows)} 项，已选 {len(self.model.selected)} 项"
+        )
+    
+    def act_on_selection(self):
+        """终止所选进程、删除所选路径、卸载所选软件包"""
+        if self.is_running:
+            messagebox.showwarning("警告", "已有任务正在运行")
+            return
+        selection = self.model.selection()
+        if not selection or self.helper is None:
+            messagebox.showinfo("提示", "请先检测并在表格中点击选择要处理的项目")
+            return
+        
+        counts = {kind: sum(1 for row in selection if row.kind == kind) for kind in KINDS}
+        message = (f"将终止 {counts['process']} 个进程，删除 {counts['path']} 个路径，"
+                   f"卸载 {counts['package']} 个软件包。\n\n确定要继续吗？")
+        if not self.has_permissions:
+            message += "\n\n⚠️ 当前无管理员权限，操作可能会失败。"
+        if not messagebox.askyesno("确认", message):
+            return
+        
+        self.set_running(True, "处理中...")
+        self.notebook.select(1)
+        thread = threading.Thread(target=self.execute_selection, args=(selection,))
+        thread.daemon = True
+        thread.start()
+    
+    def execute_selection(self, selection):
+        """工作线程：对所选项执行操作"""
+        helper = self.helper
+        done = []
+        try:
+            self.emit_output(f"\n处理所选的 {len(selection)} 项...")
+            for row in selection:
+                if row.kind == "process" and helper.terminate_process(row.key[1]):
+                    done.append(row.key)
+            
+            paths = [row.key[1] for row in selection if row.kind == "path"]
+            if paths:
+                allowed, blocked = helper.guard_paths(paths)
+                helper.cleanup_files(allowed)
+                done += [("path", path) for path in allowed if not os.path.lexists(path)]
+            
+            packages = [row.key[1] for row in selection if row.kind == "package"]
+            if packages:
+                done += self.remove_packages(packages)
+        except Exception as e:
+            self.log_output(f"\n[异常] {str(e)}\n")
+        self.root.after(0, self.selection_finished, done)
+    
+    def remove_packages(self, packages):
+        """通过 helper 用系统包管理器一次卸载所选软件包，返回成功卸载的行键"""
+        if not self.helper.remove_packages(packages):
+            return []
+        return [("package", package) for package in packages]
+    
+    def selection_finished(self, done):
+        """所选项处理完成"""
+        self.set_running(False)
+        self.model.discard(done)
+        self.table.redraw()
+        self.update_counts()
+        self.status_label.config(text=f"已处理 {len(done)} 项 ✓", foreground="green")
+    
+    def run_command(self, software, mode_flag):
+        """在本进程内运行卸载流程"""
+        if self.is_running:
+            messagebox.showwarning("警告", "已有任务正在运行")
+            return
         
         # 更新界面状态
-        self.is_running = True
-        self.detect_btn.config(state="disabled")
-        self.uninstall_btn.config(state="disabled")
-        self.progress.start()
-        self.status_label.config(text="运行中...", foreground="orange")
+        self.set_running(True)
         
         # 清空之前的结果
+        self.notebook.select(1)
         self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(tk.END, f"正在执行: {' '.join(cmd)}\n")
+        mode_text = "激进模式" if mode_flag == "aggressive" else "标准模式"
+        self.result_text.insert(tk.END, f"正在卸载: {software} ({mode_text})\n")
         self.result_text.insert(tk.END, "=" * 60 + "\n\n")
         
-        # 在新线程中运行命令
+        # 在新线程中运行
         thread = threading.Thread(
             target=self.execute_command,
-            args=(cmd, software, mode_flag)
+            args=(software, mode_flag)
         )
         thread.daemon = True
         thread.start()
     
-    def execute_command(self, cmd, software, mode_flag):
-        """执行命令并更新界面"""
+    def execute_command(self, software, mode_flag):
+        """执行卸载并更新界面（标准模式的每一步确认以弹窗询问）"""
         try:
-            # 执行命令
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-            
-            # 实时读取输出
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    self.root.after(0, self.append_output, output)
-            
-            # 读取错误输出
-            stderr = process.stderr.read()
-            if stderr:
-                self.root.after(0, self.append_output, f"\n[错误]\n{stderr}\n")
-            
-            # 获取返回码
-            return_code = process.poll()
-            
-            # 更新界面状态
-            self.root.after(0, self.command_finished, return_code, software, mode_flag)
-            
+            helper = self.new_helper()
+            results = helper.run_uninstall(software, interactive=mode_flag != "aggressive")
+            if "error" in results:
+                self.emit_output(f"\n[错误] {results['error']}")
+                return_code = 1
+            else:
+                helper.print_summary(results)
+                return_code = 0
         except Exception as e:
-            self.root.after(0, self.append_output, f"\n[异常] {str(e)}\n")
-            self.root.after(0, self.command_finished, 1, software, mode_flag)
+            self.log_output(f"\n[异常] {str(e)}\n")
+            return_code = 1
+        
+        # 更新界面状态
+        self.root.after(0, self.command_finished, return_code, software, mode_flag)
     
     def append_output(self, text):
         """追加输出到文本区域"""
@@ -360,10 +707,7 @@ class UninstallHelperGUI:
     
     def command_finished(self, return_code, software, mode_flag):
         """命令执行完成"""
-        self.is_running = False
-        self.detect_btn.config(state="normal")
-        self.uninstall_btn.config(state="normal")
-        self.progress.stop()
+        self.set_running(False)
         
         # 显示结果
         if return_code == 0:
@@ -375,7 +719,7 @@ class UninstallHelperGUI:
                 self.append_output("安全模式：未执行任何更改\n")
             else:
                 self.append_output(f"✅ '{software}' 卸载完成\n")
-                
+        
         else:
             self.status_label.config(text="失败 ✗", foreground="red")
             self.append_output(f"\n{'=' * 60}\n")
@@ -390,6 +734,9 @@ class UninstallHelperGUI:
             return
         
         self.result_text.delete(1.0, tk.END)
+        self.model.clear()
+        self.table.redraw()
+        self.update_counts()
         self.status_label.config(text="就绪", foreground="green")
 
 def main():
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+In-memory result model for the Uninstall Helper GUI.
+
+Holds every detection result (processes, paths, packages) as plain rows and
+keeps a filtered, sorted view of row indices, so the table widget only
+has to materialise the handful of rows that are on screen.  Selection is
+kept by row key rather than by widget item, because the widget recycles
+its items while scrolling.
+"""
+
+from collections import namedtuple
+
+ResultRow = namedtuple("ResultRow", ["kind", "name", "detail", "size", "key"])
+
+KINDS = ("process", "path", "package")
+COLUMNS = ("kind", "name", "detail", "size")
+
+
+def _sort_key(column):
+    if column == "size":
+        # Unknown sizes sort before every known size
+        return lambda row: (row.size is not None, row.size or 0)
+    return lambda row: str(getattr(row, column)).lower()
+
+
+class ResultModel:
+    """Filtered and sorted view over the result rows."""
+    
+    def __init__(self):
+        self.rows = []
+        self._index = {}       # key -> position in rows
+        self._haystack = []    # lower-case text matched by the filter
+        self.view = []         # positions of the visible rows, in display order
+        self.selected = set()  # keys
+        self.filter_text = ""
+        self.kinds = set(KINDS)
+        self.sort_column = None
+        self.sort_reverse = False
+    
+    def __len__(self):
+        return len(self.view)
+    
+    def _matches(self, position):
+        return (self.rows[position].kind in self.kinds
+                and self.filter_text in self._haystack[position])
+    
+    def add(self, rows):
+        """
+        Append rows (rows whose key is already present are ignored).
+        
+        New rows are appended to the view when no sort is active, so
+        streaming results do not reorder what is on screen.
+        
+        Args:
+            rows (iterable): ResultRow tuples
+        
+        Returns:
+            int: Number of rows added
+        """
+        added = 0
+        for row in rows:
+            if row.key in self._index:
+                continue
+            position = len(self.rows)
+            self._index[row.key] = position
+            self.rows.append(row)
+            self._haystack.append(f"{row.name}\n{row.detail}".lower())
+            added += 1
+            if self.sort_column is None and self._matches(position):
+                self.view.append(position)
+        if added and self.sort_column is not None:
+            self.refresh()
+        return added
+    
+    def update_size(self, key, size):
+        """Set the size of a row once it is known."""
+        position = self._index.get(key)
+        if position is not None:
+            self.rows[position] = self.rows[position]._replace(size=size)
+    
+    def set_filter(self, text="", kinds=KINDS):
+        """Show only rows of the given kinds whose name or detail contains text."""
+        self.filter_text = text.lower()
+        self.kinds = set(kinds)
+        self.refresh()
+    
+    def sort_by(self, column, reverse=False):
+        """Sort the view by a column (None restores discovery order)."""
+        self.sort_column = column
+        self.sort_reverse = reverse
+        self.refresh()
+    
+    def refresh(self):
+        """Rebuild the view from the current filter and sort."""
+        view = [position for position in range(len(self.rows)) if self._matches(position)]
+        if self.sort_column is not None:
+            key = _sort_key(self.sort_column)
+            view.sort(key=lambda position: key(self.rows[position]), reverse=self.sort_reverse)
+        self.view = view
+    
+    def visible(self, start, count):
+        """Return the rows at view positions start .. start + count."""
+        return [self.rows[position] for position in self.view[start:start + count]]
+    
+    def toggle(self, key):
+        """Flip the selection state of a row."""
+        if key in self.selected:
+            self.selected.discard(key)
+        else:
+            self.selected.add(key)
+    
+    def select_all(self, selected=True):
+        """Select (or deselect) every row currently in the view."""
+        keys = {self.rows[position].key for position in self.view}
+        if selected:
+            self.selected |= keys
+        else:
+            self.selected -= keys
+    
+    def selection(self, kind=None):
+        """Return the selected rows, optionally of one kind, in discovery order."""
+        return [row for row in self.rows
+                if row.key in self.selected and (kind is None or row.kind == kind)]
+    
+    def discard(self, keys):
+        """Drop rows (e.g. ones that were acted on) and their selection."""
+        keys = set(keys)
+        kept = [row for row in self.rows if row.key not in keys]
+        selected = self.selected - keys
+        self.clear()
+        self.add(kept)
+        self.selected = selected
+    
+    def clear(self):
+        """Drop every row, keeping the filter and sort."""
+        self.rows = []
+        self._index = {}
+        self._haystack = []
+        self.view = []
+        self.selected = set()
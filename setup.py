@@ -16,7 +16,8 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/ai-openclaw/uninstall-helper",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests"]),
+    py_modules=["main", "gui", "result_model", "run_gui"],
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: End Users/Desktop",
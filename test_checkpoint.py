@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for resumable cleanup checkpoints
+"""
+
+import os
+import tempfile
+
+from uninstall_helper.checkpoint import CleanupCheckpoint, checkpoint_path
+from uninstall_helper.helper import UninstallHelper
+
+
+class Interrupt(Exception):
+    pass
+
+
+def _make_tree(root, dirs=4, files=5):
+    for d in range(dirs):
+        sub = os.path.join(root, f"d{d}", "nested")
+        os.makedirs(sub)
+        for f in range(files):
+            open(os.path.join(root, f"d{d}", f"f{f}"), "w").close()
+            open(os.path.join(sub, f"f{f}"), "w").close()
+    os.symlink("/etc/passwd", os.path.join(root, "link"))
+    return dirs * files * 2 + 1
+
+
+def test_interrupted_removal_resumes_without_repeating_work():
+    """A rerun continues from the saved stack and never unlinks an entry twice."""
+    with tempfile.TemporaryDirectory() as tmp:
+        target = os.path.join(tmp, "opt", "acme")
+        total = _make_tree(target)
+        state_dir = os.path.join(tmp, "state")
+        
+        unlinked = []
+        
+        def failing_unlink(path, size):
+            if len(unlinked) == 17:
+                raise Interrupt()
+            os.unlink(path)
+            unlinked.append(path)
+        
+        first = CleanupCheckpoint.open(state_dir, "acme", interval=0)
+        first.plan([target])
+        try:
+            first.remove_tree(target, unlink=failing_unlink)
+        except Interrupt:
+            pass
+        assert os.path.exists(checkpoint_path(state_dir, "acme"))
+        
+        second = CleanupCheckpoint.open(state_dir, "acme", interval=0)
+        assert second.pending == [target] and second.current == target and second.stack
+        assert second.removed == 17
+        second.plan([os.path.join(tmp, "other")])
+        assert second.pending[0] == target
+        
+        def counting_unlink(path, size):
+            os.unlink(path)
+            unlinked.append(path)
+        
+        second.remove_tree(target, unlink=counting_unlink)
+        second.complete(target)
+        assert not os.path.lexists(target)
+        assert len(unlinked) == len(set(unlinked)) == total
+        assert os.path.exists("/etc/passwd")
+        
+        second.complete(os.path.join(tmp, "other"))
+        second.finish()
+        assert not os.path.exists(checkpoint_path(state_dir, "acme"))
+
+
+def test_checkpoint_for_other_key_is_ignored():
+    """Each software name gets its own file, and a mismatched key is not loaded."""
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = CleanupCheckpoint.open(tmp, "acme suite")
+        checkpoint.plan(["/opt/acme"])
+        assert os.path.basename(checkpoint.path) == "acme_suite.json"
+        
+        assert CleanupCheckpoint.open(tmp, "acme suite").pending == ["/opt/acme"]
+        assert CleanupCheckpoint.open(tmp, "acme_suite").pending == []
+
+
+def test_symlinked_target_is_unlinked_not_walked():
+    """A target that is a symlink to a directory loses the link only; its real directory survives."""
+    with tempfile.TemporaryDirectory() as tmp:
+        real = os.path.join(tmp, "real")
+        os.makedirs(os.path.join(real, "sub"))
+        open(os.path.join(real, "keep.txt"), "w").close()
+        link = os.path.join(tmp, "link")
+        os.symlink(real, link)
+        
+        checkpoint = CleanupCheckpoint.open(os.path.join(tmp, "state"), "acme", interval=0)
+        try:
+            checkpoint.remove_tree(link)
+            assert False, "a symlinked root must be refused"
+        except NotADirectoryError:
+            pass
+        
+        helper = UninstallHelper()
+        helper.emit = lambda *args, **kwargs: None
+        helper.config = {}
+        checkpoint.plan([link])
+        assert helper.cleanup_files([link], checkpoint) == 1
+        assert not os.path.lexists(link)
+        assert sorted(os.listdir(real)) == ["keep.txt", "sub"]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the dpkg conffile audit
+"""
+
+import hashlib
+import os
+import tempfile
+
+from uninstall_helper.conffiles import (MISSING, MODIFIED, UNMODIFIED, Conffile, audit, backup,
+                                        load_conffiles, md5_file)
+from uninstall_helper.discovery import DiscoveryEngine, Finding, FunctionProvider
+from uninstall_helper.helper import UninstallHelper
+
+
+def _md5(data):
+    return hashlib.md5(data).hexdigest()
+
+
+def test_audit_sorts_conffiles_by_recorded_md5sum():
+    """Unchanged files are unmodified, edited ones modified, deleted ones missing."""
+    with tempfile.TemporaryDirectory() as tmp:
+        etc = os.path.join(tmp, "etc", "acme")
+        os.makedirs(etc)
+        shipped = b"listen = 8080\n" * 1000
+        for name, data in (("acme.conf", shipped), ("local.conf", b"edited\n"), ("empty.conf", b"")):
+            with open(os.path.join(etc, name), "wb") as f:
+                f.write(data)
+        
+        status = os.path.join(tmp, "status")
+        with open(status, "w") as f:
+            f.write("Package: acme\nStatus: install ok installed\nConffiles:\n"
+                    f" {etc}/acme.conf {_md5(shipped)}\n"
+                    f" {etc}/local.conf {_md5(b'shipped')}\n"
+                    f" {etc}/empty.conf {_md5(b'')}\n"
+                    f" {etc}/gone.conf {_md5(b'x')} obsolete\n"
+                    "\n"
+                    "Package: other\nStatus: install ok installed\nConffiles:\n"
+                    f" /etc/other.conf {_md5(b'x')}\n")
+        
+        conffiles = load_conffiles(["acme"], status)
+        assert [c.package for c in conffiles] == ["acme"] * 4
+        assert conffiles[3].obsolete and not conffiles[0].obsolete
+        
+        states = {os.path.basename(c.path): state for c, state in audit(conffiles, max_workers=3)}
+        assert states == {"acme.conf": UNMODIFIED, "local.conf": MODIFIED,
+                          "empty.conf": UNMODIFIED, "gone.conf": MISSING}
+        assert md5_file(os.path.join(etc, "acme.conf")) == _md5(shipped)
+
+
+def test_backup_keeps_package_and_path():
+    """Modified conffiles are copied below <backup_dir>/<stamp>/<package>/<path>."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conf = os.path.join(tmp, "etc", "acme.conf")
+        os.makedirs(os.path.dirname(conf))
+        with open(conf, "w") as f:
+            f.write("edited\n")
+        status = os.path.join(tmp, "status")
+        with open(status, "w") as f:
+            f.write(f"Package: acme\nStatus: install ok installed\nConffiles:\n {conf} {_md5(b'x')}\n"
+                    f" {tmp}/etc/missing.conf {_md5(b'x')}\n")
+        
+        conffiles = load_conffiles(["acme"], status)
+        saved, failed = backup(conffiles, os.path.join(tmp, "backups"), stamp="run")
+        
+        assert saved == [os.path.join(tmp, "backups", "run", "acme", conf.lstrip("/"))]
+        with open(saved[0]) as f:
+            assert f.read() == "edited\n"
+        assert [path for path, _error in failed] == [f"{tmp}/etc/missing.conf"]
+
+
+def test_purge_needs_its_own_confirmation():
+    """Declining the purge runs the remove command that came with the finding."""
+    conffile_plan = {"audit": [(Conffile("acme", "/etc/acme.conf", _md5(b"x"), False), UNMODIFIED)],
+                     "purge": True, "fallback": "true"}
+    helper = UninstallHelper()
+    helper.system = "windows"  # skips the package-name confirmation, which would ask first
+    helper.emit = lambda *args, **kwargs: None
+    answers = iter(["y", "n"])
+    helper.ask = lambda prompt: next(answers)
+    helper._discovery_engine = DiscoveryEngine()
+    helper._discovery_engine.register(FunctionProvider(
+        "package-manager", lambda query, cancel: [Finding("command", "false", detail={"conffiles": conffile_plan})],
+        kinds=("command",)))
+    
+    results = {}
+    helper._step_system_uninstall("acme", results, interactive=True)
+    assert results == {"uninstall_success": True}
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the quiet programmatic API
+"""
+
+import asyncio
+import os
+import tempfile
+
+from uninstall_helper import Detection, Plan, Uninstaller
+
+
+def test_cleanup_is_quiet_and_reports_progress(capsys):
+    """Nothing reaches stdout; the helper's output goes to the progress callback."""
+    messages = []
+    with tempfile.TemporaryDirectory() as tmp:
+        target = os.path.join(tmp, "acme")
+        os.makedirs(os.path.join(target, "bin"))
+        open(os.path.join(target, "bin", "acme"), "w").close()
+        
+        with Uninstaller(progress=lambda stage, message: messages.append((stage, message))) as un:
+            assert un.cleanup([target, os.path.join(target, "bin")]) == 1
+        assert not os.path.exists(target)
+    
+    assert capsys.readouterr().out == ""
+    assert messages == [("cleanup", f"✓ Directory removed: {target}")]
+
+
+def test_async_variants_return_typed_results(capsys):
+    """Async calls run on the worker pool and return the same dataclasses."""
+    name = "no-such-software-7f3a9c"
+    
+    async def run(un):
+        return await asyncio.gather(un.detect_async(name), un.plan_async(name), un.terminate_async([]))
+    
+    with Uninstaller(max_concurrency=2) as un:
+        detection, plan, terminated = asyncio.run(run(un))
+    
+    assert detection == Detection(name, [], [])
+    assert isinstance(plan, Plan) and plan.paths == [] and plan.processes == []
+    assert terminated == []
+    assert capsys.readouterr().out == ""
+
+
+def test_streaming_consumer_does_not_hold_a_slot():
+    """A partly consumed iter_detect leaves the only slot free once discovery has finished."""
+    with Uninstaller(max_concurrency=1) as un:
+        findings = un.iter_detect("python")
+        next(findings, None)
+        assert un._slots.acquire(timeout=30)
+        un._slots.release()
+        assert un.terminate([]) == []
+        findings.close()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the desktop entry index
+"""
+
+import os
+import tempfile
+
+from uninstall_helper import desktop_entries
+from uninstall_helper.desktop_entries import DesktopEntryIndex
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_display_names_resolve_to_binaries():
+    """Display names, file names and WM classes resolve to the program."""
+    with tempfile.TemporaryDirectory() as tmp:
+        apps = os.path.join(tmp, "applications")
+        _write(os.path.join(apps, "code.desktop"),
+               "[Desktop Entry]\nType=Application\nName=Visual Studio Code\n"
+               "Exec=/usr/share/code/code --unity-launch %F\nIcon=vscode\nStartupWMClass=Code\n"
+               "[Desktop Action new-empty-window]\nName=New Empty Window\nExec=/bin/false\n")
+        _write(os.path.join(apps, "org.gnome.Todo.desktop"),
+               "[Desktop Entry]\nName=To Do\nExec=env GDK_BACKEND=x11 gnome-todo\n")
+        _write(os.path.join(apps, "flatpak-app.desktop"),
+               "[Desktop Entry]\nName=Spotify\nExec=flatpak run com.spotify.Client\n")
+        _write(os.path.join(apps, "link.desktop"), "[Desktop Entry]\nType=Link\nName=Docs\n")
+        
+        index = DesktopEntryIndex([apps], cache_path=None)
+        assert len(index.entries) == 3
+        
+        code = index.resolve("Visual Studio Code")
+        assert [entry.binary for entry in code] == ["/usr/share/code/code"]
+        assert desktop_entries.binary_names(code) == {"code"}
+        
+        todo = index.resolve("GNOME To Do")
+        assert [entry.binary for entry in todo] == ["gnome-todo"]
+        
+        assert desktop_entries.binary_names(index.resolve("spotify")) == set()
+
+
+def test_cache_is_reused_until_directory_changes():
+    """The on-disk cache is used until an application directory's mtime changes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        apps = os.path.join(tmp, "applications")
+        cache = os.path.join(tmp, "cache", "desktop.json")
+        _write(os.path.join(apps, "a.desktop"), "[Desktop Entry]\nName=Alpha\nExec=alpha\n")
+        
+        first = DesktopEntryIndex([apps], cache_path=cache)
+        second = DesktopEntryIndex([apps], cache_path=cache)
+        assert not first.from_cache
+        assert second.from_cache
+        assert second.entries == first.entries
+        
+        _write(os.path.join(apps, "b.desktop"), "[Desktop Entry]\nName=Beta\nExec=beta\n")
+        stat = os.stat(apps)
+        os.utime(apps, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        third = DesktopEntryIndex([apps], cache_path=cache)
+        assert not third.from_cache
+        assert len(third.entries) == 2
+
+
+def test_refresh_caches_runs_once_per_directory():
+    """Cache refresh commands are issued once per changed directory."""
+    calls = []
+    desktop_entries.refresh_caches(["/a/applications", "/a/applications"], [],
+                                   runner=lambda cmd, **kwargs: calls.append(cmd))
+    assert calls == [["update-desktop-database", "-q", "/a/applications"]]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the discovery provider framework
+"""
+
+import time
+
+from uninstall_helper.discovery import DiscoveryEngine, Finding, FunctionProvider
+
+
+def _slow(values, delay, kind="path"):
+    def discover(query, cancel):
+        for value in values:
+            if cancel.wait(delay):
+                return
+            yield Finding(kind, value)
+    return discover
+
+
+def test_providers_run_concurrently_and_results_are_deduplicated():
+    """Total time is the slowest provider, and duplicate findings are merged."""
+    engine = DiscoveryEngine()
+    engine.register(FunctionProvider("a", _slow(["/opt/acme", "/usr/bin/acme"], 0.15)))
+    engine.register(FunctionProvider("b", _slow(["/opt/acme", "/etc/acme"], 0.15)))
+    engine.register(FunctionProvider("c", _slow(["/only/on/windows"], 0.0), systems=("windows",)))
+    
+    start = time.monotonic()
+    findings = engine.run("acme", "linux")
+    elapsed = time.monotonic() - start
+    
+    assert sorted(f.value for f in findings) == ["/etc/acme", "/opt/acme", "/usr/bin/acme"]
+    assert elapsed < 0.5
+    assert {report.name: report.status for report in engine.last_reports} == {"a": "ok", "b": "ok"}
+
+
+def test_budget_cancels_slow_provider():
+    """A provider over budget is cancelled and reported, others still complete."""
+    engine = DiscoveryEngine(budgets={"slow": 0.1})
+    engine.register(FunctionProvider("slow", _slow(["/late"], 5.0)))
+    engine.register(FunctionProvider("fast", _slow(["/early"], 0.0)))
+    
+    start = time.monotonic()
+    findings = engine.run("acme", "linux")
+    
+    assert [f.value for f in findings] == ["/early"]
+    assert time.monotonic() - start < 1.0
+    statuses = {report.name: report.status for report in engine.last_reports}
+    assert statuses == {"slow": "timeout", "fast": "ok"}
+
+
+def test_kind_filter_priority_and_errors():
+    """Only providers for the requested kinds run; failures are reported, not raised."""
+    def broken(query, cancel):
+        raise RuntimeError("database locked")
+    
+    engine = DiscoveryEngine()
+    engine.register(FunctionProvider("snap", _slow(["snap remove acme"], 0.05, "command"),
+                                     kinds=("command",)))
+    engine.register(FunctionProvider("apt", _slow(["apt remove acme"], 0.0, "command"),
+                                     kinds=("command",)))
+    engine.register(FunctionProvider("broken", broken, kinds=("command",)))
+    engine.register(FunctionProvider("paths", _slow(["/opt/acme"], 0.0)))
+    
+    findings = engine.run("acme", "linux", kinds=("command",))
+    best = min(findings, key=lambda f: engine.priority(f.source))
+    assert best.value == "snap remove acme"
+    statuses = {report.name: (report.status, report.error) for report in engine.last_reports}
+    assert statuses["broken"] == ("error", "database locked")
+    assert "paths" not in statuses
+
+
+def test_helper_streams_paths_before_discovery_finishes():
+    """The first path is yielded while a slower provider is still running."""
+    from main import UninstallHelper
+    
+    engine = DiscoveryEngine()
+    engine.register(FunctionProvider("fast", _slow(["/opt/demo"], 0)))
+    engine.register(FunctionProvider("slow", _slow(["/opt/demo-data"], 0.5)))
+    helper = UninstallHelper()
+    helper._discovery_engine = engine
+    
+    start = time.monotonic()
+    paths = helper.iter_installation_paths("demo")
+    assert next(paths) == "/opt/demo"
+    assert time.monotonic() - start < 0.4
+    assert list(paths) == ["/opt/demo-data"]
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the language-ecosystem install index
+"""
+
+import json
+import os
+import tempfile
+
+from uninstall_helper.ecosystems import EcosystemIndex, load_npm, load_pip
+
+
+def _write(path, text=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _dist(site_dir, name, version, files, installer="pip", scripts=()):
+    dist_info = f"{name.replace('-', '_')}-{version}.dist-info"
+    for path in files:
+        _write(os.path.join(site_dir, path))
+    record = [f"{path},sha256=x,1" for path in files] + [f"{dist_info}/RECORD,,"]
+    _write(os.path.join(site_dir, dist_info, "RECORD"), "\n".join(record) + "\n")
+    _write(os.path.join(site_dir, dist_info, "INSTALLER"), installer + "\n")
+    _write(os.path.join(site_dir, dist_info, "METADATA"), f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n\nBody\n")
+    if scripts:
+        _write(os.path.join(site_dir, dist_info, "entry_points.txt"),
+               "[console_scripts]\n" + "".join(f"{script} = {name}:main\n" for script in scripts))
+    return os.path.join(site_dir, dist_info)
+
+
+def test_pip_record_resolves_owned_roots_and_entry_points():
+    """Top-level entries a dist owns alone become roots; shared ones list only its files."""
+    with tempfile.TemporaryDirectory() as tmp:
+        site_dir = os.path.join(tmp, "lib", "python3.11", "site-packages")
+        dist_info = _dist(site_dir, "Acme-Tool", "1.2", ["acme_tool/__init__.py", "acme_tool/cli.py",
+                                                          "ns/acme/__init__.py", "../../../bin/acme"],
+                          scripts=["acme"])
+        _dist(site_dir, "ns-other", "3.0", ["ns/other/__init__.py"], installer="debian")
+        
+        installs = load_pip(site_dir)
+        assert [install.name for install in installs] == ["Acme-Tool"]
+        acme = installs[0]
+        assert acme.bins == ["acme"]
+        assert set(acme.paths) == {
+            os.path.join(site_dir, "acme_tool"),
+            os.path.join(site_dir, "ns", "acme", "__init__.py"),
+            os.path.join(tmp, "bin", "acme"),
+            dist_info,
+        }
+        
+        index = EcosystemIndex({"pip": [site_dir]}, cache_path=None)
+        assert index.resolve("acme_tool") == installs
+        assert index.resolve("acme") == installs
+        assert index.resolve("ns-other") == []
+
+
+def test_npm_bin_map_and_scoped_packages():
+    """Global packages report their directory and the bin links that point into it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        modules = os.path.join(tmp, "lib", "node_modules")
+        _write(os.path.join(modules, "@acme", "cli", "package.json"),
+               json.dumps({"name": "@acme/cli", "version": "2.0.0", "bin": {"acme": "bin/acme.js"}}))
+        _write(os.path.join(modules, "@acme", "cli", "bin", "acme.js"))
+        _write(os.path.join(modules, "npm", "package.json"), json.dumps({"name": "npm", "bin": {"npm": "x"}}))
+        os.makedirs(os.path.join(tmp, "bin"))
+        os.symlink(os.path.join(modules, "@acme", "cli", "bin", "acme.js"), os.path.join(tmp, "bin", "acme"))
+        
+        installs = load_npm(tmp)
+        assert len(installs) == 1
+        cli = installs[0]
+        assert cli.paths == [os.path.join(modules, "@acme", "cli"), os.path.join(tmp, "bin", "acme")]
+        assert cli.command == "npm uninstall -g @acme/cli"
+
+
+def test_index_is_cached_until_metadata_changes():
+    """A second load comes from the cache; a new crate invalidates it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cargo_home = os.path.join(tmp, "cargo")
+        crates = os.path.join(cargo_home, ".crates2.json")
+        _write(crates, json.dumps({"installs": {"ripgrep 14.1.0 (registry+https://example)": {"bins": ["rg"]}}}))
+        sources = {"cargo": [cargo_home]}
+        cache = os.path.join(tmp, "cache.json")
+        
+        first = EcosystemIndex(sources, cache)
+        assert not first.from_cache
+        assert first.resolve("rg")[0].paths == [os.path.join(cargo_home, "bin", "rg")]
+        assert EcosystemIndex(sources, cache).from_cache
+        
+        _write(crates, json.dumps({"installs": {"fd-find 10.0.0 (registry+https://example)": {"bins": ["fd"]}}}))
+        os.utime(crates, ns=(0, 0))
+        third = EcosystemIndex(sources, cache)
+        assert not third.from_cache
+        assert third.resolve("fd")[0].command == "cargo uninstall fd-find"
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the learned-footprint cache
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+import psutil
+
+from uninstall_helper.footprint_cache import FootprintCache
+from uninstall_helper.helper import UninstallHelper
+
+
+def test_roundtrip_and_stale_invalidation():
+    """A stored footprint is returned until one of its files changes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        install_dir = os.path.join(tmp, "acme")
+        os.mkdir(install_dir)
+        binary = os.path.join(install_dir, "acme")
+        with open(binary, "w") as f:
+            f.write("v1")
+        
+        cache = FootprintCache(os.path.join(tmp, "cache", "footprints.db"))
+        cache.put("Acme", signatures=[(binary, ["acme", "--daemon"])], install_paths=[install_dir])
+        
+        footprint = cache.get("acme")
+        assert footprint["install_paths"] == [install_dir]
+        assert footprint["exe_paths"] == [binary]
+        assert footprint["signatures"] == [[binary, ["acme", "--daemon"]]]
+        
+        with open(binary, "w") as f:
+            f.write("version 2")
+        assert cache.get("acme") is None
+        assert len(cache) == 0
+        cache.close()
+
+
+def test_lru_eviction():
+    """The least recently used entry is evicted once the cache is full."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FootprintCache(os.path.join(tmp, "footprints.db"), max_entries=2)
+        cache.put("one", install_paths=[tmp])
+        cache.put("two", install_paths=[tmp])
+        assert cache.get("one") is not None
+        cache.put("three", install_paths=[tmp])
+        
+        assert len(cache) == 2
+        assert cache.get("two") is None
+        assert cache.get("one") is not None
+        assert cache.get("three") is not None
+        cache.close()
+
+
+def test_footprints_without_files_are_not_trusted():
+    """Nothing is stored without a fingerprint; an old unfingerprinted entry is a miss."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FootprintCache(os.path.join(tmp, "footprints.db"))
+        assert cache.put("ghost", install_paths=[os.path.join(tmp, "gone")]) is False
+        assert len(cache) == 0
+        
+        cache._conn.execute("INSERT INTO footprints VALUES ('ghost', '{}', '{}', 0)")
+        assert cache.get("ghost") is None
+        assert len(cache) == 0
+        cache.close()
+
+
+def test_footprint_processes_match_by_exe_and_cmdline_not_name():
+    """A learned python script footprint catches that script only, not every python process."""
+    this = psutil.Process()
+    helper = UninstallHelper()
+    helper.config = {}
+    footprint = {"signatures": [[this.exe(), ["python3", "/opt/acme/agent.py"]]], "install_paths": ["/opt/acme"]}
+    assert helper.detect_processes_from_footprint(footprint) == []
+    
+    footprint["signatures"].append([this.exe(), this.cmdline()])
+    assert [proc["pid"] for proc in helper.detect_processes_from_footprint(footprint)] == [this.pid]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        footprint = {"signatures": [], "install_paths": [os.path.dirname(this.exe()), tmp]}
+        # The interpreter's directory is protected, so it never becomes a match root
+        assert this.pid not in [proc["pid"] for proc in helper.detect_processes_from_footprint(footprint)]
+        
+        sleep = shutil.which("sleep")
+        if sleep:
+            agent = os.path.join(tmp, "acme-agent")
+            shutil.copy(sleep, agent)
+            child = subprocess.Popen([agent, "30"])
+            try:
+                assert child.pid in [proc["pid"] for proc in helper.detect_processes_from_footprint(footprint)]
+            finally:
+                child.kill()
+                child.wait()
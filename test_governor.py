@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the I/O and CPU governor
+"""
+
+import os
+import tempfile
+
+from uninstall_helper.governor import Governor, TokenBucket
+from uninstall_helper.helper import UninstallHelper
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_rate_and_debt():
+    """The burst is free, then takes are paced at the configured rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(10, clock=clock, sleep=clock.sleep)
+    for _ in range(10):
+        assert bucket.take() == 0.0
+    assert abs(bucket.take() - 0.1) < 1e-9
+    # One oversized request is admitted and paid for by waiting
+    assert abs(bucket.take(20) - 2.0) < 1e-9
+    assert TokenBucket(None).take(10 ** 9) == 0.0
+
+
+def test_remove_tree_and_adaptive_backoff():
+    """A tree is removed bottom-up and high pressure triggers doubling backoffs."""
+    readings = [(3.0, 0.0), (0.5, 0.5), (0.5, 0.0)]
+    slept = []
+    governor = Governor(
+        {"max_load_per_cpu": 1.5, "max_iowait": 0.2, "backoff_seconds": 0.1, "sample_interval": 3600},
+        pressure=lambda: readings.pop(0) if readings else (0.0, 0.0),
+        sleep=slept.append
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "demo")
+        os.makedirs(os.path.join(root, "lib", "plugins"))
+        for name, data in (("bin", b"x" * 100), ("lib/libdemo.so", b"y" * 50), ("lib/plugins/p.so", b"")):
+            with open(os.path.join(root, name), "wb") as f:
+                f.write(data)
+        os.symlink(tmp, os.path.join(root, "lib", "outside"))
+        
+        assert governor.remove_tree(root) == 150 + len(tmp)
+        assert not os.path.exists(root)
+        assert os.path.isdir(tmp)
+    
+    assert slept == [0.1, 0.2]
+    assert governor.backoffs == 2
+
+
+def test_remove_tree_on_a_symlink_removes_only_the_link():
+    """A symlinked root is unlinked; the directory it points to is left alone."""
+    with tempfile.TemporaryDirectory() as tmp:
+        real = os.path.join(tmp, "real")
+        os.makedirs(os.path.join(real, "sub"))
+        open(os.path.join(real, "keep.txt"), "w").close()
+        link = os.path.join(tmp, "link")
+        os.symlink(real, link)
+        
+        assert Governor({}).remove_tree(link) == 0
+        assert not os.path.lexists(link)
+        assert sorted(os.listdir(real)) == ["keep.txt", "sub"]
+
+
+def test_spawned_helpers_share_one_governor():
+    """Batch helpers draw from the parent's buckets instead of multiplying the limits."""
+    helper = UninstallHelper()
+    helper.config = {"governor": {"enabled": True, "nice": 0, "ionice_class": None}}
+    helper.emit = lambda *args, **kwargs: None
+    first, second = helper.spawn(), helper.spawn()
+    assert first.get_governor() is second.get_governor() is helper.get_governor() is not None
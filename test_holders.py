@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for open-file holder detection
+"""
+
+import os
+import tempfile
+
+from uninstall_helper.holders import HolderIndex, find_holders, process_name
+
+
+def _fake_process(proc_root, pid, comm, fds=(), maps=()):
+    base = os.path.join(proc_root, str(pid))
+    os.makedirs(os.path.join(base, "fd"))
+    with open(os.path.join(base, "comm"), "w") as f:
+        f.write(comm + "\n")
+    for fd, target in enumerate(fds):
+        os.symlink(target, os.path.join(base, "fd", str(fd)))
+    with open(os.path.join(base, "maps"), "w") as f:
+        for path in maps:
+            f.write(f"7f0000000000-7f0000001000 r-xp 00000000 08:01 1234    {path}\n")
+
+
+def test_fds_and_maps_are_matched_under_paths():
+    """Open files and mappings below a cleanup path are reported per PID, deleted ones included."""
+    with tempfile.TemporaryDirectory() as proc_root:
+        _fake_process(proc_root, 10, "demo-agent",
+                      fds=["/var/log/demo/agent.log", "socket:[1234]", "/dev/null"],
+                      maps=["/opt/demo/lib/libdemo.so", "/opt/demo/lib/libdemo.so", "[heap]"])
+        _fake_process(proc_root, 20, "editor", fds=["/opt/demo-other/notes.txt"])
+        _fake_process(proc_root, 30, "shell", maps=["/opt/demo/bin/demo (deleted)"])
+        
+        holding = find_holders(["/opt/demo", "/var/log/demo/"], proc_root=proc_root)
+        assert holding == {10: ["/opt/demo/lib/libdemo.so", "/var/log/demo/agent.log"],
+                           30: ["/opt/demo/bin/demo"]}
+        assert 30 not in find_holders(["/opt/demo"], proc_root=proc_root, exclude={30})
+        assert process_name(10, proc_root) == "demo-agent"
+        assert process_name(99, proc_root) == "?"
+
+
+def test_exact_file_and_sibling_prefixes():
+    """A held file matches itself; a sibling sharing the name prefix does not."""
+    index = HolderIndex({"/opt/demo/bin/demo": {30}, "/opt/demo.conf": {40}})
+    assert index.holders_under(["/opt/demo/bin/demo"]) == {30: ["/opt/demo/bin/demo"]}
+    assert index.holders_under(["/opt/demo"]) == {30: ["/opt/demo/bin/demo"]}
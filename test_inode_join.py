@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the inode-identity process join
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from uninstall_helper.inode_join import join, process_identities, processes_running_from
+
+
+def test_join_matches_by_identity_not_path():
+    """A file is matched through a hard link, whatever path the process used."""
+    with tempfile.TemporaryDirectory() as tmp:
+        install = os.path.join(tmp, "opt", "acme-suite", "bin")
+        os.makedirs(install)
+        agent = os.path.join(install, "agentd")
+        other = os.path.join(install, "README")
+        for path in (agent, other):
+            open(path, "w").close()
+        elsewhere = os.path.join(tmp, "agentd-link")
+        os.link(agent, elsewhere)
+        
+        st = os.stat(elsewhere)
+        identities = {(st.st_dev, st.st_ino): {4242}}
+        matches = join(identities, [os.path.join(tmp, "opt", "acme-suite")])
+        assert [(m.pid, m.path) for m in matches] == [(4242, agent)]
+        assert join({}, [tmp]) == []
+
+
+def test_running_copy_of_interpreter_is_found():
+    """A process started from a copied binary is found by its install directory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        install = os.path.join(tmp, "acme-suite")
+        os.makedirs(install)
+        binary = os.path.join(install, "agentd")
+        shutil.copy2(os.path.realpath(sys.executable), binary)
+        
+        proc = subprocess.Popen([binary, "-c", "import time; time.sleep(30)"])
+        try:
+            deadline = time.time() + 5
+            found = {}
+            while proc.pid not in found and time.time() < deadline:
+                found = processes_running_from([install], exclude={os.getpid()})
+                time.sleep(0.05)
+            assert found.get(proc.pid) == [binary]
+            assert proc.pid in {pid for pids in process_identities().values() for pid in pids}
+        finally:
+            proc.kill()
+            proc.wait()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the package dependency graph
+"""
+
+import os
+import shutil
+import tempfile
+
+from uninstall_helper.discovery import DiscoveryEngine, Finding, FunctionProvider
+from uninstall_helper.helper import UninstallHelper
+from uninstall_helper.package_graph import PackageGraph, load_dpkg, load_pacman, parse_relations
+
+STATUS = """Package: acme
+Status: install ok installed
+Installed-Size: 100
+Depends: libacme (>= 1.0), acme-data | acme-data-lite, sound-daemon
+
+Package: libacme
+Status: install ok installed
+Installed-Size: 50
+Depends: libc6
+
+Package: acme-data
+Status: install ok installed
+Installed-Size: 30
+
+Package: pulse
+Status: install ok installed
+Installed-Size: 20
+Provides: sound-daemon
+
+Package: player
+Status: install ok installed
+Installed-Size: 10
+Depends: pulse
+
+Package: libc6
+Status: install ok installed
+Priority: required
+Installed-Size: 1000
+
+Package: stale
+Status: install ok installed
+Installed-Size: 5
+
+Package: gone
+Status: deinstall ok config-files
+Installed-Size: 5
+"""
+
+EXTENDED = """Package: libacme
+Architecture: amd64
+Auto-Installed: 1
+
+Package: acme-data
+Architecture: all
+Auto-Installed: 1
+
+Package: pulse
+Architecture: amd64
+Auto-Installed: 1
+
+Package: libc6
+Architecture: amd64
+Auto-Installed: 1
+
+Package: stale
+Architecture: amd64
+Auto-Installed: 1
+"""
+
+
+def _write(directory, name, text):
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+
+def test_parse_relations():
+    """Versions and architecture qualifiers are dropped; alternatives are grouped."""
+    assert parse_relations("libc6 (>= 2.34), foo | bar:any,  baz") == [["libc6"], ["foo", "bar"], ["baz"]]
+    assert parse_relations("") == []
+
+
+def test_dpkg_orphans_of_removal():
+    """Only dependencies orphaned by the removal are returned, not shared or stale ones."""
+    with tempfile.TemporaryDirectory() as tmp:
+        packages = load_dpkg(_write(tmp, "status", STATUS), _write(tmp, "extended_states", EXTENDED))
+        graph = PackageGraph(packages)
+        
+        assert "gone" not in graph
+        # pulse is still needed by player (through Provides), libc6 is required, stale was already orphaned
+        assert graph.orphaned_by(["acme"]) == ["acme-data", "libacme"]
+        assert graph.size(["acme", "acme-data", "libacme"]) == 180 * 1024
+        # Once player is gone too, pulse is orphaned as well
+        assert graph.orphaned_by(["player"], already_removed=["acme", "acme-data", "libacme"]) == ["pulse"]
+
+
+def test_pacman_reason_marks_dependencies():
+    """%REASON% 1 marks a dependency; version constraints are stripped from %DEPENDS%."""
+    with tempfile.TemporaryDirectory() as tmp:
+        entries = {
+            "acme-1.0-1": "%NAME%\nacme\n\n%SIZE%\n4096\n\n%DEPENDS%\nlibacme>=1.0\n",
+            "libacme-1.2-1": "%NAME%\nlibacme\n\n%SIZE%\n1024\n\n%REASON%\n1\n",
+        }
+        for entry, desc in entries.items():
+            os.makedirs(os.path.join(tmp, entry))
+            _write(os.path.join(tmp, entry), "desc", desc)
+        
+        graph = PackageGraph(load_pacman(tmp))
+        assert graph.orphaned_by(["acme"]) == ["libacme"]
+        assert graph.size(["acme", "libacme"]) == 5120
+
+
+def test_orphan_plan_travels_with_the_package_command():
+    """The orphan plan is part of the package-manager finding, so a winning snap command carries none."""
+    if not shutil.which("apt-get"):
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        helper = UninstallHelper()
+        helper.system = "linux"
+        helper.config = {"linux": {"package_managers": ["apt-get"]}}
+        helper._package_graph = PackageGraph(load_dpkg(_write(tmp, "status", STATUS),
+                                                       _write(tmp, "extended_states", EXTENDED)))
+        package = FunctionProvider("package-manager", helper._discover_package_command, kinds=("command",))
+        
+        helper._discovery_engine = DiscoveryEngine()
+        helper._discovery_engine.register(package)
+        finding = helper.get_uninstall_finding("acme")
+        assert finding.value == "sudo apt-get remove acme acme-data libacme -y"
+        assert finding.detail["orphans"]["orphans"] == ["acme-data", "libacme"]
+        
+        helper._discovery_engine = DiscoveryEngine()
+        helper._discovery_engine.register(FunctionProvider(
+            "sandboxed-apps", lambda query, cancel: [Finding("command", "sudo snap remove acme")], kinds=("command",)))
+        helper._discovery_engine.register(package)
+        finding = helper.get_uninstall_finding("acme")
+        assert finding.value == "sudo snap remove acme" and finding.detail is None
+
+
+def test_selected_packages_are_removed_through_the_helper():
+    """The remove command comes from linux.package_managers; unavailable or non-package managers are skipped."""
+    helper = UninstallHelper()
+    helper.config = {"linux": {"package_managers": ["no-such-pm", "snap", "apt-get"]}}
+    if shutil.which("apt-get") and not shutil.which("snap"):
+        assert helper.package_remove_command(["acme", "libacme"]) == "sudo apt-get remove acme libacme -y"
+    helper.config = {"linux": {"package_managers": ["no-such-pm"]}}
+    assert helper.package_remove_command(["acme"]) == ""
+    assert helper.remove_packages(["acme"]) is False
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the protected-path guard
+"""
+
+import os
+import sys
+import tempfile
+
+from uninstall_helper.path_guard import PathGuard, build_guard, essential_packages
+
+
+def test_protect_deny_and_allow_rules():
+    """Protected paths block themselves and their ancestors; the deepest rule wins."""
+    guard = PathGuard()
+    guard.protect("/usr/bin/python3")
+    guard.deny("/etc")
+    guard.allow("/etc/demo")
+    
+    assert guard.check("/usr/bin/python3") == "protected path"
+    assert guard.check("/usr/bin") == "contains protected paths"
+    assert guard.check("/usr/bin/python3-demo") is None
+    assert guard.check("/usr/bin/../bin/python3") == "protected path"
+    assert guard.check("/etc/passwd") == "denied by rule"
+    assert guard.check("/etc/demo/demo.conf") is None
+    assert guard.check("relative/path") == "not an absolute path"
+    
+    allowed, blocked = guard.filter(["/opt/demo", "/usr/bin"])
+    assert allowed == ["/opt/demo"]
+    assert blocked == [("/usr/bin", "contains protected paths")]
+
+
+def test_essential_package_files_are_protected():
+    """Files of Essential/required dpkg packages and the interpreter are protected."""
+    with tempfile.TemporaryDirectory() as tmp:
+        status = os.path.join(tmp, "status")
+        info = os.path.join(tmp, "info")
+        os.makedirs(info)
+        with open(status, "w") as f:
+            f.write("Package: coreutils\nStatus: install ok installed\nEssential: yes\nPriority: required\n\n"
+                    "Package: libc6\nStatus: install ok installed\nPriority: optional\nEssential: yes\n"
+                    "Multi-Arch: same\nArchitecture: amd64\nDescription: C library\n continued line\n\n"
+                    "Package: demo\nStatus: install ok installed\nPriority: optional\n\n"
+                    "Package: gone\nStatus: deinstall ok config-files\nPriority: required\n")
+        for name, paths in (("coreutils", ["/.", "/bin", "/bin/ls"]),
+                            ("libc6:amd64", ["/lib/x86_64-linux-gnu/libc.so.6"]),
+                            ("demo", ["/opt/demo/bin/demo"])):
+            with open(os.path.join(info, name + ".list"), "w") as f:
+                f.write("\n".join(paths) + "\n")
+        
+        assert essential_packages(status) == ["coreutils", "libc6:amd64"]
+        guard = build_guard(deny=(), protect=(), status_file=status, info_dir=info)
+    
+    assert guard.check("/bin/ls") == "protected path"
+    assert guard.check("/lib/x86_64-linux-gnu") == "contains protected paths"
+    assert guard.check("/opt/demo") is None
+    assert guard.check(sys.executable) == "protected path"
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact path set
+"""
+
+import json
+
+from uninstall_helper.pathset import PathSet
+
+
+def test_membership_and_parent_sharing():
+    """Siblings share one interned parent and duplicates are ignored."""
+    paths = PathSet(["/opt/demo/bin/demo", "/opt/demo/bin/demo-helper", "/opt/demo/bin/demo"])
+    assert len(paths) == 2
+    assert "/opt/demo/bin/demo-helper" in paths
+    assert "/opt/demo/bin/../bin/demo" in paths
+    assert "/opt/demo/bin" not in paths
+    assert paths.to_dict()["dirs"] == ["/opt/demo/bin"]
+    
+    paths.discard("/opt/demo/bin/demo")
+    assert list(paths) == ["/opt/demo/bin/demo-helper"]
+
+
+def test_covers_and_roots():
+    """Members below another member are covered and dropped from the roots."""
+    paths = PathSet(["/opt/demo/lib/libdemo.so", "/home/alice/.config/demo", "/opt/demo"])
+    assert paths.covers("/opt/demo/share/icons/demo.png")
+    assert not paths.covers("/opt/demo-other")
+    assert paths.roots() == ["/home/alice/.config/demo", "/opt/demo"]
+
+
+def test_serialization_round_trip():
+    """to_dict() output survives JSON and rebuilds the same set."""
+    paths = PathSet(["/usr/local/bin/demo", "/usr/local/share/demo", "/"])
+    restored = PathSet.from_dict(json.loads(json.dumps(paths.to_dict())))
+    assert list(restored) == list(paths)
+    assert "/" in restored
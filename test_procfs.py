@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy /proc reader
+"""
+
+import os
+import tempfile
+
+from uninstall_helper.procfs import ProcReader, iter_matching, snapshot
+
+
+def _fake_process(proc_root, pid, comm, argv, exe=None):
+    base = os.path.join(proc_root, str(pid))
+    os.makedirs(base)
+    with open(os.path.join(base, "comm"), "w") as f:
+        f.write(comm + "\n")
+    with open(os.path.join(base, "cmdline"), "wb") as f:
+        f.write(b"".join(arg.encode() + b"\0" for arg in argv))
+    if exe:
+        os.symlink(exe, os.path.join(base, "exe"))
+
+
+def test_matching_by_name_cmdline_and_names():
+    """Name, desktop-entry name and command-line matches are found; others are not."""
+    with tempfile.TemporaryDirectory() as proc_root:
+        _fake_process(proc_root, 10, "demo-agent", ["/opt/demo/bin/demo-agent"], "/opt/demo/bin/demo-agent")
+        _fake_process(proc_root, 20, "python3", ["python3", "-m", "demo.server"], "/usr/bin/python3")
+        _fake_process(proc_root, 30, "code", ["/usr/share/code/code"])
+        _fake_process(proc_root, 40, "kthreadd", [])
+        _fake_process(proc_root, 50, "bash", ["bash"])
+        
+        found = {proc['pid']: proc for proc in iter_matching("demo", names={"code"}, proc_root=proc_root)}
+        assert sorted(found) == [10, 20, 30]
+        assert found[10]['exe'] == "/opt/demo/bin/demo-agent"
+        assert found[20]['cmdline'] == ["python3", "-m", "demo.server"]
+        assert found[30]['exe'] is None
+
+
+def test_truncated_comm_and_buffer_growth():
+    """15-character comms are extended from argv[0]; long cmdlines outgrow the buffer."""
+    with tempfile.TemporaryDirectory() as proc_root:
+        long_arg = "x" * 10000
+        _fake_process(proc_root, 7, "gnome-software-", ["/usr/bin/gnome-software-service", long_arg])
+        
+        reader = ProcReader(proc_root, bufsize=64)
+        assert reader.cmdline(7)[1] == long_arg
+        assert reader.comm(8) is None
+        assert snapshot(proc_root)[7]['name'] == "gnome-software-service"
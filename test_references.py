@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the autostart/cron/timer/shell reference index
+"""
+
+import os
+import tempfile
+
+from uninstall_helper.references import ReferenceIndex, collect_files
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_names_and_install_paths_are_found_by_lookup():
+    """Commands match by name, PATH entries by prefix (with ~ expanded), comments never."""
+    with tempfile.TemporaryDirectory() as tmp:
+        home = os.path.join(tmp, "home", "alice")
+        _write(os.path.join(home, ".config", "autostart", "tray.desktop"),
+               "[Desktop Entry]\nName=Acme Tray\nExec=env GDK_SCALE=2 acme --tray %U\n")
+        _write(os.path.join(home, ".bashrc"),
+               "# acme was here\nexport PATH=\"$PATH:~/.acme/bin\"\nalias a='acme-cli run'\n")
+        crontab = os.path.join(tmp, "crontab")
+        _write(crontab, "SHELL=/bin/sh\n*/5 * * * * root /opt/acme/bin/sync >/dev/null 2>&1\n")
+        
+        files = collect_files([("alice", home)]) + [("cron", crontab, None)]
+        index = ReferenceIndex([entry for entry in files if entry[1].startswith(tmp)])
+        
+        found = index.find(names=["ACME", "acme-cli"], paths=["/opt/acme", os.path.join(home, ".acme")])
+        assert [(ref.kind, os.path.basename(ref.path), ref.lineno, ref.token) for ref in found] == [
+            ("cron", "crontab", 2, "/opt/acme/bin/sync"),
+            ("shell-rc", ".bashrc", 2, os.path.join(home, ".acme", "bin")),
+            ("shell-rc", ".bashrc", 3, "acme-cli"),
+            ("autostart", "tray.desktop", 3, "ACME"),
+        ]
+        assert index.find(names=["acme-tray"], paths=["/opt/acm"]) == []
+
+
+def test_timer_triggered_services_are_reported_as_timers():
+    """A user service started by a timer is a systemd-timer reference; others are systemd-user."""
+    with tempfile.TemporaryDirectory() as tmp:
+        home = os.path.join(tmp, "home")
+        units = os.path.join(home, ".config", "systemd", "user")
+        _write(os.path.join(units, "acme-sync.timer"), "[Timer]\nOnCalendar=hourly\nUnit=acme-backup.service\n")
+        _write(os.path.join(units, "acme-backup.service"), "[Service]\nExecStart=%h/.local/bin/acme backup\n")
+        _write(os.path.join(units, "acme.service"), "[Unit]\nDescription=acme\n[Service]\nExecStart=acme serve\n")
+        
+        index = ReferenceIndex([entry for entry in collect_files([("bob", home)]) if entry[1].startswith(tmp)])
+        
+        found = index.find(names=["acme"])
+        assert [(ref.kind, os.path.basename(ref.path), ref.text) for ref in found] == [
+            ("systemd-timer", "acme-backup.service", "ExecStart=%h/.local/bin/acme backup"),
+            ("systemd-user", "acme.service", "ExecStart=acme serve"),
+        ]
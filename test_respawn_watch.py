@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the respawn watcher
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+from uninstall_helper.helper import UninstallHelper
+from uninstall_helper.pathset import PathSet
+from uninstall_helper.respawn_watch import RespawnWatcher
+
+
+class FakeSource:
+    """In-memory process table: pid -> (name, exe, ppid, cmdline)."""
+    
+    def __init__(self, table):
+        self.table = dict(table)
+    
+    def pids(self):
+        return set(self.table)
+    
+    def name(self, pid):
+        return self.table.get(pid, ("", None, 0))[0]
+    
+    def exe(self, pid):
+        return self.table.get(pid, ("", None, 0))[1]
+    
+    def ppid(self, pid):
+        return self.table.get(pid, ("", None, 0))[2]
+    
+    def cmdline(self, pid):
+        entry = self.table.get(pid, ())
+        return entry[3] if len(entry) > 3 else []
+
+
+def test_only_new_matching_pids_are_reported():
+    """Existing PIDs are ignored; new matches are reported with their supervisor."""
+    source = FakeSource({
+        1: ("systemd", "/usr/lib/systemd/systemd", 0),
+        50: ("agentd", "/opt/acme/bin/agentd", 1),
+        60: ("bash", "/usr/bin/bash", 1),
+    })
+    watcher = RespawnWatcher(processes=[{"exe": "/opt/acme/bin/agentd", "cmdline": ["agentd"]}],
+                             prefixes=["/opt/acme"], action="report", source=source)
+    
+    watcher.poll()
+    assert watcher.events == []
+    
+    source.table[70] = ("wrapper", "/usr/bin/sh", 1)
+    source.table[71] = ("agentd-new", "/opt/acme/bin/agentd", 70)
+    source.table[72] = ("vim", "/usr/bin/vim", 60)
+    watcher.poll()
+    
+    assert [event["pid"] for event in watcher.events] == [71]
+    assert watcher.events[0]["supervisor"] == "systemd (PID 1)"
+    assert watcher.events[0]["action"] == "reported"
+
+
+def test_shared_binaries_need_the_same_cmdline():
+    """Outside the install paths a name or exe alone is not enough, and our own children are spared."""
+    source = FakeSource({
+        1: ("systemd", "/usr/lib/systemd/systemd", 0),
+        os.getpid(): ("python3", "/usr/bin/python3", 1),
+    })
+    script = ["python3", "/opt/acme/agent.py"]
+    watcher = RespawnWatcher(processes=[{"exe": "/usr/bin/python3", "cmdline": script}],
+                             action="report", source=source)
+    
+    source.table[80] = ("python3", "/usr/bin/python3", 1, ["python3", "-m", "http.server"])
+    source.table[81] = ("python3", "/usr/bin/python3", 1, script)
+    source.table[82] = ("apt-get", "/usr/bin/apt-get", os.getpid(), ["apt-get", "remove", "acme"])
+    source.table[83] = ("python3", "/usr/bin/python3", 82, script)
+    watcher.poll()
+    
+    assert [event["pid"] for event in watcher.events] == [81]
+    
+    watcher.watch_paths(["/usr/bin/apt-get"])
+    source.table[84] = ("apt-get", "/usr/bin/apt-get", os.getpid(), ["apt-get", "purge", "acme"])
+    watcher.poll()
+    assert [event["pid"] for event in watcher.events] == [81]
+
+
+def test_respawned_process_is_killed():
+    """A matching process started while watching is killed."""
+    if not sys.platform.startswith("linux"):
+        return
+    
+    exe = os.path.realpath(shutil.which("sleep"))
+    watcher = RespawnWatcher(processes=[{"exe": exe, "cmdline": ["sleep", "30"]}],
+                             interval=0.05, action="kill")
+    # The test starts the "re-spawn" itself, so lift the own-descendant exemption
+    watcher._own_pid = -1
+    watcher.start()
+    sleep = subprocess.Popen(["sleep", "30"])
+    try:
+        sleep.wait(timeout=5)
+    finally:
+        events = watcher.stop()
+        if sleep.poll() is None:
+            sleep.kill()
+    
+    assert sleep.returncode == -9
+    event = next(event for event in events if event["pid"] == sleep.pid)
+    assert event["action"] == "killed"
+    assert event["ppid"] == os.getpid()
+
+
+def test_only_guard_approved_install_paths_are_watched():
+    """Protected paths from a broad search never become respawn prefixes."""
+    helper = UninstallHelper()
+    helper.config = {}
+    helper.emit = lambda *args, **kwargs: None
+    helper._respawn_watcher = RespawnWatcher(source=FakeSource({}))
+    
+    helper.watch_install_paths(PathSet(["/usr/bin/python3", "/opt/acme", "/opt/acme/bin"]))
+    assert helper._respawn_watcher.prefixes == ("/opt/acme",)
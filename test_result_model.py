@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the GUI result model
+"""
+
+from result_model import ResultModel, ResultRow
+
+
+def _rows():
+    return [
+        ResultRow("process", "acme (PID 42)", "/opt/acme/bin/acme", None, ("process", 42)),
+        ResultRow("path", "/opt/acme", "", 4096, ("path", "/opt/acme")),
+        ResultRow("path", "/home/u/.config/acme", "user u", 10, ("path", "/home/u/.config/acme")),
+        ResultRow("package", "acme", "软件包", 1 << 20, ("package", "acme")),
+    ]
+
+
+def test_filter_and_sort_over_view():
+    """Filtering and sorting only change the view; visible() slices it."""
+    model = ResultModel()
+    assert model.add(_rows() + _rows()[:1]) == 4
+    assert len(model) == 4
+    
+    model.set_filter("config")
+    assert [row.name for row in model.visible(0, 10)] == ["/home/u/.config/acme"]
+    
+    model.set_filter(kinds=("path", "package"))
+    model.sort_by("size", reverse=True)
+    assert [row.size for row in model.visible(0, 10)] == [1 << 20, 4096, 10]
+    assert [row.size for row in model.visible(1, 1)] == [4096]
+    
+    # Streamed rows land in sorted position
+    model.add([ResultRow("path", "/var/lib/acme", "", 50000, ("path", "/var/lib/acme"))])
+    assert [row.size for row in model.visible(0, 10)] == [1 << 20, 50000, 4096, 10]
+
+
+def test_selection_survives_filtering_and_discard():
+    """Selection is kept by key, and discarded rows leave the model and the selection."""
+    model = ResultModel()
+    model.add(_rows())
+    model.set_filter(kinds=("path",))
+    model.select_all()
+    model.set_filter()
+    model.toggle(("process", 42))
+    assert [row.key for row in model.selection("path")] == [("path", "/opt/acme"), ("path", "/home/u/.config/acme")]
+    assert len(model.selection()) == 3
+    
+    model.update_size(("process", 42), 0)
+    model.discard([("path", "/opt/acme"), ("process", 42)])
+    assert [row.name for row in model.visible(0, 10)] == ["/home/u/.config/acme", "acme"]
+    assert model.selected == {("path", "/home/u/.config/acme")}
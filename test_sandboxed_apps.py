@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for snap and flatpak metadata discovery
+"""
+
+import json
+import os
+import tempfile
+
+from uninstall_helper import UninstallHelper, sandboxed_apps
+
+
+def test_snaps_from_state_file():
+    """Installed snaps come from state.json, with their data directories."""
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "state.json")
+        with open(state_file, "w") as f:
+            json.dump({"data": {"snaps": {"spotify": {"current": "80"}, "core22": {}}}}, f)
+        
+        snaps = sandboxed_apps.list_snaps(state_file, mount_dir=os.path.join(tmp, "snap"),
+                                          home="/home/alice")
+        assert [app.app_id for app in snaps] == ["core22", "spotify"]
+        spotify = sandboxed_apps.find_apps("Spotify", snaps=snaps, flatpaks=[])[0]
+        assert spotify.data_dirs == ["/var/snap/spotify", "/home/alice/snap/spotify"]
+        assert sandboxed_apps.uninstall_command(spotify) == "sudo snap remove spotify"
+        assert sandboxed_apps.find_apps("core", snaps=snaps, flatpaks=[]) == []
+        assert sandboxed_apps.find_apps("spot", snaps=snaps, flatpaks=[]) == []
+
+
+def test_snaps_fall_back_to_blob_names():
+    """Without a readable state file the blob directory is listed instead."""
+    with tempfile.TemporaryDirectory() as tmp:
+        blobs = os.path.join(tmp, "snaps")
+        os.mkdir(blobs)
+        for blob in ("spotify_80.snap", "spotify_81.snap", "core_16202.snap", "partial"):
+            open(os.path.join(blobs, blob), "w").close()
+        
+        snaps = sandboxed_apps.list_snaps(os.path.join(tmp, "missing.json"), blobs_dir=blobs)
+        assert [app.app_id for app in snaps] == ["core", "spotify"]
+
+
+def test_flatpaks_from_deployments():
+    """Flatpak apps are found from app/<id>/current and matched by id suffix or name."""
+    with tempfile.TemporaryDirectory() as tmp:
+        active = os.path.join(tmp, "app", "org.mozilla.firefox", "x86_64", "stable", "active")
+        os.makedirs(active)
+        with open(os.path.join(active, "metadata"), "w") as f:
+            f.write("[Application]\nname=org.mozilla.firefox\nruntime=org.freedesktop.Platform\n")
+        os.symlink("x86_64/stable", os.path.join(tmp, "app", "org.mozilla.firefox", "current"))
+        os.makedirs(os.path.join(tmp, "app", "org.example.Broken"))
+        
+        apps = sandboxed_apps.list_flatpaks({"user": tmp}, home="/home/alice")
+        assert [app.app_id for app in apps] == ["org.mozilla.firefox"]
+        
+        found = sandboxed_apps.find_apps("firefox", snaps=[], flatpaks=apps)
+        assert found[0].data_dirs == ["/home/alice/.var/app/org.mozilla.firefox"]
+        assert sandboxed_apps.uninstall_command(found[0]) == \
+            "flatpak uninstall --user org.mozilla.firefox -y"
+
+
+def test_ambiguous_names_pick_no_app():
+    """A name matching a snap and a flatpak yields neither their data nor an uninstall command."""
+    helper = UninstallHelper()
+    helper.system = "linux"
+    messages = []
+    helper.emit = messages.append
+    helper._sandboxed_apps = [
+        sandboxed_apps.SandboxedApp("snap", "firefox", "firefox", "system", "/snap/firefox", []),
+        sandboxed_apps.SandboxedApp("flatpak", "org.mozilla.firefox", "org.mozilla.firefox", "user", "/x", []),
+        sandboxed_apps.SandboxedApp("snap", "firefox-nightly", "firefox-nightly", "system", "/y", []),
+    ]
+    
+    assert list(helper._discover_sandboxed_apps("Firefox", None)) == []
+    assert "snap firefox, flatpak org.mozilla.firefox" in messages[0]
+    
+    helper._sandboxed_apps = helper._sandboxed_apps[1:]
+    assert list(helper._discover_sandboxed_apps("firefox", None)) == [
+        ("command", "flatpak uninstall --user org.mozilla.firefox -y", None, None)]
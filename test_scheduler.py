@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the dependency-aware step scheduler
+"""
+
+import threading
+import time
+
+from uninstall_helper.scheduler import PACKAGE_LOCK, Scheduler, conflicts, tree_resource
+
+
+def _sleeper(seconds, log=None, name=None):
+    def step():
+        if log is not None:
+            log.append(("start", name))
+        time.sleep(seconds)
+        if log is not None:
+            log.append(("end", name))
+        return name
+    return step
+
+
+def test_independent_chains_overlap_and_critical_path():
+    """Two target chains run concurrently; the critical path is the longer chain."""
+    sched = Scheduler(max_workers=4)
+    for name, delay in (("a", 0.1), ("b", 0.2)):
+        find = sched.add(f"{name}: paths", _sleeper(delay))
+        sched.add(f"{name}: cleanup", _sleeper(delay), deps=[find])
+    
+    start = time.monotonic()
+    results = sched.run()
+    assert time.monotonic() - start < 0.55
+    assert all(result.status == "ok" for result in results.values())
+    
+    chain, seconds = sched.critical_path()
+    assert chain == ["b: paths", "b: cleanup"]
+    assert 0.35 < seconds < 0.55
+
+
+def test_shared_resources_are_serialised():
+    """Steps holding the package lock or nested trees never overlap."""
+    log = []
+    sched = Scheduler(max_workers=4)
+    sched.add("pkg a", _sleeper(0.05, log, "pkg a"), resources=[PACKAGE_LOCK])
+    sched.add("pkg b", _sleeper(0.05, log, "pkg b"), resources=[PACKAGE_LOCK])
+    sched.add("tree", _sleeper(0.05, log, "tree"), resources=lambda: [tree_resource("/opt/demo")])
+    sched.add("subtree", _sleeper(0.05, log, "subtree"), resources=[tree_resource("/opt/demo/lib")])
+    sched.run()
+    
+    for first, second in (("pkg a", "pkg b"), ("tree", "subtree")):
+        events = [event for event in log if event[1] in (first, second)]
+        assert events[0][0] == "start" and events[1][0] == "end"
+    assert conflicts(tree_resource("/opt/demo"), tree_resource("/opt/demo/"))
+    assert not conflicts(tree_resource("/opt/demo"), tree_resource("/opt/demo-data"))
+
+
+def test_failed_step_skips_dependents():
+    """An exception marks the step as failed and its dependents as skipped."""
+    ran = threading.Event()
+    
+    def broken():
+        raise RuntimeError("boom")
+    
+    sched = Scheduler()
+    sched.add("find", broken)
+    sched.add("cleanup", ran.set, deps=["find"])
+    sched.add("other", lambda: "fine")
+    results = sched.run()
+    
+    assert results["find"].status == "error" and results["find"].error == "boom"
+    assert results["cleanup"].status == "skipped"
+    assert not ran.is_set()
+    assert sched.value("other") == "fine"
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the smart matching engine
+"""
+
+import os
+import tempfile
+
+from uninstall_helper.helper import UninstallHelper
+from uninstall_helper.package_graph import Package, PackageGraph
+from uninstall_helper.smart_match import TrigramIndex, build_index, read_installed_packages
+
+
+def test_alias_and_ranking():
+    """Aliases resolve renamed binaries and exact names outrank helpers."""
+    index = TrigramIndex()
+    index.add("code", "process", 1)
+    index.add("chrome", "process", 2)
+    index.add("chrome_crashpad_handler", "process", 3)
+    index.add("bash", "process", 4)
+    
+    matches = index.search("vscode")
+    assert [m.payload for m in matches] == [1]
+    
+    matches = index.search("chrome")
+    assert [m.payload for m in matches] == [2, 3]
+    assert matches[0].score == 1.0
+    assert matches[0].score > matches[1].score
+    
+    assert index.search("bash", kind="path") == []
+
+
+def test_build_index_from_system_sources():
+    """Processes, directory children and packages are indexed by kind."""
+    with tempfile.TemporaryDirectory() as root:
+        os.mkdir(os.path.join(root, "acme-suite"))
+        os.mkdir(os.path.join(root, "other"))
+        
+        index = build_index(
+            processes=[{"pid": 10, "name": "acme-agent", "exe": "/opt/acme-suite/bin/acme-agent"}],
+            roots=[root],
+            packages=["acme-suite", "libc6"]
+        )
+        
+        paths = index.search("acme suite", kind="path")
+        assert paths[0].payload == os.path.join(root, "acme-suite")
+        assert index.search("acme-suite", kind="package")[0].payload == "acme-suite"
+        assert index.search("acme", kind="process")[0].payload == 10
+
+
+def test_read_installed_packages():
+    """Only packages in the installed state are returned."""
+    with tempfile.NamedTemporaryFile("w", suffix="status", delete=False) as f:
+        f.write("Package: foo\nStatus: install ok installed\n\n")
+        f.write("Package: bar\nStatus: deinstall ok config-files\n\n")
+    try:
+        assert read_installed_packages(f.name) == ["foo"]
+    finally:
+        os.remove(f.name)
+
+
+def test_helpers_fall_away_when_the_name_itself_matches():
+    """At the default threshold "chrome" selects chrome, not its crashpad helpers; alone, a helper still matches."""
+    helper = UninstallHelper()
+    helper.config = {"ai_features": {"enable_smart_detection": True, "match_threshold": 0.7}}
+    helper._smart_index = build_index(processes=[
+        {"pid": 1, "name": "chrome", "exe": None},
+        {"pid": 2, "name": "chrome_crashpad", "exe": None},
+        {"pid": 3, "name": "chrome_crashpad_handler", "exe": None},
+        {"pid": 4, "name": "acme-agent", "exe": None},
+    ])
+    
+    assert [match.text for match in helper.smart_matches("chrome", kind="process")] == ["chrome"]
+    assert [match.text for match in helper.smart_matches("acme", kind="process")] == ["acme-agent"]
+
+
+def test_fuzzy_package_match_needs_confirmation():
+    """Only exact or alias matches pick the package; a fuzzy candidate waits for a yes."""
+    helper = UninstallHelper()
+    helper.system = "linux"
+    helper.config = {"ai_features": {"enable_smart_detection": True, "match_threshold": 0.7}}
+    helper.emit = lambda *args, **kwargs: None
+    helper._package_graph = PackageGraph([Package(name, [], [], 0, False, False)
+                                          for name in ("python3", "google-chrome")])
+    helper._smart_index = build_index(packages=["python3", "google-chrome"])
+    
+    assert helper.resolve_package_name("chrome") == "google-chrome"
+    assert helper.resolve_package_name("python") == "python"
+    assert helper.package_candidate("python").payload == "python3"
+    
+    helper._confirm_package_candidate("python", interactive=False)
+    assert helper.resolve_package_name("python") == "python"
+    helper.ask = lambda prompt: "y"
+    helper._confirm_package_candidate("python", interactive=True)
+    assert helper.resolve_package_name("python") == "python3"
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the reverse symlink index
+"""
+
+import os
+import shutil
+import tempfile
+
+from uninstall_helper.path_guard import PathGuard
+from uninstall_helper.symlink_index import SymlinkIndex, sweep
+
+
+def _tree(tmp):
+    app = os.path.join(tmp, "opt", "demo")
+    bin_dir = os.path.join(tmp, "bin")
+    alternatives = os.path.join(tmp, "alternatives")
+    os.makedirs(os.path.join(app, "bin"))
+    os.makedirs(bin_dir)
+    os.makedirs(alternatives)
+    open(os.path.join(app, "bin", "demo"), "w").close()
+    open(os.path.join(tmp, "other"), "w").close()
+    
+    os.symlink(os.path.join(app, "bin", "demo"), os.path.join(bin_dir, "dm"))
+    os.symlink("../opt/demo/bin/demo", os.path.join(alternatives, "editor"))
+    os.symlink(os.path.join(alternatives, "editor"), os.path.join(bin_dir, "editor"))
+    os.symlink(os.path.join(tmp, "other"), os.path.join(bin_dir, "other"))
+    os.symlink(app + "-data", os.path.join(bin_dir, "sibling"))
+    return app, bin_dir, alternatives
+
+
+def test_links_into_follow_relative_targets_and_chains():
+    """Links are found by target regardless of name, including links to links."""
+    with tempfile.TemporaryDirectory() as tmp:
+        app, bin_dir, alternatives = _tree(tmp)
+        index = SymlinkIndex([bin_dir, alternatives])
+        assert len(index) == 5
+        assert sorted(index.links_into([app])) == sorted([
+            os.path.join(bin_dir, "dm"),
+            os.path.join(alternatives, "editor"),
+            os.path.join(bin_dir, "editor"),
+        ])
+
+
+def test_sweep_removes_only_dangling_unprotected_links():
+    """After removal, dangling links go; live and protected links stay."""
+    with tempfile.TemporaryDirectory() as tmp:
+        app, bin_dir, alternatives = _tree(tmp)
+        index = SymlinkIndex([bin_dir, alternatives])
+        shutil.rmtree(app)
+        guard = PathGuard()
+        guard.protect(os.path.join(bin_dir, "dm"))
+        
+        removed = sweep(index, [app], guard=guard, alternatives_dir=alternatives,
+                        unregister=lambda name, target: True)
+        assert [link for link, _target in removed] == [os.path.join(alternatives, "editor")]
+        # Links into the alternatives directory are update-alternatives' to remove
+        assert sorted(os.listdir(bin_dir)) == ["dm", "editor", "other", "sibling"]
+
+
+def test_alternatives_are_unregistered_not_unlinked():
+    """A dangling alternative goes through update-alternatives; if that re-points it, links to it stay."""
+    with tempfile.TemporaryDirectory() as tmp:
+        app, bin_dir, alternatives = _tree(tmp)
+        index = SymlinkIndex([bin_dir, alternatives])
+        shutil.rmtree(app)
+        calls = []
+        
+        def unregister(name, target):
+            calls.append((name, target))
+            os.unlink(os.path.join(alternatives, name))
+            os.symlink(os.path.join(tmp, "other"), os.path.join(alternatives, name))
+            return True
+        
+        removed = sweep(index, [app], remove=lambda link: calls.append(("unlink", link)),
+                        alternatives_dir=alternatives, unregister=unregister)
+        assert sorted(calls) == [("editor", "../opt/demo/bin/demo"), ("unlink", os.path.join(bin_dir, "dm"))]
+        assert sorted(link for link, _target in removed) == [os.path.join(alternatives, "editor"),
+                                                              os.path.join(bin_dir, "dm")]
+        
+        # update-alternatives failing leaves the alternative and the links to it alone
+        index = SymlinkIndex([bin_dir, alternatives])
+        os.unlink(os.path.join(tmp, "other"))
+        assert sweep(index, [os.path.join(tmp, "other")], remove=lambda link: None,
+                     alternatives_dir=alternatives, unregister=lambda name, target: False) == [
+            (os.path.join(bin_dir, "other"), os.path.join(tmp, "other"))]
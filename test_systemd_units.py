@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for systemd unit discovery and batched stopping
+"""
+
+import os
+import tempfile
+
+from uninstall_helper.systemd_units import Unit, group_by_unit, parse_cgroup, stop_units
+
+
+def test_parse_cgroup():
+    """System, user and non-service cgroups are told apart."""
+    assert parse_cgroup("0::/system.slice/acme-agent.service\n") == \
+        Unit("acme-agent.service", "system", "/system.slice/acme-agent.service")
+    
+    unit = parse_cgroup("0::/user.slice/user-1000.slice/user@1000.service/app.slice/acme.service\n")
+    assert (unit.name, unit.manager) == ("acme.service", "1000")
+    
+    assert parse_cgroup("0::/user.slice/user-1000.slice/session-3.scope\n") is None
+    assert parse_cgroup("0::/init.scope\n") is None
+    assert parse_cgroup("12:pids:/x\n1:name=systemd:/system.slice/foo.service\n").name == "foo.service"
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_group_by_unit_only_returns_safe_units():
+    """A shared unit is skipped unless all of its processes matched."""
+    with tempfile.TemporaryDirectory() as tmp:
+        proc_root = os.path.join(tmp, "proc")
+        cgroup_root = os.path.join(tmp, "cgroup")
+        cgroups = {
+            10: "/system.slice/acme-agent.service",
+            11: "/system.slice/acme-agent.service",
+            20: "/system.slice/cron.service",
+            30: "/system.slice/worker.service",
+            40: "/system.slice/systemd-journald.service",
+        }
+        for pid, path in cgroups.items():
+            _write(os.path.join(proc_root, str(pid), "cgroup"), f"0::{path}\n")
+        _write(os.path.join(cgroup_root, "system.slice/cron.service/cgroup.procs"), "20\n21\n")
+        _write(os.path.join(cgroup_root, "system.slice/worker.service/cgroup.procs"), "30\n")
+        
+        units = group_by_unit(cgroups, "acme", proc_root, cgroup_root)
+        found = {unit.name: pids for unit, pids in units.items()}
+        assert found == {"acme-agent.service": [10, 11], "worker.service": [30]}
+
+
+def test_stop_units_batches_per_manager():
+    """One systemctl invocation is made per systemd manager."""
+    calls = []
+    
+    class Result:
+        returncode = 0
+    
+    def runner(cmd, **kwargs):
+        calls.append(cmd)
+        return Result()
+    
+    units = [Unit("a.service", "system", ""), Unit("b.service", "system", ""),
+             Unit("c.service", "system", "")]
+    outcome = stop_units(units, runner=runner)
+    
+    assert calls == [["systemctl", "--no-ask-password", "disable", "--now",
+                      "a.service", "b.service", "c.service"]]
+    assert all(outcome.values())
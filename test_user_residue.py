@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-user residue scanner
+"""
+
+import os
+import tempfile
+from collections import namedtuple
+
+from uninstall_helper import user_residue
+
+PasswdEntry = namedtuple("PasswdEntry", ["pw_name", "pw_uid", "pw_dir", "pw_shell"])
+
+
+def _touch(path, size=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+def test_list_homes_skips_system_accounts():
+    """Only root and regular login accounts with existing homes are listed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("root", "alice", "bob", "daemon"):
+            os.mkdir(os.path.join(tmp, name))
+        entries = [
+            PasswdEntry("root", 0, os.path.join(tmp, "root"), "/bin/bash"),
+            PasswdEntry("daemon", 1, os.path.join(tmp, "daemon"), "/usr/sbin/nologin"),
+            PasswdEntry("alice", 1000, os.path.join(tmp, "alice"), "/bin/bash"),
+            PasswdEntry("bob", 1001, os.path.join(tmp, "bob"), "/usr/sbin/nologin"),
+            PasswdEntry("carol", 1002, os.path.join(tmp, "missing"), "/bin/zsh"),
+        ]
+        homes = user_residue.list_homes(entries, min_uid=1000)
+        assert [user for user, _home in homes] == ["root", "alice"]
+
+
+def test_scan_all_users_reports_paths_and_sizes():
+    """Each user's XDG locations and dot-directories are searched."""
+    with tempfile.TemporaryDirectory() as tmp:
+        alice = os.path.join(tmp, "alice")
+        bob = os.path.join(tmp, "bob")
+        _touch(os.path.join(alice, ".config", "Acme", "settings.json"), 100)
+        _touch(os.path.join(alice, ".cache", "acme", "blob"), 2048)
+        _touch(os.path.join(bob, ".acme", "state"), 10)
+        _touch(os.path.join(bob, "acme-notes.txt"), 10)
+        _touch(os.path.join(bob, ".config", "other", "x"), 10)
+        
+        residue = user_residue.scan_all_users("acme", [("alice", alice), ("bob", bob)], max_workers=2)
+        found = {(item.user, os.path.relpath(item.path, tmp), item.size) for item in residue}
+        assert found == {
+            ("alice", "alice/.config/Acme", 100),
+            ("alice", "alice/.cache/acme", 2048),
+            ("bob", "bob/.acme", 10),
+        }
+
+
+def test_format_size():
+    """Sizes are shown with a readable unit."""
+    assert user_residue.format_size(512) == "512 B"
+    assert user_residue.format_size(1536) == "1.5 KB"
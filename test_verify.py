@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for post-uninstall verification
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from uninstall_helper.verify import Manifest, check
+
+
+def test_paths_survived_reappeared_and_gone():
+    """Paths are judged by inode identity, not just existence."""
+    with tempfile.TemporaryDirectory() as tmp:
+        kept = os.path.join(tmp, "kept")
+        replaced = os.path.join(tmp, "replaced")
+        removed = os.path.join(tmp, "removed")
+        for path in (kept, removed):
+            open(path, "w").close()
+        os.makedirs(replaced)
+        
+        manifest = Manifest()
+        manifest.add_paths([kept, replaced, removed, os.path.join(tmp, "never-existed")])
+        assert len(manifest) == 3
+        
+        os.unlink(removed)
+        shutil.rmtree(replaced)
+        open(replaced, "w").close()
+        
+        survivors = {survivor.item: survivor.state for survivor in check(manifest)}
+        assert survivors == {kept: "survived", replaced: "reappeared"}
+
+
+def test_process_survivors_and_packages():
+    """A running process survives until it exits; packages are checked against one listing."""
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        manifest = Manifest()
+        manifest.add_processes([proc.pid])
+        manifest.add_packages(["acme", "libacme"])
+        survivors = check(manifest, list_packages=lambda: {"libacme", "bash"})
+        assert [(s.kind, s.item) for s in survivors] == [("process", proc.pid), ("package", "libacme")]
+    finally:
+        proc.kill()
+        proc.wait()
+    assert check(manifest, list_packages=set) == []
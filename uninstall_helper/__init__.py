@@ -0,0 +1,11 @@
+"""
+Uninstall Helper - AI-powered uninstallation tool for Windows, macOS, and Linux.
+
+Uninstaller (core.py) is the quiet, embeddable API; UninstallHelper
+(helper.py) is the orchestration class the CLI and GUI drive.
+"""
+
+from .core import Detection, Plan, Uninstaller
+from .helper import UninstallHelper
+
+__all__ = ["Detection", "Plan", "Uninstaller", "UninstallHelper"]
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Resumable cleanup checkpoints for Uninstall Helper.
+
+An rmtree of a multi-million-file tree that is interrupted (timeout, SSH
+drop, OOM) leaves a half-deleted tree, and the next run has to walk it
+from the top again.  Cleanup instead records its plan (the top-level
+targets still to remove and the directory stack of the tree being
+removed) in a small JSON file that is atomically replaced every few
+seconds, so a rerun continues with the exact directory it stopped in.
+Finished targets simply leave the plan, and finished subdirectories
+leave the stack, so neither is ever walked again.
+"""
+
+import json
+import os
+import re
+import stat
+import tempfile
+import time
+
+DEFAULT_DIR = "~/.cache/uninstall-helper/checkpoints"
+DEFAULT_INTERVAL = 2.0
+
+_VERSION = 1
+
+
+def checkpoint_path(directory, key):
+    """Return the checkpoint file for a key (e.g. the software name)."""
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", key) or "_"
+    return os.path.join(os.path.expanduser(directory), f"{name}.json")
+
+
+def _unlink(path, size):
+    os.unlink(path)
+
+
+class CleanupCheckpoint:
+    """
+    Plan and progress of one cleanup, flushed to disk periodically.
+    
+    Args:
+        path (str): Checkpoint file
+        key (str): What the cleanup is for (checked on load)
+        interval (float): Seconds between flushes while removing
+        clock (callable): Monotonic clock
+    """
+    
+    def __init__(self, path, key, interval=DEFAULT_INTERVAL, clock=time.monotonic):
+        self.path = path
+        self.key = key
+        self.interval = interval
+        self.clock = clock
+        self.pending = []     # top-level targets still to remove, current one first
+        self.current = None   # target whose tree is being removed
+        self.stack = []       # [directory, scanned] entries of the current tree
+        self.removed = 0      # entries unlinked, over all runs
+        self._flushed = clock()
+    
+    @classmethod
+    def open(cls, directory, key, interval=DEFAULT_INTERVAL):
+        """
+        Load the checkpoint left by an interrupted cleanup, or start an empty one.
+        
+        Args:
+            directory (str): Checkpoint directory
+            key (str): What the cleanup is for
+            interval (float): Seconds between flushes
+        
+        Returns:
+            CleanupCheckpoint: The checkpoint
+        """
+        checkpoint = cls(checkpoint_path(directory, key), key, interval)
+        try:
+            with open(checkpoint.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return checkpoint
+        if data.get("version") == _VERSION and data.get("key") == key:
+            checkpoint.pending = data.get("pending", [])
+            checkpoint.current = data.get("current")
+            checkpoint.stack = data.get("stack", [])
+            checkpoint.removed = data.get("removed", 0)
+        return checkpoint
+    
+    def plan(self, targets):
+        """
+        Set the targets to remove, keeping unfinished ones from an earlier run first.
+        
+        Args:
+            targets (iterable): Top-level paths
+        """
+        self.pending = list(dict.fromkeys(self.pending + list(targets)))
+        if self.current not in self.pending:
+            self.current = None
+            self.stack = []
+        elif self.pending[0] != self.current:
+            # Resume the interrupted tree before starting new ones
+            self.pending.remove(self.current)
+            self.pending.insert(0, self.current)
+        self.flush()
+    
+    def flush(self):
+        """Atomically replace the checkpoint file with the current state."""
+        data = {
+            "version": _VERSION,
+            "key": self.key,
+            "pending": self.pending,
+            "current": self.current,
+            "stack": self.stack,
+            "removed": self.removed,
+        }
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".checkpoint-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._flushed = self.clock()
+    
+    def tick(self):
+        """Flush if the interval has passed since the last flush."""
+        if self.clock() - self._flushed >= self.interval:
+            self.flush()
+    
+    def remove_tree(self, path, unlink=_unlink, rmdir=os.rmdir, listed=None):
+        """
+        Delete a directory tree bottom-up, resuming from the saved stack.
+        
+        A directory stays on the stack until all its files are unlinked and
+        its subdirectories are pushed, so whatever the last flush saw can be
+        replayed: entries that are already gone are skipped.  Symlinks are
+        removed, never followed; a path that is itself a symlink is refused.
+        
+        Args:
+            path (str): Directory to delete
+            unlink (callable): unlink(path, size) for files and symlinks
+            rmdir (callable): Removes an empty directory
+            listed (callable): Called with the number of entries of each directory read
+        
+        Raises:
+            NotADirectoryError: If path is a symlink (its target is never walked)
+        """
+        try:
+            if stat.S_ISLNK(os.lstat(path).st_mode):
+                raise NotADirectoryError(f"Refusing to walk symlink: {path}")
+        except FileNotFoundError:
+            pass
+        if self.current != path or not self.stack:
+            self.current = path
+            self.stack = [[path, False]]
+        while self.stack:
+            directory, scanned = self.stack[-1]
+            if scanned:
+                try:
+                    rmdir(directory)
+                except FileNotFoundError:
+                    pass
+                self.stack.pop()
+                self.tick()
+                continue
+            try:
+                if stat.S_ISLNK(os.lstat(directory).st_mode):
+                    # Replaced by a symlink since it was pushed: remove the link only
+                    unlink(directory, 0)
+                    self.stack.pop()
+                    continue
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except FileNotFoundError:
+                self.stack.pop()
+                continue
+            if listed:
+                listed(len(entries))
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append([entry.path, False])
+                    continue
+                try:
+                    unlink(entry.path, entry.stat(follow_symlinks=False).st_size)
+                except FileNotFoundError:
+                    continue
+                self.removed += 1
+                self.tick()
+            self.stack[-1] = [directory, True]
+            self.stack.extend(subdirs)
+    
+    def complete(self, path):
+        """Mark a top-level target as finished (removed or given up on)."""
+        if path in self.pending:
+            self.pending.remove(path)
+        if self.current == path:
+            self.current = None
+            self.stack = []
+        self.tick()
+    
+    def finish(self):
+        """Delete the checkpoint once nothing is pending, else flush it."""
+        if self.pending:
+            self.flush()
+            return
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Conffile audit for Uninstall Helper.
+
+"apt remove" leaves a package's /etc conffiles behind and "apt purge"
+deletes them whether or not the admin edited them.  This module reads the
+md5sums dpkg recorded for every conffile of the packages being removed
+(one pass over the status database), hashes the files on disk in parallel
+(mmap'd reads, so the hashing threads run without the GIL and without
+copying file data), and sorts them into unmodified files that are safe to
+purge and modified ones to keep or back up.
+
+pacman already saves modified backup files as .pacsave on removal, so only
+dpkg systems are audited.
+"""
+
+import hashlib
+import mmap
+import os
+import shutil
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .package_graph import DPKG_STATUS_FILE, read_stanzas
+
+Conffile = namedtuple("Conffile", ["package", "path", "md5", "obsolete"])
+
+UNMODIFIED = "unmodified"
+MODIFIED = "modified"
+MISSING = "missing"
+
+DEFAULT_BACKUP_DIR = "~/.cache/uninstall-helper/conffile-backups"
+DEFAULT_MAX_WORKERS = 8
+
+
+def parse_conffiles(value, package=""):
+    """
+    Parse a dpkg Conffiles field.
+    
+    Args:
+        value (str): Field value, one "path md5 [flags]" entry per line
+            (the lines may already be joined with spaces)
+        package (str): Owning package
+    
+    Returns:
+        list: Conffile tuples
+    """
+    conffiles = []
+    tokens = (value or "").split()
+    i = 0
+    while i + 1 < len(tokens):
+        path, md5 = tokens[i], tokens[i + 1]
+        i += 2
+        flags = []
+        while i < len(tokens) and not tokens[i].startswith("/"):
+            flags.append(tokens[i])
+            i += 1
+        conffiles.append(Conffile(package, path, md5, "obsolete" in flags))
+    return conffiles
+
+
+def load_conffiles(packages, status_file=DPKG_STATUS_FILE):
+    """
+    Read the conffiles of installed packages from the dpkg status database.
+    
+    Args:
+        packages (iterable): Package names
+        status_file (str): dpkg status database
+    
+    Returns:
+        list: Conffile tuples, in status-file order
+    """
+    wanted = set(packages)
+    conffiles = []
+    try:
+        for fields in read_stanzas(status_file):
+            if fields.get("Package") in wanted and fields.get("Status", "").endswith(" installed"):
+                conffiles += parse_conffiles(fields.get("Conffiles"), fields["Package"])
+    except OSError:
+        return []
+    return conffiles
+
+
+def md5_file(path):
+    """
+    Hash a file through a read-only memory map.
+    
+    Args:
+        path (str): File to hash
+    
+    Returns:
+        str: Hex digest, or None if the file does not exist (an unreadable
+            file raises OSError)
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    try:
+        if os.fstat(fd).st_size == 0:
+            return hashlib.md5(b"").hexdigest()
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            return hashlib.md5(mapped).hexdigest()
+    finally:
+        os.close(fd)
+
+
+def _classify(conffile):
+    try:
+        digest = md5_file(conffile.path)
+    except (OSError, ValueError):
+        # Cannot tell, so it is not safe to purge
+        return conffile, MODIFIED
+    if digest is None:
+        return conffile, MISSING
+    return conffile, UNMODIFIED if digest == conffile.md5 else MODIFIED
+
+
+def audit(conffiles, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Compare conffiles on disk with their recorded md5sums in one batched pass.
+    
+    Args:
+        conffiles (list): Conffile tuples
+        max_workers (int): Hashing threads
+    
+    Returns:
+        list: (Conffile, state) pairs in input order; state is UNMODIFIED,
+            MODIFIED or MISSING
+    """
+    if not conffiles:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(conffiles)))) as pool:
+        return list(pool.map(_classify, conffiles))
+
+
+def backup(conffiles, backup_dir=DEFAULT_BACKUP_DIR, stamp=None):
+    """
+    Copy conffiles to a timestamped backup directory, keeping their paths.
+    
+    /etc/acme/acme.conf of package acme is saved as
+    <backup_dir>/<stamp>/acme/etc/acme/acme.conf.
+    
+    Args:
+        conffiles (list): Conffile tuples to save
+        backup_dir (str): Backup root
+        stamp (str): Subdirectory name (defaults to the current time)
+    
+    Returns:
+        tuple: (list of backup paths, list of (path, error) failures)
+    """
+    root = os.path.join(os.path.expanduser(backup_dir), stamp or time.strftime("%Y%m%d-%H%M%S"))
+    saved = []
+    failed = []
+    for conffile in conffiles:
+        target = os.path.join(root, conffile.package, conffile.path.lstrip("/"))
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(conffile.path, target, follow_symlinks=False)
+            saved.append(target)
+        except OSError as e:
+            failed.append((conffile.path, str(e)))
+    return saved, failed
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Quiet programmatic API for Uninstall Helper.
+
+UninstallHelper writes progress to stdout and prompts with input(), which
+suits the CLI but forces services to spawn it and parse its output.
+Uninstaller wraps it with typed results, never prints or prompts (the
+helper's output is passed to an optional progress callback instead), caps
+how many operations run at once, and offers an async variant of every
+operation for asyncio callers.
+    
+    from uninstall_helper import Uninstaller
+    
+    with Uninstaller(progress=lambda stage, message: log.info(message)) as un:
+        plan = un.plan("acme")
+        un.terminate([proc["pid"] for proc in plan.processes])
+        un.cleanup(plan.paths)
+        un.remove_packages(plan)
+"""
+
+import asyncio
+import contextlib
+import functools
+import queue
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .conffiles import MODIFIED, Conffile
+from .discovery import Finding
+from .helper import PACKAGE_COMMAND_TIMEOUT, UninstallHelper
+from .pathset import PathSet
+
+ProgressCallback = Callable[[str, str], None]
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+@dataclass
+class Detection:
+    """Processes and installation paths found for a piece of software."""
+    software: str
+    processes: List[dict] = field(default_factory=list)
+    paths: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Plan:
+    """What an uninstall would do, computed without changing anything."""
+    software: str
+    processes: List[dict] = field(default_factory=list)
+    paths: List[str] = field(default_factory=list)                 # removable top-level paths
+    blocked: List[Tuple[str, str]] = field(default_factory=list)   # (path, reason) kept by the guard
+    command: str = ""                                              # system uninstall command
+    packages: List[str] = field(default_factory=list)              # package followed by orphaned dependencies
+    bytes_reclaimed: int = 0
+    conffiles: List[Tuple[Conffile, str]] = field(default_factory=list)  # (conffile, audit state)
+    fallback_command: str = ""                                     # remove instead of purge
+
+
+class Uninstaller:
+    """
+    Quiet, thread-safe front-end over UninstallHelper.
+    
+    Args:
+        config (dict): Configuration; defaults to uninstall_config.json
+        progress (callable): progress(stage, message), called from worker
+            threads with the helper's output for each stage
+        max_concurrency (int): Operations allowed to run at once
+    """
+    
+    def __init__(self, config: Optional[dict] = None, progress: Optional[ProgressCallback] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.progress = progress
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._root = UninstallHelper()
+        if config is not None:
+            self._root.config = config
+        self._root.emit = self._emitter("setup")
+        self._root.ask = self._decline
+    
+    def __enter__(self) -> "Uninstaller":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Shut down the worker pool used by the async methods."""
+        self._executor.shutdown(wait=True)
+    
+    def _emitter(self, stage: str) -> Callable:
+        def emit(*args, **kwargs):
+            message = " ".join(str(arg) for arg in args).strip()
+            if self.progress is not None and message:
+                self.progress(stage, message)
+        return emit
+    
+    @staticmethod
+    def _decline(prompt: str = "") -> str:
+        return "n"
+    
+    def _helper(self, stage: str) -> UninstallHelper:
+        helper = self._root.spawn()
+        helper.emit = self._emitter(stage)
+        return helper
+    
+    # Synchronous API
+    
+    def iter_detect(self, software_name: str) -> Iterator[Finding]:
+        """
+        Stream discovery findings as providers produce them.
+        
+        Discovery runs on its own thread while holding a slot and hands
+        findings over through a queue, so a slow or abandoned consumer
+        never keeps a slot occupied.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Yields:
+            Finding: kind "process" (detail is the process dict) or "path"
+        """
+        findings = queue.Queue()
+        stop = threading.Event()
+        
+        def produce():
+            try:
+                with self._slots, contextlib.closing(self._helper("detect").iter_discovery(software_name)) as discovery:
+                    for finding in discovery:
+                        if stop.is_set():
+                            break
+                        findings.put(finding)
+            except Exception as e:  # re-raised in the consumer
+                findings.put(e)
+            findings.put(None)
+        
+        threading.Thread(target=produce, name="uninstaller-detect", daemon=True).start()
+        try:
+            while True:
+                finding = findings.get()
+                if finding is None:
+                    return
+                if isinstance(finding, Exception):
+                    raise finding
+                yield finding
+        finally:
+            stop.set()
+    
+    def detect(self, software_name: str) -> Detection:
+        """
+        Find the processes and installation paths of the software.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            Detection: The findings
+        """
+        with self._slots:
+            processes, paths = self._helper("detect").discover(software_name)
+        return Detection(software_name, processes, paths)
+    
+    def plan(self, software_name: str) -> Plan:
+        """
+        Work out what uninstalling the software would do.
+        
+        Paths are filtered through the path guard and reduced to top-level
+        roots; the package list includes dependencies the removal orphans.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            Plan: The plan
+        """
+        with self._slots:
+            helper = self._helper("plan")
+            processes, paths = helper.discover(software_name)
+            allowed, blocked = helper.guard_paths(paths)
+            finding = helper.get_uninstall_finding(software_name)
+        command = finding.value if finding else ""
+        detail = finding.detail if finding and isinstance(finding.detail, dict) else {}
+        orphans = detail.get("orphans")
+        conffile_plan = detail.get("conffiles")
+        plan = Plan(software_name, processes, PathSet(allowed).roots(), blocked, command)
+        if orphans:
+            plan.packages = [orphans["package"]] + orphans["orphans"]
+            plan.bytes_reclaimed = orphans["bytes"]
+        if conffile_plan:
+            plan.conffiles = conffile_plan["audit"]
+            plan.fallback_command = conffile_plan["fallback"] or ""
+        return plan
+    
+    def terminate(self, pids: Iterable[int]) -> List[int]:
+        """
+        Terminate processes.
+        
+        Args:
+            pids (iterable): Process IDs
+        
+        Returns:
+            list: PIDs that were terminated
+        """
+        with self._slots:
+            helper = self._helper("terminate")
+            return [pid for pid in pids if helper.terminate_process(pid)]
+    
+    def cleanup(self, paths: Iterable[str]) -> int:
+        """
+        Remove files and directories (protected paths are never touched).
+        
+        Args:
+            paths (iterable): Paths to remove
+        
+        Returns:
+            int: Number of paths removed
+        """
+        with self._slots:
+            return self._helper("cleanup").cleanup_files(PathSet(paths).roots())
+    
+    def remove_packages(self, plan: Plan) -> bool:
+        """
+        Run the plan's system uninstall command.
+        
+        A purge is only planned when linux.purge_conffiles is on.  Modified
+        conffiles are backed up before it; if a backup fails the plan's
+        remove command runs instead.
+        
+        Args:
+            plan (Plan): Output of plan()
+        
+        Returns:
+            bool: True if the command succeeded
+        """
+        if not plan.command:
+            return False
+        emit = self._emitter("package")
+        with self._slots:
+            command = plan.command
+            if plan.fallback_command:
+                modified = [conffile for conffile, state in plan.conffiles if state == MODIFIED]
+                command, _saved = self._helper("package").backup_conffiles(command, modified, plan.fallback_command)
+            try:
+                result = subprocess.run(command, shell=True, capture_output=True, text=True,
+                                        timeout=PACKAGE_COMMAND_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                emit(f"Command timed out: {command}")
+                return False
+        if result.returncode != 0:
+            emit(f"Command failed: {result.stderr.strip()}")
+            return False
+        self._root._removed_packages.update(plan.packages)
+        return True
+    
+    def uninstall(self, software_name: str) -> Dict:
+        """
+        Run the whole non-interactive uninstall for the software.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            dict: Summary, as returned by UninstallHelper.run_uninstall
+        """
+        with self._slots:
+            return self._helper("uninstall").run_uninstall(software_name, interactive=False)
+    
+    def uninstall_many(self, software_names: List[str]) -> List[Dict]:
+        """
+        Uninstall several programs as one scheduled batch.
+        
+        Args:
+            software_names (list): Names of the software
+        
+        Returns:
+            list: Summary dicts in the order of software_names
+        """
+        with self._slots:
+            return self._helper("uninstall").run_batch(software_names)
+    
+    # Asynchronous API
+    
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+    
+    async def detect_async(self, software_name: str) -> Detection:
+        """Async variant of detect()."""
+        return await self._run(self.detect, software_name)
+    
+    async def plan_async(self, software_name: str) -> Plan:
+        """Async variant of plan()."""
+        return await self._run(self.plan, software_name)
+    
+    async def terminate_async(self, pids: Iterable[int]) -> List[int]:
+        """Async variant of terminate()."""
+        return await self._run(self.terminate, list(pids))
+    
+    async def cleanup_async(self, paths: Iterable[str]) -> int:
+        """Async variant of cleanup()."""
+        return await self._run(self.cleanup, list(paths))
+    
+    async def remove_packages_async(self, plan: Plan) -> bool:
+        """Async variant of remove_packages()."""
+        return await self._run(self.remove_packages, plan)
+    
+    async def uninstall_async(self, software_name: str) -> Dict:
+        """Async variant of uninstall()."""
+        return await self._run(self.uninstall, software_name)
+    
+    async def uninstall_many_async(self, software_names: List[str]) -> List[Dict]:
+        """Async variant of uninstall_many()."""
+        return await self._run(self.uninstall_many, list(software_names))
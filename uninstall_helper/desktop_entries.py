@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Desktop entry index for Uninstall Helper.
+
+Parses every .desktop file under the XDG application directories in one
+pass into an index of Name, Exec, TryExec, Icon and StartupWMClass, so a
+display name such as "Visual Studio Code" resolves to its binary, process
+names and menu/icon leftovers.  The index is cached on disk and
+invalidated when any application directory's mtime changes.
+"""
+
+import glob
+import json
+import os
+import shlex
+import subprocess
+from collections import namedtuple
+
+DesktopEntry = namedtuple("DesktopEntry", ["path", "name", "exec", "try_exec", "icon", "wm_class", "binary"])
+
+DEFAULT_CACHE_PATH = "~/.cache/uninstall-helper/desktop-entries.json"
+CACHE_VERSION = 1
+
+# Entries below these prefixes belong to a package manager and go away with the package
+MANAGED_PREFIXES = ("/usr/share/", "/var/lib/flatpak/", "/var/lib/snapd/")
+
+_ICON_EXTENSIONS = ("png", "svg", "xpm")
+
+# Launchers whose process name says nothing about the application
+_LAUNCHERS = {"env", "sh", "bash", "flatpak", "snap", "python", "python3", "java",
+              "gtk-launch", "xdg-open", "pkexec", "sudo"}
+
+
+def application_dirs(extra=()):
+    """
+    Return the XDG application directories, most specific first.
+    
+    Args:
+        extra (iterable): Additional directories (e.g. from the config)
+    
+    Returns:
+        list: Existing directory paths without duplicates
+    """
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    candidates = [os.path.join(data_home, "applications")]
+    candidates += [os.path.join(d, "applications") for d in data_dirs.split(":") if d]
+    candidates += [
+        "/var/lib/flatpak/exports/share/applications",
+        "/var/lib/snapd/desktop/applications",
+    ]
+    candidates += [os.path.expanduser(d) for d in extra]
+    
+    dirs = []
+    for directory in candidates:
+        directory = os.path.normpath(directory)
+        if directory not in dirs and os.path.isdir(directory):
+            dirs.append(directory)
+    return dirs
+
+
+def exec_binary(exec_line):
+    """
+    Extract the program from an Exec= line.
+    
+    Leading 'env VAR=value' assignments and field codes (%U, %f, ...) are
+    skipped.
+    
+    Args:
+        exec_line (str): Value of Exec=
+    
+    Returns:
+        str: The program as written (absolute path or bare name), or None
+    """
+    if not exec_line:
+        return None
+    try:
+        argv = shlex.split(exec_line)
+    except ValueError:
+        argv = exec_line.split()
+    for arg in argv:
+        if arg == "env" or ("=" in arg and not arg.startswith("/")) or arg.startswith("%"):
+            continue
+        return arg
+    return None
+
+
+def parse_desktop_file(path):
+    """
+    Parse the [Desktop Entry] group of a .desktop file.
+    
+    Args:
+        path (str): Path to the file
+    
+    Returns:
+        DesktopEntry: The entry, or None if it is not an application
+    """
+    fields = {}
+    in_entry = False
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    if in_entry:
+                        break
+                    in_entry = line == "[Desktop Entry]"
+                    continue
+                if not in_entry or "=" not in line or line.startswith("#"):
+                    continue
+                key, value = line.split("=", 1)
+                key = key.strip()
+                if key in ("Type", "Name", "Exec", "TryExec", "Icon", "StartupWMClass") and key not in fields:
+                    fields[key] = value.strip()
+    except OSError:
+        return None
+    
+    if fields.get("Type", "Application") != "Application" or "Name" not in fields:
+        return None
+    binary = fields.get("TryExec") or exec_binary(fields.get("Exec"))
+    return DesktopEntry(path, fields["Name"], fields.get("Exec"), fields.get("TryExec"),
+                        fields.get("Icon"), fields.get("StartupWMClass"), binary)
+
+
+def _dir_stamps(dirs):
+    stamps = {}
+    for directory in dirs:
+        for root, _subdirs, _files in os.walk(directory):
+            try:
+                stamps[root] = os.stat(root).st_mtime_ns
+            except OSError:
+                continue
+    return stamps
+
+
+class DesktopEntryIndex:
+    """
+    Cached index of installed desktop entries.
+    
+    Args:
+        dirs (list): Application directories (defaults to application_dirs())
+        cache_path (str): JSON cache file, or None to disable the on-disk cache
+    """
+    
+    def __init__(self, dirs=None, cache_path=DEFAULT_CACHE_PATH):
+        self.dirs = application_dirs() if dirs is None else list(dirs)
+        self.cache_path = os.path.expanduser(cache_path) if cache_path else None
+        self.entries = []
+        self.from_cache = False
+        self.load()
+    
+    def load(self):
+        """Load the index from the cache, rebuilding it if any directory changed."""
+        stamps = _dir_stamps(self.dirs)
+        if self._load_cache(stamps):
+            self.from_cache = True
+            return
+        
+        entries = []
+        for root in sorted(stamps):
+            try:
+                names = sorted(os.listdir(root))
+            except OSError:
+                continue
+            for name in names:
+                if name.endswith(".desktop"):
+                    entry = parse_desktop_file(os.path.join(root, name))
+                    if entry is not None:
+                        entries.append(entry)
+        self.entries = entries
+        self.from_cache = False
+        self._save_cache(stamps)
+    
+    def _load_cache(self, stamps):
+        if not self.cache_path:
+            return False
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if cached.get("version") != CACHE_VERSION or cached.get("stamps") != stamps:
+            return False
+        self.entries = [DesktopEntry(*fields) for fields in cached.get("entries", [])]
+        return True
+    
+    def _save_cache(self, stamps):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "stamps": stamps,
+                           "entries": [list(entry) for entry in self.entries]}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+    
+    def resolve(self, software_name):
+        """
+        Find desktop entries for a display name, file name, binary or WM class.
+        
+        Names are compared with case and punctuation removed, so
+        "GNOME To Do" finds org.gnome.Todo.desktop.  Exact matches win;
+        otherwise entries whose name or file name contains the query are
+        returned.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            list: Matching DesktopEntry tuples
+        """
+        query = _squash(software_name)
+        if not query:
+            return []
+        exact = []
+        partial = []
+        for entry in self.entries:
+            stem = os.path.basename(entry.path)[:-len(".desktop")]
+            names = {_squash(entry.name), _squash(stem), _squash(stem.rsplit(".", 1)[-1]),
+                     _squash(entry.wm_class or "")}
+            if entry.binary:
+                names.add(_squash(os.path.basename(entry.binary)))
+            if query in names:
+                exact.append(entry)
+            elif len(query) >= 4 and (query in _squash(entry.name) or query in _squash(stem)):
+                partial.append(entry)
+        return exact or partial
+
+
+def _squash(text):
+    return "".join(ch for ch in text.lower() if ch.isalnum())
+
+
+def binary_names(entries):
+    """Return the process names the entries' programs run as."""
+    names = set()
+    for entry in entries:
+        if entry.binary and os.path.basename(entry.binary) not in _LAUNCHERS:
+            names.add(os.path.basename(entry.binary))
+        if entry.wm_class:
+            names.add(entry.wm_class.lower())
+    return names
+
+
+def is_package_managed(path):
+    """Check whether a path is owned by a package manager's data tree."""
+    return path.startswith(MANAGED_PREFIXES)
+
+
+def icon_paths(icon, data_home=None):
+    """
+    Find user-installed icon files for an Icon= value.
+    
+    Args:
+        icon (str): Icon name or absolute path
+        data_home (str): XDG data home (defaults to ~/.local/share)
+    
+    Returns:
+        list: Existing icon files that are not package-managed
+    """
+    if not icon:
+        return []
+    if os.path.isabs(icon):
+        return [icon] if os.path.isfile(icon) and not is_package_managed(icon) else []
+    
+    data_home = data_home or os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    found = []
+    for ext in _ICON_EXTENSIONS:
+        found += glob.glob(os.path.join(glob.escape(data_home), "icons", "*", "*", "apps",
+                                        f"{glob.escape(icon)}.{ext}"))
+        found += glob.glob(os.path.join("/usr/local/share/icons", "*", "*", "apps",
+                                        f"{glob.escape(icon)}.{ext}"))
+    return sorted(set(found))
+
+
+def leftover_paths(entries):
+    """
+    Return the menu entries and icons that should be removed with the software.
+    
+    Package-managed entries are left for the package manager.
+    
+    Args:
+        entries (list): DesktopEntry tuples
+    
+    Returns:
+        list: Paths to remove
+    """
+    paths = []
+    for entry in entries:
+        if not is_package_managed(entry.path):
+            paths.append(entry.path)
+        paths.extend(icon_paths(entry.icon))
+    return list(dict.fromkeys(paths))
+
+
+def refresh_caches(application_dirs=(), icon_theme_dirs=(), runner=subprocess.run):
+    """
+    Refresh the desktop-file and icon caches once for a whole batch.
+    
+    Args:
+        application_dirs (iterable): Application directories that changed
+        icon_theme_dirs (iterable): Icon theme directories that changed
+        runner (callable): subprocess.run compatible callable
+    
+    Returns:
+        list: Commands that were run
+    """
+    commands = []
+    for directory in sorted(set(application_dirs)):
+        commands.append(["update-desktop-database", "-q", directory])
+    for theme_dir in sorted(set(icon_theme_dirs)):
+        if os.path.exists(os.path.join(theme_dir, "index.theme")):
+            commands.append(["gtk-update-icon-cache", "-q", "-f", "-t", theme_dir])
+    
+    ran = []
+    for cmd in commands:
+        try:
+            runner(cmd, capture_output=True, timeout=60)
+            ran.append(cmd)
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+    return ran
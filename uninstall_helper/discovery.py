@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Pluggable discovery framework for Uninstall Helper.
+
+Discovery sources (process table, filesystem roots, package databases,
+desktop entries, services, ...) are registered as providers.  The engine
+runs every provider that applies to the platform concurrently, each under
+its own time budget, and streams their findings into one deduplicated
+result set, so discovery takes as long as the slowest provider rather
+than the sum of all of them.
+"""
+
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from .pathset import PathSet
+
+Finding = namedtuple("Finding", ["kind", "value", "source", "detail"])
+Finding.__new__.__defaults__ = (None, None)
+
+ProviderReport = namedtuple("ProviderReport", ["name", "status", "seconds", "findings", "error"])
+
+DEFAULT_BUDGET = 20.0
+
+
+class DiscoveryProvider:
+    """
+    Base class for discovery providers.
+    
+    Subclasses set name/kinds/systems and implement discover(), yielding
+    Finding tuples.  Long-running providers should check cancel.is_set()
+    regularly and stop early once it is set.
+    """
+    
+    name = "provider"
+    kinds = ("path",)
+    systems = None  # None means every platform
+    budget = DEFAULT_BUDGET
+    
+    def supports(self, system):
+        """Check whether the provider applies to a platform."""
+        return self.systems is None or system in self.systems
+    
+    def discover(self, query, cancel):
+        """
+        Yield findings for a query.
+        
+        Args:
+            query (str): Name of the software
+            cancel (threading.Event): Set when the budget is exhausted
+        """
+        raise NotImplementedError
+
+
+class FunctionProvider(DiscoveryProvider):
+    """
+    Provider wrapping a plain callable(query, cancel) -> iterable of Findings.
+    
+    Args:
+        name (str): Provider name (also used as Finding.source)
+        func (callable): Discovery function
+        kinds (tuple): Kinds of findings the function yields
+        systems (tuple): Platforms it applies to, or None for all
+        budget (float): Time budget in seconds
+    """
+    
+    def __init__(self, name, func, kinds=("path",), systems=None, budget=DEFAULT_BUDGET):
+        self.name = name
+        self.func = func
+        self.kinds = tuple(kinds)
+        self.systems = tuple(systems) if systems else None
+        self.budget = budget
+    
+    def discover(self, query, cancel):
+        return self.func(query, cancel)
+
+
+class DiscoveryEngine:
+    """
+    Runs registered providers concurrently and merges their findings.
+    
+    Args:
+        budgets (dict): Per-provider budget overrides in seconds
+        default_budget (float): Budget for providers without an override
+    """
+    
+    def __init__(self, budgets=None, default_budget=None):
+        self.providers = []
+        self.budgets = dict(budgets or {})
+        self.default_budget = default_budget
+        self.last_reports = []
+    
+    def register(self, provider):
+        """Register a provider; registration order sets provider priority."""
+        self.providers.append(provider)
+        return provider
+    
+    def priority(self, source):
+        """Return the registration rank of a provider name (lower is preferred)."""
+        for rank, provider in enumerate(self.providers):
+            if provider.name == source:
+                return rank
+        return len(self.providers)
+    
+    def _budget(self, provider):
+        if provider.name in self.budgets:
+            return self.budgets[provider.name]
+        if self.default_budget is not None:
+            return self.default_budget
+        return provider.budget
+    
+    def iter_findings(self, query, system, kinds=None):
+        """
+        Run the applicable providers concurrently and yield unique findings as they arrive.
+        
+        Providers that overrun their budget are cancelled and anything they
+        produce afterwards is discarded.  Per-provider outcomes are left in
+        last_reports once the generator is exhausted.
+        
+        Args:
+            query (str): Name of the software
+            system (str): Platform name as returned by platform.system().lower()
+            kinds (iterable): Only run providers yielding these kinds (default: all)
+        
+        Yields:
+            Finding: Each (kind, value) pair once
+        """
+        kinds = set(kinds) if kinds else None
+        selected = [
+            provider for provider in self.providers
+            if provider.supports(system) and (kinds is None or kinds & set(provider.kinds))
+        ]
+        self.last_reports = []
+        if not selected:
+            return
+        
+        out = queue.Queue()
+        states = {}
+        start = time.monotonic()
+        for provider in selected:
+            cancel = threading.Event()
+            states[provider.name] = {
+                "cancel": cancel,
+                "deadline": start + self._budget(provider),
+                "done": False,
+                "count": 0,
+            }
+            thread = threading.Thread(
+                target=self._run_provider,
+                args=(provider, query, cancel, out),
+                name=f"discovery-{provider.name}",
+                daemon=True
+            )
+            thread.start()
+        
+        seen = set()
+        seen_paths = PathSet()  # path findings can run to hundreds of thousands
+        pending = len(selected)
+        try:
+            while pending:
+                now = time.monotonic()
+                open_deadlines = [s["deadline"] for s in states.values() if not s["done"]]
+                try:
+                    item = out.get(timeout=max(0.0, min(open_deadlines) - now))
+                except queue.Empty:
+                    now = time.monotonic()
+                    for name, state in states.items():
+                        if not state["done"] and now >= state["deadline"]:
+                            state["cancel"].set()
+                            state["done"] = True
+                            pending -= 1
+                            self.last_reports.append(ProviderReport(
+                                name, "timeout", now - start, state["count"], None))
+                    continue
+                
+                name, finding, status, error = item
+                state = states[name]
+                if state["done"]:
+                    continue
+                if finding is None:
+                    state["done"] = True
+                    pending -= 1
+                    self.last_reports.append(ProviderReport(
+                        name, status, time.monotonic() - start, state["count"], error))
+                    continue
+                
+                if kinds is not None and finding.kind not in kinds:
+                    continue
+                state["count"] += 1
+                if finding.kind == "path":
+                    if seen_paths.add(finding.value):
+                        yield finding
+                    continue
+                key = (finding.kind, finding.value)
+                if key not in seen:
+                    seen.add(key)
+                    yield finding
+        finally:
+            # Stop stragglers, including when the consumer stops iterating early
+            for state in states.values():
+                state["cancel"].set()
+    
+    def run(self, query, system, kinds=None):
+        """
+        Run discovery to completion.
+        
+        Returns:
+            list: Unique findings in arrival order
+        """
+        return list(self.iter_findings(query, system, kinds))
+    
+    @staticmethod
+    def _run_provider(provider, query, cancel, out):
+        try:
+            for finding in provider.discover(query, cancel) or ():
+                if cancel.is_set():
+                    break
+                if finding.source is None:
+                    finding = finding._replace(source=provider.name)
+                out.put((provider.name, finding, None, None))
+            out.put((provider.name, None, "cancelled" if cancel.is_set() else "ok", None))
+        except Exception as e:  # a broken provider must not break discovery
+            out.put((provider.name, None, "error", str(e)))
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Language-ecosystem install index for Uninstall Helper.
+
+Tools installed with pip, pipx, npm -g or cargo install are invisible to
+the system package manager.  Each ecosystem already records what it
+installed, so this module reads that metadata instead of walking
+site-packages or node_modules:
+    
+    pip    *.dist-info/RECORD and entry_points.txt (only dists whose
+           INSTALLER is pip or uv; distro-packaged dists are left alone)
+    pipx   venvs/*/pipx_metadata.json
+    npm    lib/node_modules/*/package.json "bin" maps
+    cargo  ~/.cargo/.crates2.json
+
+The result is one index of EcosystemInstall tuples with the exact paths to
+remove and the ecosystem's own uninstall command.  It is cached on disk
+and invalidated when any metadata directory's mtime changes.
+"""
+
+import csv
+import glob
+import json
+import os
+import re
+import shlex
+import shutil
+import site
+from collections import namedtuple
+
+EcosystemInstall = namedtuple("EcosystemInstall", ["ecosystem", "name", "version", "paths", "bins", "command"])
+
+DEFAULT_CACHE_PATH = "~/.cache/uninstall-helper/ecosystems.json"
+CACHE_VERSION = 1
+
+PIP_INSTALLERS = ("pip", "uv")
+
+# Their uninstall commands fail once the installed files are gone (cargo
+# reports "corrupt metadata"), so cleanup leaves the files to the command
+COMMAND_OWNS_FILES = {"pipx", "cargo"}
+
+# Shipped with Node itself; removing them belongs to the system package
+NPM_BUNDLED = {"npm", "corepack"}
+
+_SITE_PATTERNS = (
+    "/usr/local/lib/python3*/site-packages",
+    "/usr/local/lib/python3*/dist-packages",
+    "~/.local/lib/python3*/site-packages",
+)
+
+_NPM_PREFIXES = ("/usr/local", "/usr", "~/.npm-global", "~/.local")
+
+
+def normalize(name):
+    """Normalize a distribution name as PEP 503 does ("Foo_Bar" -> "foo-bar")."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def default_sources(site_packages=()):
+    """
+    Return the metadata locations to index, by ecosystem.
+    
+    Args:
+        site_packages (iterable): Additional site-packages directories
+    
+    Returns:
+        dict: Ecosystem name -> list of existing directories
+    """
+    site_dirs = []
+    try:
+        site_dirs += site.getsitepackages()
+    except AttributeError:
+        pass
+    site_dirs.append(site.getusersitepackages())
+    for pattern in _SITE_PATTERNS:
+        site_dirs += sorted(glob.glob(os.path.expanduser(pattern)))
+    site_dirs += [os.path.expanduser(d) for d in site_packages]
+    
+    pipx_homes = [os.environ.get("PIPX_HOME") or "~/.local/share/pipx", "~/.local/pipx"]
+    npm_prefixes = [os.environ.get("NPM_CONFIG_PREFIX") or _NPM_PREFIXES[0]] + list(_NPM_PREFIXES)
+    cargo_homes = [os.environ.get("CARGO_HOME") or "~/.cargo"]
+    
+    def existing(dirs, sub=""):
+        found = []
+        for directory in dirs:
+            directory = os.path.normpath(os.path.expanduser(directory))
+            if directory not in found and os.path.isdir(os.path.join(directory, sub)):
+                found.append(directory)
+        return found
+    
+    return {
+        "pip": existing(site_dirs),
+        "pipx": existing(pipx_homes, "venvs"),
+        "npm": existing(npm_prefixes, os.path.join("lib", "node_modules")),
+        "cargo": existing(cargo_homes),
+    }
+
+
+def _read_text(path):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _read_json(path):
+    text = _read_text(path)
+    if text is None:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def _metadata_field(text, field):
+    for line in text.splitlines():
+        if not line.strip():
+            break
+        key, _, value = line.partition(":")
+        if key.strip().lower() == field:
+            return value.strip()
+    return None
+
+
+def _entry_point_names(text):
+    names = []
+    in_scripts = False
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            in_scripts = line in ("[console_scripts]", "[gui_scripts]")
+        elif in_scripts and "=" in line:
+            names.append(line.split("=", 1)[0].strip())
+    return names
+
+
+def pip_command(site_dir, name):
+    """
+    Build the pip uninstall command for a dist in site_dir.
+    
+    The interpreter that owns site_dir is used, so a dist installed for
+    python3.11 is not looked up in another interpreter's environment.
+    
+    Args:
+        site_dir (str): The site-packages directory
+        name (str): Distribution name
+    
+    Returns:
+        str: The command, or "" if no matching interpreter is found
+    """
+    lib_dir = os.path.dirname(site_dir)
+    python = os.path.basename(lib_dir)
+    if not python.startswith("python"):
+        return ""
+    prefix = os.path.dirname(os.path.dirname(lib_dir))
+    interpreter = os.path.join(prefix, "bin", python)
+    if not os.access(interpreter, os.X_OK):
+        interpreter = shutil.which(python)
+    if not interpreter:
+        return ""
+    command = f"{shlex.quote(interpreter)} -m pip uninstall -y {shlex.quote(name)}"
+    # pip refuses to touch an externally managed environment unless told to;
+    # the dist was put there by pip in the first place
+    stdlib = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(interpreter))), "lib", python)
+    if os.path.exists(os.path.join(stdlib, "EXTERNALLY-MANAGED")):
+        command += " --break-system-packages"
+    return command
+
+
+def load_pip(site_dir):
+    """
+    Read the pip-installed distributions of one site-packages directory.
+    
+    Each dist owns the top-level entries its RECORD lists unless another
+    dist lists files below them too (namespace packages, shared
+    __pycache__); then only its own files are removed.
+    
+    Args:
+        site_dir (str): The site-packages directory
+    
+    Returns:
+        list: EcosystemInstall tuples
+    """
+    try:
+        names = sorted(os.listdir(site_dir))
+    except OSError:
+        return []
+    
+    dists = []
+    owners = {}
+    for entry in names:
+        if not entry.endswith(".dist-info"):
+            continue
+        dist_info = os.path.join(site_dir, entry)
+        installer = (_read_text(os.path.join(dist_info, "INSTALLER")) or "").strip()
+        record = _read_text(os.path.join(dist_info, "RECORD"))
+        if record is None:
+            continue
+        metadata = _read_text(os.path.join(dist_info, "METADATA")) or ""
+        name = _metadata_field(metadata, "name") or entry[:-len(".dist-info")].split("-")[0]
+        version = _metadata_field(metadata, "version") or ""
+        
+        files = []
+        tops = set()
+        for row in csv.reader(record.splitlines()):
+            if not row or not row[0]:
+                continue
+            path = os.path.normpath(os.path.join(site_dir, row[0]))
+            files.append(path)
+            relative = os.path.relpath(path, site_dir)
+            if not relative.startswith(os.pardir):
+                tops.add(relative.split(os.sep, 1)[0])
+        # Every dist counts as an owner, including ones pip does not manage
+        for top in tops:
+            owners.setdefault(top, set()).add(entry)
+        if installer not in PIP_INSTALLERS:
+            continue
+        bins = _entry_point_names(_read_text(os.path.join(dist_info, "entry_points.txt")))
+        dists.append((entry, name, version, files, bins))
+    
+    installs = []
+    for entry, name, version, files, bins in dists:
+        paths = []
+        for path in files:
+            relative = os.path.relpath(path, site_dir)
+            top = relative.split(os.sep, 1)[0]
+            if not relative.startswith(os.pardir) and owners.get(top) == {entry}:
+                path = os.path.join(site_dir, top)
+            if path not in paths:
+                paths.append(path)
+        installs.append(EcosystemInstall("pip", name, version, paths, bins, pip_command(site_dir, name)))
+    return installs
+
+
+def load_pipx(home, bin_dir=None, man_dir=None):
+    """
+    Read the apps installed by pipx.
+    
+    Args:
+        home (str): PIPX_HOME
+        bin_dir (str): Where pipx links apps (defaults to PIPX_BIN_DIR or ~/.local/bin)
+        man_dir (str): Where pipx links man pages (defaults to PIPX_MAN_DIR or ~/.local/share/man)
+    
+    Returns:
+        list: EcosystemInstall tuples
+    """
+    bin_dir = bin_dir or os.environ.get("PIPX_BIN_DIR") or os.path.expanduser("~/.local/bin")
+    man_dir = man_dir or os.environ.get("PIPX_MAN_DIR") or os.path.expanduser("~/.local/share/man")
+    venvs = os.path.join(home, "venvs")
+    try:
+        names = sorted(os.listdir(venvs))
+    except OSError:
+        return []
+    
+    installs = []
+    for entry in names:
+        venv = os.path.join(venvs, entry)
+        metadata = _read_json(os.path.join(venv, "pipx_metadata.json"))
+        if not isinstance(metadata, dict):
+            continue
+        main = metadata.get("main_package") or {}
+        name = main.get("package") or entry
+        apps = list(main.get("apps") or [])
+        paths = [venv]
+        for app in apps:
+            link = os.path.join(bin_dir, app)
+            # Only links pipx made into this venv; a same-named program is not ours
+            if os.path.islink(link) and os.path.realpath(link).startswith(venv + os.sep):
+                paths.append(link)
+        for page in main.get("man_pages") or []:
+            paths.append(os.path.join(man_dir, page))
+        installs.append(EcosystemInstall("pipx", name, main.get("package_version") or "", paths, apps,
+                                         f"pipx uninstall {shlex.quote(entry)}"))
+    return installs
+
+
+def _npm_bins(package, name):
+    bins = package.get("bin")
+    if isinstance(bins, str):
+        return [name.rsplit("/", 1)[-1]]
+    if isinstance(bins, dict):
+        return [str(key) for key in bins]
+    return []
+
+
+def npm_package_dirs(node_modules):
+    """List the package directories of a node_modules directory, including @scope/name."""
+    dirs = []
+    try:
+        names = sorted(os.listdir(node_modules))
+    except OSError:
+        return dirs
+    for entry in names:
+        if entry.startswith("."):
+            continue
+        path = os.path.join(node_modules, entry)
+        if entry.startswith("@"):
+            try:
+                dirs += [os.path.join(path, sub) for sub in sorted(os.listdir(path))]
+            except OSError:
+                continue
+        else:
+            dirs.append(path)
+    return dirs
+
+
+def load_npm(prefix):
+    """
+    Read the packages installed with npm -g under a prefix.
+    
+    Args:
+        prefix (str): npm global prefix (packages in lib/node_modules, links in bin)
+    
+    Returns:
+        list: EcosystemInstall tuples
+    """
+    installs = []
+    bin_dir = os.path.join(prefix, "bin")
+    for package_dir in npm_package_dirs(os.path.join(prefix, "lib", "node_modules")):
+        package = _read_json(os.path.join(package_dir, "package.json"))
+        if not isinstance(package, dict):
+            continue
+        name = package.get("name") or os.path.basename(package_dir)
+        if name in NPM_BUNDLED:
+            continue
+        bins = _npm_bins(package, name)
+        paths = [package_dir]
+        for binary in bins:
+            link = os.path.join(bin_dir, binary)
+            if os.path.islink(link) and os.path.realpath(link).startswith(os.path.realpath(package_dir) + os.sep):
+                paths.append(link)
+        installs.append(EcosystemInstall("npm", name, package.get("version") or "", paths, bins,
+                                         f"npm uninstall -g {shlex.quote(name)}"))
+    return installs
+
+
+def load_cargo(home):
+    """
+    Read the crates installed with cargo install.
+    
+    Args:
+        home (str): CARGO_HOME
+    
+    Returns:
+        list: EcosystemInstall tuples
+    """
+    crates = _read_json(os.path.join(home, ".crates2.json"))
+    if not isinstance(crates, dict):
+        return []
+    installs = []
+    for key, info in sorted((crates.get("installs") or {}).items()):
+        # "ripgrep 14.1.0 (registry+https://github.com/rust-lang/crates.io-index)"
+        parts = key.split(" ")
+        name = parts[0]
+        version = parts[1] if len(parts) > 1 else ""
+        bins = list((info or {}).get("bins") or [])
+        paths = [os.path.join(home, "bin", binary) for binary in bins]
+        installs.append(EcosystemInstall("cargo", name, version, paths, bins,
+                                         f"cargo uninstall {shlex.quote(name)}"))
+    return installs
+
+
+def cleanup_paths(install):
+    """
+    Return the paths the cleanup step should remove for an install.
+    
+    pip and npm commands tolerate files that are already gone, so all of
+    an install's paths are listed.  pipx and cargo installs are left to
+    their own command unless the tool is missing.
+    
+    Args:
+        install (EcosystemInstall): The install
+    
+    Returns:
+        list: Existing paths
+    """
+    if install.ecosystem in COMMAND_OWNS_FILES and install.command \
+            and shutil.which(install.command.split()[0]):
+        return []
+    return [path for path in install.paths if os.path.lexists(path)]
+
+
+def _stamp_paths(sources):
+    paths = []
+    for site_dir in sources.get("pip", []):
+        paths.append(site_dir)
+    for home in sources.get("pipx", []):
+        paths.append(os.path.join(home, "venvs"))
+    for prefix in sources.get("npm", []):
+        node_modules = os.path.join(prefix, "lib", "node_modules")
+        paths.append(node_modules)
+        # Installing a scoped package changes only its @scope directory
+        scopes = {os.path.dirname(d) for d in npm_package_dirs(node_modules)}
+        paths += sorted(d for d in scopes if os.path.basename(d).startswith("@"))
+    for home in sources.get("cargo", []):
+        paths.append(os.path.join(home, ".crates2.json"))
+    return paths
+
+
+def _stamps(sources):
+    stamps = {}
+    for path in _stamp_paths(sources):
+        try:
+            stamps[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+
+_LOADERS = {"pip": load_pip, "pipx": load_pipx, "npm": load_npm, "cargo": load_cargo}
+
+
+class EcosystemIndex:
+    """
+    Cached index of pip, pipx, npm -g and cargo installs.
+    
+    Args:
+        sources (dict): Ecosystem -> metadata locations (defaults to default_sources())
+        cache_path (str): JSON cache file, or None to disable the on-disk cache
+    """
+    
+    def __init__(self, sources=None, cache_path=DEFAULT_CACHE_PATH):
+        self.sources = default_sources() if sources is None else sources
+        self.cache_path = os.path.expanduser(cache_path) if cache_path else None
+        self.installs = []
+        self.from_cache = False
+        self.load()
+    
+    def load(self):
+        """Load the index from the cache, rebuilding it if any metadata changed."""
+        stamps = _stamps(self.sources)
+        if self._load_cache(stamps):
+            self.from_cache = True
+            return
+        
+        installs = []
+        for ecosystem, loader in _LOADERS.items():
+            for location in self.sources.get(ecosystem, []):
+                installs += loader(location)
+        self.installs = installs
+        self.from_cache = False
+        self._save_cache(stamps)
+    
+    def _load_cache(self, stamps):
+        if not self.cache_path:
+            return False
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if cached.get("version") != CACHE_VERSION or cached.get("stamps") != stamps:
+            return False
+        self.installs = [EcosystemInstall(*fields) for fields in cached.get("installs", [])]
+        return True
+    
+    def _save_cache(self, stamps):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "stamps": stamps,
+                           "installs": [list(install) for install in self.installs]}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+    
+    def resolve(self, software_name):
+        """
+        Find installs by package name or by one of their commands.
+        
+        Package names are compared PEP 503-normalized, so "Foo_Bar" finds
+        the dist foo-bar; a command name ("http") finds its package
+        ("httpie").
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            list: Matching EcosystemInstall tuples
+        """
+        query = normalize(software_name.strip())
+        if not query:
+            return []
+        by_name = [install for install in self.installs if normalize(install.name) == query]
+        if by_name:
+            return by_name
+        return [install for install in self.installs
+                if query in (normalize(binary) for binary in install.bins)]
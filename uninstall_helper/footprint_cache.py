@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Persistent learned-footprint cache for Uninstall Helper.
+
+Remembers what a previous run discovered for a piece of software
+(the executable and command line of each matched process, and the
+installation paths) in a small SQLite database, so repeat uninstalls can skip discovery.  Entries
+are validated with cheap lstat fingerprints and evicted least-recently-used.
+"""
+
+import json
+import os
+import sqlite3
+import stat
+import time
+
+DEFAULT_CACHE_PATH = "~/.cache/uninstall-helper/footprints.db"
+DEFAULT_MAX_ENTRIES = 500
+
+
+def fingerprint(path):
+    """
+    Compute a stat fingerprint for a path.
+    
+    Files are identified by size and whole-second mtime, which survive a
+    reinstall of the same version (package managers preserve mtimes) but
+    not an upgrade.  Directories only need to exist.
+    
+    Args:
+        path (str): Path to fingerprint
+    
+    Returns:
+        list: Fingerprint, or None if the path does not exist
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None
+    if stat.S_ISDIR(st.st_mode):
+        return ["d"]
+    if stat.S_ISLNK(st.st_mode):
+        return ["l"]
+    return ["f", st.st_size, int(st.st_mtime)]
+
+
+class FootprintCache:
+    """SQLite-backed map of software name -> discovered footprint."""
+    
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = os.path.expanduser(path)
+        self.max_entries = max_entries
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Batch runs look a footprint up on one thread and record it on another;
+        # a cache object is never used by two threads at once
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS footprints ("
+            " name TEXT PRIMARY KEY,"
+            " footprint TEXT NOT NULL,"
+            " fingerprints TEXT NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS footprints_last_used ON footprints (last_used)"
+        )
+        self._conn.commit()
+    
+    def close(self):
+        """Close the underlying database."""
+        self._conn.close()
+    
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM footprints").fetchone()[0]
+    
+    @staticmethod
+    def _key(software_name):
+        return software_name.strip().lower()
+    
+    def get(self, software_name):
+        """
+        Look up a footprint, validating it against the filesystem.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            dict: Footprint with 'exe_paths', 'signatures' ([exe, cmdline]
+                  pairs) and 'install_paths', or None on a miss or stale entry
+        """
+        key = self._key(software_name)
+        row = self._conn.execute(
+            "SELECT footprint, fingerprints FROM footprints WHERE name = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        footprint = json.loads(row[0])
+        recorded = json.loads(row[1])
+        if not recorded:
+            # Nothing on disk to validate against, so it can never be trusted
+            self.forget(software_name)
+            return None
+        for path, expected in recorded.items():
+            if fingerprint(path) != expected:
+                self.forget(software_name)
+                return None
+        
+        self._conn.execute(
+            "UPDATE footprints SET last_used = ? WHERE name = ?", (time.time(), key)
+        )
+        self._conn.commit()
+        return footprint
+    
+    def put(self, software_name, signatures=(), install_paths=()):
+        """
+        Record a discovered footprint, evicting the least recently used entries.
+        
+        Must be called before the paths are removed so the fingerprints
+        describe the installed state.  A footprint without any existing
+        file to fingerprint is not stored, as it could never go stale.
+        
+        Process names are deliberately not recorded: a name such as
+        python3 or bash says nothing about which process belongs to the
+        software.
+        
+        Args:
+            software_name (str): Name of the software
+            signatures (iterable): (exe, cmdline) pairs of matched processes
+            install_paths (iterable): Discovered installation paths
+        
+        Returns:
+            bool: True if the footprint was stored
+        """
+        signatures = sorted({(exe, tuple(cmdline or ())) for exe, cmdline in signatures if exe})
+        footprint = {
+            "exe_paths": sorted({exe for exe, _cmdline in signatures}),
+            "signatures": [[exe, list(cmdline)] for exe, cmdline in signatures],
+            "install_paths": list(dict.fromkeys(install_paths))
+        }
+        fingerprints = {}
+        for path in footprint["install_paths"] + footprint["exe_paths"]:
+            fp = fingerprint(path)
+            if fp is not None:
+                fingerprints[path] = fp
+        if not fingerprints:
+            return False
+        
+        self._conn.execute(
+            "INSERT OR REPLACE INTO footprints (name, footprint, fingerprints, last_used)"
+            " VALUES (?, ?, ?, ?)",
+            (self._key(software_name), json.dumps(footprint), json.dumps(fingerprints), time.time())
+        )
+        self._conn.execute(
+            "DELETE FROM footprints WHERE name NOT IN"
+            " (SELECT name FROM footprints ORDER BY last_used DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+        self._conn.commit()
+        return True
+    
+    def forget(self, software_name):
+        """Drop the footprint recorded for a piece of software."""
+        self._conn.execute("DELETE FROM footprints WHERE name = ?", (self._key(software_name),))
+        self._conn.commit()
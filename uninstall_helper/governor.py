@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+I/O and CPU governor for Uninstall Helper.
+
+Walking /opt or deleting a huge tree with shutil.rmtree saturates disk
+metadata I/O and hurts co-located services.  The governor lowers the
+process's CPU and I/O priority, rate-limits directory entries read,
+unlinks and bytes freed with token buckets, and backs off adaptively
+while the load average or iowait is high, so uninstalls can run on busy
+hosts during business hours.
+"""
+
+import os
+import stat
+import threading
+import time
+
+import psutil
+
+IONICE_CLASSES = {
+    "idle": "IOPRIO_CLASS_IDLE",
+    "best-effort": "IOPRIO_CLASS_BE",
+    "realtime": "IOPRIO_CLASS_RT",
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    
+    Takes may run the bucket into debt, so a single large request (e.g.
+    the bytes of one big file) is admitted and paid for by waiting.
+    
+    Args:
+        rate (float): Tokens per second, or 0/None for unlimited
+        burst (float): Bucket capacity (defaults to one second of tokens)
+        clock (callable): Monotonic clock
+        sleep (callable): Sleep function
+    """
+    
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate or 0
+        self.capacity = burst or self.rate
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._stamp = clock()
+        self._lock = threading.Lock()
+    
+    def take(self, amount=1):
+        """
+        Take tokens, sleeping until the bucket can pay for them.
+        
+        Args:
+            amount (float): Tokens to take
+        
+        Returns:
+            float: Seconds slept
+        """
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+def apply_priorities(ionice_class=None, nice=None):
+    """
+    Lower the CPU and I/O priority of the calling thread.
+    
+    On Linux priorities are per thread; threads started afterwards
+    inherit them, so call this before discovery or cleanup threads start.
+    
+    Args:
+        ionice_class (str): 'idle', 'best-effort' or 'realtime'
+        nice (int): Niceness to apply
+    
+    Returns:
+        list: Descriptions of the priorities that were applied
+    """
+    applied = []
+    process = psutil.Process()
+    constant = getattr(psutil, IONICE_CLASSES.get(ionice_class or "", ""), None)
+    if constant is not None and hasattr(process, "ionice"):
+        try:
+            process.ionice(constant)
+            applied.append(f"ionice {ionice_class}")
+        except (psutil.Error, OSError, ValueError):
+            pass
+    if nice is not None:
+        try:
+            if process.nice() < nice:
+                process.nice(nice)
+            applied.append(f"nice {nice}")
+        except (psutil.Error, OSError, ValueError):
+            pass
+    return applied
+
+
+def _system_pressure():
+    """Return (load average per CPU, iowait fraction since the last call)."""
+    try:
+        load = os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        load = 0.0
+    iowait = getattr(psutil.cpu_times_percent(interval=None), "iowait", 0.0) / 100.0
+    return load, iowait
+
+
+class Governor:
+    """
+    Paces discovery and deletion according to the governor config section.
+    
+    Args:
+        config (dict): The 'governor' config section
+        pressure (callable): Returns (load per CPU, iowait fraction)
+        sleep (callable): Sleep function
+    """
+    
+    def __init__(self, config, pressure=_system_pressure, sleep=time.sleep):
+        self.config = config
+        self.unlinks = TokenBucket(config.get("unlinks_per_sec"), sleep=sleep)
+        self.dirents = TokenBucket(config.get("dirents_per_sec"), sleep=sleep)
+        self.bytes = TokenBucket(config.get("bytes_per_sec"), sleep=sleep)
+        self.max_load = config.get("max_load_per_cpu")
+        self.max_iowait = config.get("max_iowait")
+        self.backoff_seconds = config.get("backoff_seconds", 0.5)
+        self.max_backoff = config.get("max_backoff_seconds", 8.0)
+        self.sample_interval = config.get("sample_interval", 1.0)
+        self.pressure = pressure
+        self.sleep = sleep
+        self.backoffs = 0
+        self._last_sample = None
+        self._lock = threading.Lock()
+    
+    def apply_priorities(self):
+        """Apply the configured ionice class and niceness to the calling thread."""
+        return apply_priorities(self.config.get("ionice_class"), self.config.get("nice"))
+    
+    def _under_pressure(self):
+        load, iowait = self.pressure()
+        return ((self.max_load is not None and load > self.max_load)
+                or (self.max_iowait is not None and iowait > self.max_iowait))
+    
+    def pace(self):
+        """Back off with doubling sleeps while the system is under pressure."""
+        with self._lock:
+            now = time.monotonic()
+            if self._last_sample is not None and now - self._last_sample < self.sample_interval:
+                return
+            self._last_sample = now
+        delay = self.backoff_seconds
+        while delay <= self.max_backoff and self._under_pressure():
+            self.backoffs += 1
+            self.sleep(delay)
+            delay *= 2
+    
+    def read_dirents(self, count):
+        """Account for directory entries read by a walk."""
+        self.dirents.take(count)
+        self.pace()
+    
+    def unlink(self, path, size=0):
+        """Remove a file (or symlink) under the unlink and byte limits."""
+        self.unlinks.take()
+        if size:
+            self.bytes.take(size)
+        self.pace()
+        os.unlink(path)
+    
+    def rmdir(self, path):
+        """Remove an empty directory under the unlink limit."""
+        self.unlinks.take()
+        os.rmdir(path)
+    
+    def walk(self, top):
+        """os.walk() that charges every directory listing to the dirent bucket."""
+        for root, dirs, files in os.walk(top):
+            self.read_dirents(len(dirs) + len(files))
+            yield root, dirs, files
+    
+    def remove_tree(self, path):
+        """
+        Delete a directory tree bottom-up under the rate limits.
+        
+        Symlinks are removed, never followed; if path itself is a symlink
+        only the link is removed.  Errors propagate like shutil.rmtree's.
+        
+        Args:
+            path (str): Directory to delete
+        
+        Returns:
+            int: Bytes freed by unlinked files
+        """
+        freed = 0
+        stack = [(path, False)]
+        while stack:
+            current, emptied = stack.pop()
+            if emptied:
+                self.rmdir(current)
+                continue
+            if stat.S_ISLNK(os.lstat(current).st_mode):
+                self.unlink(current)
+                continue
+            stack.append((current, True))
+            with os.scandir(current) as it:
+                entries = list(it)
+            self.read_dirents(len(entries))
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, False))
+                else:
+                    size = entry.stat(follow_symlinks=False).st_size
+                    self.unlink(entry.path, size)
+                    freed += size
+        return freed
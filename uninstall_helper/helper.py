@@ -0,0 +1,1983 @@
+#!/usr/bin/env python3
+"""
+UninstallHelper - detection, cleanup and uninstall orchestration.
+
+The CLI (main.py) and the GUI are front-ends over this class; the quiet
+programmatic API is in core.py.
+"""
+
+import psutil
+import os
+import subprocess
+import sys
+import json
+import platform
+from pathlib import Path
+import shutil
+import sqlite3
+import threading
+from functools import partial
+
+from . import smart_match
+from .footprint_cache import FootprintCache
+from .respawn_watch import RespawnWatcher
+from . import systemd_units
+from . import sandboxed_apps
+from . import checkpoint
+from . import conffiles
+from . import desktop_entries
+from . import ecosystems
+from . import holders
+from . import inode_join
+from . import package_graph
+from . import path_guard
+from . import procfs
+from . import references
+from . import symlink_index
+from . import user_residue
+from . import verify
+from .discovery import DiscoveryEngine, Finding, FunctionProvider
+from .governor import Governor
+from .pathset import PathSet
+from .scheduler import PACKAGE_LOCK, Scheduler, tree_resource
+
+# apt/dnf can take minutes, especially with orphaned dependencies included
+PACKAGE_COMMAND_TIMEOUT = 300
+
+class UninstallHelper:
+    def __init__(self):
+        self.system = platform.system().lower()
+        self.config_file = "uninstall_config.json"
+        self.load_config()
+        # Front-ends replace these to redirect output and prompts
+        self.emit = print
+        self.ask = input
+        self._smart_index = None
+        self._process_snapshot = None
+        self._footprint_cache = None
+        self._footprint = None
+        self._respawn_watcher = None
+        self._sandboxed_apps = None
+        self._desktop_index = None
+        self._ecosystem_index = None
+        self._pending_desktop_refresh = set()
+        self._pending_icon_refresh = set()
+        self._residue_info = {}
+        self._discovery_engine = None
+        self._governor = None
+        self._path_guard = None
+        self._package_graph = None
+        self._removed_packages = set()
+        self._confirmed_packages = {}
+        self._reference_index = None
+        self._manifest = verify.Manifest()
+        self._parent = None  # helper whose shared indexes spawned helpers use
+        self._lock = threading.RLock()
+    
+    def load_config(self):
+        """Load configuration from JSON file."""
+        default_config = {
+            "windows": {
+                "uninstall_registry": r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
+                "program_files": ["C:\\Program Files", "C:\\Program Files (x86)"]
+            },
+            "macos": {
+                "applications_dir": "/Applications",
+                "library_dir": "~/Library"
+            },
+            "linux": {
+                "package_managers": ["apt", "yum", "dnf", "pacman", "snap", "flatpak"]
+            }
+        }
+        
+        if os.path.exists(self.config_file):
+            with open(self.config_file, 'r') as f:
+                self.config = json.load(f)
+        else:
+            self.config = default_config
+    
+    def check_permissions(self):
+        """
+        Check if we have sufficient permissions for uninstallation.
+        
+        Returns:
+            bool: True if we have sufficient permissions, False otherwise
+        """
+        if self.system == "linux":
+            # On Linux, check if we're root or can use sudo
+            if os.geteuid() == 0:
+                return True
+            else:
+                # Check if sudo is available
+                if shutil.which("sudo"):
+                    return False  # Need sudo but it's available
+                else:
+                    self.emit("❌ 需要root权限但sudo不可用")
+                    return False
+        elif self.system == "windows":
+            # On Windows, check if we're running as administrator
+            try:
+                import ctypes
+                return ctypes.windll.shell32.IsUserAnAdmin() != 0
+            except:
+                return True  # Assume we have permissions if check fails
+        else:  # macOS
+            # On macOS, similar to Linux
+            if os.geteuid() == 0:
+                return True
+            else:
+                return shutil.which("sudo") is not None
+    
+    def search_roots(self):
+        """
+        Get the top-level directories searched for installations on this system.
+        
+        Returns:
+            list: Directory paths
+        """
+        if self.system == "windows":
+            return list(self.config.get("windows", {}).get("program_files", []))
+        elif self.system == "darwin":  # macOS
+            return [self.config.get("macos", {}).get("applications_dir", "/Applications")]
+        elif self.system == "linux":
+            # Common Linux installation directories
+            return [
+                "/usr/bin",
+                "/usr/local/bin",
+                "/opt",
+                "/snap",
+                "/var/lib/flatpak/app"
+            ]
+        return []
+    
+    def smart_detection_enabled(self):
+        """Check whether ai_features.enable_smart_detection is switched on."""
+        return bool(self.config.get("ai_features", {}).get("enable_smart_detection", False))
+    
+    def get_smart_index(self):
+        """
+        Get the smart-matching index, building it once per run.
+        
+        The index covers running processes, the immediate children of the
+        search roots and installed package names.
+        
+        Returns:
+            smart_match.TrigramIndex: The index
+        """
+        with self._lock:
+            if self._smart_index is None:
+                if procfs.available():
+                    self._process_snapshot = procfs.snapshot()
+                else:
+                    self._process_snapshot = {}
+                    for proc in psutil.process_iter(['pid', 'name', 'exe', 'cmdline']):
+                        try:
+                            info = proc.info
+                            self._process_snapshot[info['pid']] = {
+                                'pid': info['pid'],
+                                'name': info['name'] or "",
+                                'exe': info['exe'],
+                                'cmdline': info['cmdline']
+                            }
+                        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                            continue
+                
+                packages = smart_match.read_installed_packages() if self.system == "linux" else []
+                self._smart_index = smart_match.build_index(
+                    processes=self._process_snapshot.values(),
+                    roots=[root for root in self.search_roots() if os.path.isdir(root)],
+                    packages=packages,
+                    aliases=self.config.get("ai_features", {}).get("aliases")
+                )
+        return self._smart_index
+    
+    def smart_matches(self, query, kind=None):
+        """
+        Get ranked smart-matching candidates for a query.
+        
+        Args:
+            query (str): Name or partial name of the software
+            kind (str): Restrict to 'process', 'path' or 'package' entries
+        
+        Returns:
+            list: smart_match.Match tuples, best first
+        """
+        ai_config = self.config.get("ai_features", {})
+        threshold = ai_config.get("match_threshold", 0.7)
+        max_gap = ai_config.get("match_max_gap", smart_match.DEFAULT_MAX_GAP)
+        matches = self.get_smart_index().search(query, kind=kind, min_score=threshold, max_gap=max_gap)
+        # Candidates must score above the threshold, not merely reach it
+        return [match for match in matches if match.score > threshold]
+    
+    def _detect_processes_smart(self, target_name, desktop_names=()):
+        """Rank processes with the smart index, falling back to command line matches."""
+        index_matches = self.smart_matches(target_name, kind="process")
+        for name in desktop_names:
+            index_matches += self.smart_matches(name, kind="process")
+        index_matches.sort(key=lambda match: -match.score)
+        processes = []
+        seen = set()
+        
+        for match in index_matches:
+            proc = self._process_snapshot.get(match.payload)
+            if proc and proc['pid'] not in seen:
+                seen.add(proc['pid'])
+                processes.append(dict(proc, score=match.score))
+        
+        target_name = target_name.lower()
+        for proc in self._process_snapshot.values():
+            if proc['pid'] not in seen and proc['cmdline']:
+                if target_name in ' '.join(proc['cmdline']).lower():
+                    seen.add(proc['pid'])
+                    processes.append(dict(proc, score=0.5))
+        
+        return processes
+    
+    def detect_processes(self, target_name):
+        """
+        Detect running processes related to the target software.
+        
+        Args:
+            target_name (str): Name or partial name of the software to detect
+        
+        Returns:
+            list: List of dictionaries with process info
+        """
+        return list(self.iter_processes(target_name))
+    
+    def iter_processes(self, target_name):
+        """
+        Yield running processes related to the target software as they are found.
+        
+        Args:
+            target_name (str): Name or partial name of the software to detect
+        
+        Yields:
+            dict: Process info
+        """
+        # Display names ("Visual Studio Code") resolve to binaries via desktop entries
+        desktop_names = desktop_entries.binary_names(self.desktop_entries_for(target_name))
+        
+        if self.smart_detection_enabled():
+            yield from self._detect_processes_smart(target_name, desktop_names)
+            return
+        
+        target_name = target_name.lower()
+        
+        if procfs.available():
+            # Reads comm first and cmdline/exe only when still needed
+            yield from procfs.iter_matching(target_name, desktop_names)
+            return
+        
+        for proc in psutil.process_iter(['pid', 'name', 'exe', 'cmdline']):
+            try:
+                proc_info = proc.info
+                # Check process name, then command line arguments
+                if target_name in proc_info['name'].lower() or proc_info['name'] in desktop_names:
+                    matched = True
+                else:
+                    cmdline = ' '.join(proc_info['cmdline'] or []).lower()
+                    matched = target_name in cmdline
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            if matched:
+                yield {
+                    'pid': proc_info['pid'],
+                    'name': proc_info['name'],
+                    'exe': proc_info['exe'],
+                    'cmdline': proc_info['cmdline']
+                }
+    
+    def terminate_process(self, pid):
+        """
+        Terminate a process by PID.
+        
+        Args:
+            pid (int): Process ID to terminate
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            process = psutil.Process(pid)
+            process.terminate()
+            process.wait(timeout=5)
+            self.emit(f"✓ Process terminated: {pid} ({process.name()})")
+            return True
+        except psutil.NoSuchProcess:
+            self.emit(f"✗ Process not found: {pid}")
+            return False
+        except psutil.AccessDenied:
+            self.emit(f"✗ Access denied to terminate process: {pid}")
+            return False
+        except Exception as e:
+            self.emit(f"✗ Failed to terminate process {pid}: {e}")
+            return False
+    
+    def get_discovery_engine(self):
+        """
+        Get the discovery engine with this platform's providers registered.
+        
+        Providers run concurrently, each under its own time budget from
+        the discovery config section.  Registration order is the order of
+        preference when several providers suggest an uninstall command.
+        
+        Returns:
+            discovery.DiscoveryEngine: The engine
+        """
+        if self._discovery_engine is None:
+            discovery_config = self.config.get("discovery", {})
+            engine = DiscoveryEngine(discovery_config.get("budgets"), discovery_config.get("default_budget"))
+            
+            # Installation paths
+            engine.register(FunctionProvider("program-files", self._discover_program_files,
+                                             systems=("windows",)))
+            engine.register(FunctionProvider("applications-dir", self._discover_applications_dir,
+                                             systems=("darwin",)))
+            engine.register(FunctionProvider("sandboxed-apps", self._discover_sandboxed_apps,
+                                             kinds=("path", "command"), systems=("linux",)))
+            engine.register(FunctionProvider("ecosystems", self._discover_ecosystems,
+                                             kinds=("path", "command"), systems=("linux", "darwin")))
+            engine.register(FunctionProvider("desktop-entries", self._discover_desktop_entries,
+                                             systems=("linux",)))
+            engine.register(FunctionProvider("install-roots", self._discover_install_roots,
+                                             systems=("linux",)))
+            engine.register(FunctionProvider("user-residue", self._discover_user_residue,
+                                             systems=("linux", "darwin")))
+            engine.register(FunctionProvider("smart-index", self._discover_smart_paths))
+            
+            # Running processes
+            engine.register(FunctionProvider("process-table", self._discover_processes,
+                                             kinds=("process",)))
+            
+            # Uninstall commands
+            engine.register(FunctionProvider("windows-installer", self._discover_windows_command,
+                                             kinds=("command",), systems=("windows",)))
+            engine.register(FunctionProvider("app-bundle", self._discover_app_bundle_command,
+                                             kinds=("command",), systems=("darwin",)))
+            engine.register(FunctionProvider("package-manager", self._discover_package_command,
+                                             kinds=("command",), systems=("linux",)))
+            self._discovery_engine = engine
+        return self._discovery_engine
+    
+    def _discover_program_files(self, software_name, cancel):
+        """Provider: matching directories in Program Files."""
+        software_name = software_name.lower()
+        for prog_dir in self.config.get("windows", {}).get("program_files", []):
+            if os.path.exists(prog_dir):
+                for item in os.listdir(prog_dir):
+                    if software_name in item.lower():
+                        path = os.path.join(prog_dir, item)
+                        if os.path.isdir(path):
+                            yield Finding("path", path)
+    
+    def _discover_applications_dir(self, software_name, cancel):
+        """Provider: matching bundles in the Applications directory."""
+        software_name = software_name.lower()
+        apps_dir = self.config.get("macos", {}).get("applications_dir", "/Applications")
+        if os.path.exists(apps_dir):
+            for item in os.listdir(apps_dir):
+                if software_name in item.lower():
+                    path = os.path.join(apps_dir, item)
+                    if os.path.isdir(path):
+                        yield Finding("path", path)
+    
+    def _discover_sandboxed_apps(self, software_name, cancel):
+        """Provider: snap/flatpak data directories and their uninstall command."""
+        apps = self.find_sandboxed_apps(software_name)
+        if len(apps) > 1:
+            # Removing the wrong one would be worse than removing none
+            self.emit(f"   ⚠️  '{software_name}' matches several sandboxed apps "
+                      f"({', '.join(f'{app.kind} {app.app_id}' for app in apps)}); uninstall the right one by name")
+            return
+        for app in apps:
+            for data_dir in app.data_dirs:
+                if os.path.exists(data_dir):
+                    yield Finding("path", data_dir)
+        if apps:
+            yield Finding("command", sandboxed_apps.uninstall_command(apps[0]))
+    
+    def _discover_ecosystems(self, software_name, cancel):
+        """Provider: pip/pipx/npm/cargo installs read from their metadata, and their uninstall command."""
+        installs = self.ecosystem_installs_for(software_name)
+        for install in installs:
+            for path in ecosystems.cleanup_paths(install):
+                yield Finding("path", path, detail=install)
+        commands = [install.command for install in installs if install.command]
+        if commands:
+            yield Finding("command", commands[0])
+    
+    def _discover_desktop_entries(self, software_name, cancel):
+        """Provider: menu entries, icons and programs installed outside /usr."""
+        entries = self.desktop_entries_for(software_name)
+        for path in desktop_entries.leftover_paths(entries):
+            yield Finding("path", path)
+        for entry in entries:
+            if entry.binary and os.path.isabs(entry.binary) and os.path.isfile(entry.binary) \
+                    and not entry.binary.startswith("/usr/"):
+                yield Finding("path", entry.binary)
+    
+    def _discover_install_roots(self, software_name, cancel):
+        """Provider: walk the Linux installation directories for matching names."""
+        software_name = software_name.lower()
+        # Snaps and flatpaks are resolved from their metadata instead of
+        # walking every mounted revision and runtime
+        sandbox_roots = {sandboxed_apps.SNAP_MOUNT_DIR,
+                         os.path.join(sandboxed_apps.FLATPAK_SYSTEM_DIR, "app")}
+        for dir_path in self.search_roots():
+            if dir_path in sandbox_roots:
+                continue
+            if os.path.exists(dir_path):
+                governor = self.get_governor()
+                for root, dirs, files in (governor.walk if governor else os.walk)(dir_path):
+                    if cancel.is_set():
+                        return
+                    matched_dirs = [item for item in dirs if software_name in item.lower()]
+                    for item in matched_dirs + files:
+                        if software_name in item.lower():
+                            yield Finding("path", os.path.join(root, item))
+                    # Everything below a matched directory goes with it
+                    dirs[:] = [item for item in dirs if item not in matched_dirs]
+    
+    def _discover_user_residue(self, software_name, cancel):
+        """Provider: per-user leftovers (all accounts when running as root)."""
+        for residue in self.find_user_residue(software_name):
+            yield Finding("path", residue.path, detail=residue)
+    
+    def _discover_smart_paths(self, software_name, cancel):
+        """Provider: ranked smart-index matches among the search roots' children."""
+        if not self.smart_detection_enabled():
+            return
+        for match in self.smart_matches(software_name, kind="path"):
+            yield Finding("path", match.payload, detail=match.score)
+    
+    def _discover_processes(self, software_name, cancel):
+        """Provider: running processes."""
+        for proc in self.iter_processes(software_name):
+            yield Finding("process", proc['pid'], detail=proc)
+    
+    def _discover_windows_command(self, software_name, cancel):
+        """Provider: Windows Installer uninstall command."""
+        yield Finding("command", f'wmic product where name="{software_name}" call uninstall')
+    
+    def _discover_app_bundle_command(self, software_name, cancel):
+        """Provider: macOS application bundle removal."""
+        yield Finding("command", f'sudo rm -rf "/Applications/{software_name}.app"')
+    
+    def _discover_package_command(self, software_name, cancel):
+        """Provider: Linux package manager uninstall command."""
+        software_name = self.resolve_package_name(software_name)
+        
+        # Try to find package manager
+        for pm in self.config.get("linux", {}).get("package_managers", []):
+            if shutil.which(pm):
+                if pm in ["apt", "apt-get"]:
+                    orphans = self._plan_orphan_removal(software_name)
+                    packages = self._plan_packages(software_name, orphans)
+                    names = " ".join(packages)
+                    remove = f'sudo {pm} remove {names} -y'
+                    conffile_plan = self._plan_conffile_purge(packages)
+                    if conffile_plan and conffile_plan["purge"]:
+                        # The remove command goes with the purge, for a failed backup or a declined purge
+                        conffile_plan["fallback"] = remove
+                        yield Finding("command", f'sudo {pm} purge {names} -y',
+                                      detail={"orphans": orphans, "conffiles": conffile_plan})
+                    else:
+                        yield Finding("command", remove, detail={"orphans": orphans, "conffiles": conffile_plan})
+                elif pm in ["yum", "dnf"]:
+                    yield Finding("command", f'sudo {pm} remove {software_name} -y')
+                elif pm == "pacman":
+                    orphans = self._plan_orphan_removal(software_name)
+                    packages = " ".join(self._plan_packages(software_name, orphans))
+                    yield Finding("command", f'sudo pacman -R {packages} --noconfirm', detail={"orphans": orphans})
+                elif pm == "snap":
+                    yield Finding("command", f'sudo snap remove {software_name}')
+                elif pm == "flatpak":
+                    yield Finding("command", f'flatpak uninstall {software_name} -y')
+                else:
+                    continue
+                return
+        yield Finding("command", f'sudo rm -rf /opt/{software_name}')
+    
+    def _report_discovery_problems(self):
+        """Print providers that ran out of time budget or failed."""
+        for report in self.get_discovery_engine().last_reports:
+            if report.status == "timeout":
+                self.emit(f"   ⚠️  Discovery provider '{report.name}' exceeded its time budget "
+                          f"({report.seconds:.1f}s); results may be incomplete")
+            elif report.status == "error":
+                self.emit(f"   ⚠️  Discovery provider '{report.name}' failed: {report.error}")
+    
+    def discover(self, software_name):
+        """
+        Detect processes and installation paths in one concurrent discovery run.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            tuple: (list of process dicts, list of installation paths)
+        """
+        processes = []
+        paths = []
+        for finding in self.iter_discovery(software_name):
+            if finding.kind == "process":
+                processes.append(finding.detail)
+            else:
+                paths.append(finding.value)
+        return processes, paths
+    
+    def iter_discovery(self, software_name):
+        """
+        Yield process and path findings from one discovery run as they arrive.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Yields:
+            Finding: kind 'process' (detail holds the process dict) or 'path'
+        """
+        self.get_governor()
+        yield from self.get_discovery_engine().iter_findings(
+            software_name, self.system, kinds=("process", "path"))
+        self._report_discovery_problems()
+    
+    def find_installation_paths(self, software_name):
+        """
+        Find installation paths for the software.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            list: List of installation paths
+        """
+        return list(self.iter_installation_paths(software_name))
+    
+    def iter_installation_paths(self, software_name):
+        """
+        Yield installation paths for the software as they are found.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Yields:
+            str: Installation path, skipping paths below one already yielded
+        """
+        self.get_governor()
+        found = PathSet()
+        for finding in self.get_discovery_engine().iter_findings(
+                software_name, self.system, kinds=("path",)):
+            if not found.covers(finding.value):
+                found.add(finding.value)
+                yield finding.value
+        self._report_discovery_problems()
+    
+    def print_detection(self, software_name, indent=""):
+        """
+        Print detection results as they are found, without collecting them.
+        
+        Args:
+            software_name (str): Name of the software
+            indent (str): Prefix for every result line
+        
+        Returns:
+            tuple: (number of processes, number of installation paths)
+        """
+        counts = {"process": 0, "path": 0}
+        for finding in self.iter_discovery(software_name):
+            counts[finding.kind] += 1
+            if finding.kind == "process":
+                proc = finding.detail
+                self.emit(f"{indent}- Process: {proc['name']} (PID: {proc['pid']})")
+            else:
+                self.emit(f"{indent}- Path: {self.describe_path(finding.value)}")
+        
+        self.emit(f"\n{indent}Processes found: {counts['process']}")
+        self.emit(f"{indent}Installation paths found: {counts['path']}")
+        return counts["process"], counts["path"]
+    
+    def find_user_residue(self, software_name):
+        """
+        Find per-user leftovers in home directories.
+        
+        As root every login account from the passwd database is scanned,
+        concurrently; otherwise only the current user's home.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            list: user_residue.Residue tuples (user, path, size)
+        """
+        residue_config = self.config.get("user_residue", {})
+        if self.system not in ("linux", "darwin") or not residue_config.get("enabled", True):
+            return []
+        
+        if self.system == "darwin":
+            locations = ["Library/Application Support", "Library/Caches", "Library/Preferences",
+                         "Library/Logs", ""]
+            common_dirs = self.config.get("macos", {}).get("common_directories", [])
+        else:
+            locations = list(user_residue.DEFAULT_LOCATIONS)
+            common_dirs = self.config.get("linux", {}).get("common_directories", [])
+        for directory in common_dirs:
+            if directory.startswith("~/") and directory[2:] not in locations:
+                locations.append(directory[2:])
+        
+        residue = user_residue.scan_all_users(
+            software_name,
+            self.user_homes(),
+            locations,
+            max_workers=residue_config.get("max_workers", 8),
+            sizes=residue_config.get("compute_sizes", True)
+        )
+        for item in residue:
+            self._residue_info[item.path] = item
+        return residue
+    
+    def user_homes(self):
+        """
+        Home directories to look in: every login account when running as
+        root, otherwise only the current user's.
+        
+        Returns:
+            list: (user, home) tuples
+        """
+        if os.geteuid() == 0:
+            return user_residue.list_homes(min_uid=500 if self.system == "darwin" else None)
+        return [(os.environ.get("USER", "current user"), os.path.expanduser("~"))]
+    
+    def get_reference_index(self):
+        """
+        Get the index of autostart, cron, systemd user unit and shell rc
+        lines, or None when references.enabled is off.
+        
+        Returns:
+            references.ReferenceIndex: The index, built once per helper
+        """
+        if self._parent is not None:
+            return self._parent.get_reference_index()
+        with self._lock:
+            if self._reference_index is None:
+                enabled = self.config.get("references", {}).get("enabled", True)
+                if enabled and self.system in ("linux", "darwin"):
+                    self._reference_index = references.ReferenceIndex(references.collect_files(self.user_homes()))
+                else:
+                    self._reference_index = False
+        return self._reference_index or None
+    
+    def find_references(self, software_name, paths):
+        """
+        Find lines that would still run or point at the software.
+        
+        The software name, the programs its desktop entries and ecosystem
+        installs provide, and the names of installed files in bin
+        directories are looked up as commands; the installation paths are
+        looked up as path prefixes.  Lines in files that no longer exist
+        are dropped.
+        
+        Args:
+            software_name (str): Name of the software
+            paths (iterable): Installation paths
+        
+        Returns:
+            list: references.Reference tuples
+        """
+        index = self.get_reference_index()
+        if index is None:
+            return []
+        paths = list(paths)
+        names = {software_name.strip()}
+        names |= desktop_entries.binary_names(self.desktop_entries_for(software_name))
+        for install in self.ecosystem_installs_for(software_name):
+            names.update(install.bins)
+        names.update(os.path.basename(path) for path in paths
+                     if os.path.basename(os.path.dirname(path)) in ("bin", "sbin"))
+        found = index.find(names, PathSet(paths).roots())
+        return [ref for ref in found if os.path.exists(ref.path)]
+    
+    def describe_path(self, path):
+        """Return the path with the owning user and size for per-user residue."""
+        residue = self._residue_info.get(path)
+        if residue is None:
+            return path
+        if residue.size is None:
+            return f"{path} (user {residue.user})"
+        return f"{path} (user {residue.user}, {user_residue.format_size(residue.size)})"
+    
+    def check_open_holders(self, paths):
+        """
+        Report processes that still hold files under the paths to be removed.
+        
+        Deleted files stay on disk until every holder closes them, so the
+        holders are listed before cleanup and, if cleanup.terminate_holders
+        is set, terminated.
+        
+        Args:
+            paths (list): Paths about to be removed
+        
+        Returns:
+            int: Number of holding processes
+        """
+        cleanup_config = self.config.get("cleanup", {})
+        if self.system != "linux" or not cleanup_config.get("check_open_files", True):
+            return 0
+        
+        holding = holders.find_holders(paths, exclude={os.getpid()})
+        if not holding:
+            return 0
+        
+        self.emit(f"   ⚠️  {len(holding)} process(es) still hold files under these paths:")
+        for pid, held in sorted(holding.items()):
+            more = f" (+{len(held) - 1} more)" if len(held) > 1 else ""
+            self.emit(f"   - {holders.process_name(pid)} (PID: {pid}): {held[0]}{more}")
+        
+        if cleanup_config.get("terminate_holders", False):
+            for pid in sorted(holding):
+                self.terminate_process(pid)
+        else:
+            self.emit("   Their disk space is only reclaimed once they exit.")
+        return len(holding)
+    
+    def get_governor(self):
+        """
+        Get the I/O and CPU governor, or None when governor.enabled is off.
+        
+        The first call applies the configured ionice class and niceness to
+        the calling thread; threads started afterwards inherit them.
+        
+        Returns:
+            governor.Governor: The governor, or None
+        """
+        if self._parent is not None:
+            # One set of buckets, so concurrent batch helpers share the limits
+            return self._parent.get_governor()
+        with self._lock:
+            if self._governor is None:
+                governor_config = self.config.get("governor", {})
+                if governor_config.get("enabled", False):
+                    self._governor = Governor(governor_config)
+                    applied = self._governor.apply_priorities()
+                    if applied:
+                        self.emit(f"🐢 Governor active: {', '.join(applied)}")
+                else:
+                    self._governor = False
+        return self._governor or None
+    
+    def get_path_guard(self):
+        """
+        Get the protected-path guard, or None when path_guard.enabled is off.
+        
+        Returns:
+            path_guard.PathGuard: The guard, compiled once per helper
+        """
+        if self._parent is not None:
+            return self._parent.get_path_guard()
+        with self._lock:
+            if self._path_guard is None:
+                guard_config = self.config.get("path_guard", {})
+                if guard_config.get("enabled", True):
+                    self._path_guard = path_guard.build_guard(
+                        deny=path_guard.DEFAULT_DENY + guard_config.get("deny", []),
+                        allow=guard_config.get("allow", []),
+                        protect=path_guard.DEFAULT_PROTECT + guard_config.get("protect", []),
+                        essentials=guard_config.get("protect_essential_packages", True) and self.system == "linux"
+                    )
+                else:
+                    self._path_guard = False
+        return self._path_guard or None
+    
+    def guard_paths(self, paths):
+        """
+        Split candidate paths into removable and protected ones, reporting the latter.
+        
+        Args:
+            paths (iterable): Candidate paths
+        
+        Returns:
+            tuple: (list of removable paths, list of (path, reason) tuples)
+        """
+        guard = self.get_path_guard()
+        if guard is None:
+            return list(paths), []
+        allowed, blocked = guard.filter(paths)
+        if blocked:
+            self.emit(f"   🛡️  {len(blocked)} protected path(s) will not be removed:")
+            for path, reason in blocked:
+                self.emit(f"   - {path} ({reason})")
+        return allowed, blocked
+    
+    def cleanup_files(self, paths, progress=None):
+        """
+        Clean up files and directories.
+        
+        Paths are removed one at a time as the iterable produces them, so a
+        generator such as iter_installation_paths() can be passed directly.
+        
+        Args:
+            paths (iterable): Paths to clean up
+            progress (checkpoint.CleanupCheckpoint): Optional checkpoint that
+                directory removals are recorded in, so an interrupted
+                cleanup can be resumed
+        
+        Returns:
+            int: Number of items successfully cleaned up
+        """
+        cleaned = 0
+        governor = self.get_governor()
+        guard = self.get_path_guard()
+        
+        try:
+            for path in paths:
+                reason = guard.check(path) if guard else None
+                if reason:
+                    self.emit(f"🛡️  Not removing {path}: {reason}")
+                elif os.path.islink(path):
+                    # Only the link goes; isdir/isfile would follow it into its target
+                    try:
+                        if governor:
+                            governor.unlink(path, 0)
+                        else:
+                            os.unlink(path)
+                        self.emit(f"✓ Symlink removed: {path}")
+                        cleaned += 1
+                        self._note_desktop_change(path)
+                    except Exception as e:
+                        self.emit(f"✗ Failed to remove {path}: {e}")
+                elif os.path.isfile(path):
+                    try:
+                        if governor:
+                            governor.unlink(path, os.path.getsize(path))
+                        else:
+                            os.remove(path)
+                        self.emit(f"✓ File removed: {path}")
+                        cleaned += 1
+                        self._note_desktop_change(path)
+                    except Exception as e:
+                        self.emit(f"✗ Failed to remove {path}: {e}")
+                elif os.path.isdir(path):
+                    try:
+                        if progress is not None and governor:
+                            progress.remove_tree(path, governor.unlink, governor.rmdir, governor.read_dirents)
+                        elif progress is not None:
+                            progress.remove_tree(path)
+                        elif governor:
+                            governor.remove_tree(path)
+                        else:
+                            shutil.rmtree(path)
+                        self.emit(f"✓ Directory removed: {path}")
+                        cleaned += 1
+                    except Exception as e:
+                        self.emit(f"✗ Failed to remove {path}: {e}")
+                if progress is not None:
+                    progress.complete(path)
+        finally:
+            if progress is not None:
+                progress.finish()
+        
+        return cleaned
+    
+    def get_checkpoint(self, software_name):
+        """
+        Open the cleanup checkpoint for the software, or None when cleanup.resumable is off.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            checkpoint.CleanupCheckpoint: The checkpoint, holding any unfinished
+                work of an interrupted run
+        """
+        cleanup_config = self.config.get("cleanup", {})
+        if not cleanup_config.get("resumable", True):
+            return None
+        return checkpoint.CleanupCheckpoint.open(
+            cleanup_config.get("checkpoint_dir", checkpoint.DEFAULT_DIR),
+            software_name,
+            cleanup_config.get("checkpoint_interval", checkpoint.DEFAULT_INTERVAL)
+        )
+    
+    def sweep_dangling_links(self, removed_paths):
+        """
+        Remove symlinks left pointing into removed trees.
+        
+        The link directories are scanned once into a reverse index, so
+        links are found whatever their names are.
+        
+        Args:
+            removed_paths (list): Paths that were removed
+        
+        Returns:
+            int: Number of links removed
+        """
+        sweep_config = self.config.get("symlink_sweep", {})
+        if self.system == "windows" or not sweep_config.get("enabled", True):
+            return 0
+        index = symlink_index.SymlinkIndex(symlink_index.DEFAULT_LINK_ROOTS + sweep_config.get("roots", []))
+        removed = symlink_index.sweep(index, removed_paths, guard=self.get_path_guard())
+        for link, target in removed:
+            self.emit(f"✓ Dangling link removed: {link} -> {target}")
+            self._note_desktop_change(link)
+        return len(removed)
+    
+    def _note_desktop_change(self, path):
+        """Remember that a menu entry or icon was removed so caches get refreshed."""
+        if path.endswith(".desktop"):
+            self._pending_desktop_refresh.add(os.path.dirname(path))
+        parts = path.split(os.sep)
+        if "icons" in parts:
+            index = parts.index("icons")
+            if index + 1 < len(parts) - 1:
+                self._pending_icon_refresh.add(os.sep.join(parts[:index + 2]))
+    
+    def flush_desktop_caches(self):
+        """Refresh desktop-file and icon caches once for everything removed so far."""
+        if not (self._pending_desktop_refresh or self._pending_icon_refresh):
+            return
+        ran = desktop_entries.refresh_caches(self._pending_desktop_refresh, self._pending_icon_refresh)
+        if ran:
+            self.emit(f"✓ Desktop menu and icon caches refreshed ({len(ran)} command(s))")
+        self._pending_desktop_refresh.clear()
+        self._pending_icon_refresh.clear()
+    
+    def get_package_graph(self):
+        """
+        Get the installed-package dependency graph, or None when
+        linux.remove_orphaned_dependencies is off or no database is readable.
+        
+        Returns:
+            package_graph.PackageGraph: The graph, loaded once per helper
+        """
+        if self._parent is not None:
+            return self._parent.get_package_graph()
+        with self._lock:
+            if self._package_graph is None:
+                enabled = self.config.get("linux", {}).get("remove_orphaned_dependencies", True)
+                packages = package_graph.load_system() if enabled and self.system == "linux" else []
+                self._package_graph = package_graph.PackageGraph(packages) if packages else False
+        return self._package_graph or None
+    
+    def _plan_orphan_removal(self, package):
+        """
+        Compute the packages to remove together with a package.
+        
+        Auto-installed dependencies that nothing else needs once the package
+        (and anything removed earlier in the batch) is gone are added.  The
+        plan travels in the detail of the command finding it belongs to.
+        
+        Args:
+            package (str): Package being removed
+        
+        Returns:
+            dict: {"package", "orphans", "bytes"}, or None if the package is
+                not in the package graph
+        """
+        graph = self.get_package_graph()
+        if graph is None or package not in graph:
+            return None
+        orphans = graph.orphaned_by([package], self._removed_packages)
+        return {"package": package, "orphans": orphans, "bytes": graph.size([package] + orphans)}
+    
+    @staticmethod
+    def _plan_packages(package, orphan_plan):
+        """Return the package followed by the orphaned dependencies of its plan."""
+        return [package] + (orphan_plan["orphans"] if orphan_plan else [])
+    
+    def _plan_conffile_purge(self, packages):
+        """
+        Audit the packages' conffiles and decide whether to purge them.
+        
+        Purging is opt-in (linux.purge_conffiles); by default packages are
+        only removed and dpkg leaves their conffiles in place.  When it is
+        on, unmodified conffiles (and ones already deleted) go with a purge.
+        Modified ones are backed up before the purge when
+        linux.modified_conffiles is "backup"; with "keep", any modified
+        conffile turns the purge into a plain remove.  Packages without
+        conffiles are only removed.
+        
+        Args:
+            packages (list): Packages being removed
+        
+        Returns:
+            dict: {"audit", "purge", "fallback"} for the command finding's
+                detail, or None if nothing is audited
+        """
+        linux_config = self.config.get("linux", {})
+        if self.system != "linux" or not linux_config.get("purge_conffiles", False):
+            return None
+        audit = conffiles.audit(conffiles.load_conffiles(packages),
+                                linux_config.get("conffile_hash_workers", conffiles.DEFAULT_MAX_WORKERS))
+        if not audit:
+            return None
+        modified = any(state == conffiles.MODIFIED for _conffile, state in audit)
+        purge = not modified or linux_config.get("modified_conffiles", "backup") == "backup"
+        return {"audit": audit, "purge": purge, "fallback": None}
+    
+    def backup_conffiles(self, command, modified, fallback):
+        """
+        Back up modified conffiles before a purge runs.
+        
+        Args:
+            command (str): The purge command
+            modified (list): conffiles.Conffile tuples to save
+            fallback (str): Remove command to run instead if a backup fails
+        
+        Returns:
+            tuple: (command to run, number of files backed up)
+        """
+        if not modified:
+            return command, 0
+        backup_dir = self.config.get("linux", {}).get("conffile_backup_dir", conffiles.DEFAULT_BACKUP_DIR)
+        saved, failed = conffiles.backup(modified, backup_dir)
+        for path, error in failed:
+            self.emit(f"   ✗ Could not back up {path}: {error}")
+        if failed:
+            self.emit("   Keeping modified conffiles: removing instead of purging")
+            return fallback, 0
+        self.emit(f"   ✓ {len(saved)} modified conffile(s) backed up under {os.path.expanduser(backup_dir)}")
+        return command, len(saved)
+    
+    def get_uninstall_finding(self, software_name):
+        """
+        Get the preferred uninstall command finding for the system.
+        
+        The finding's detail carries the plan that goes with the command
+        (e.g. {"orphans": ...} for package managers), so callers never
+        read a plan computed for a command that did not win.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            Finding: The command finding, or None
+        """
+        engine = self.get_discovery_engine()
+        findings = engine.run(software_name, self.system, kinds=("command",))
+        if not findings:
+            return None
+        return min(findings, key=lambda finding: engine.priority(finding.source))
+    
+    def get_uninstall_command(self, software_name):
+        """
+        Get appropriate uninstall command for the system.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            str: Uninstall command
+        """
+        finding = self.get_uninstall_finding(software_name)
+        return finding.value if finding else ""
+    
+    def package_remove_command(self, packages):
+        """
+        Build the remove command for installed packages (Linux only).
+        
+        Args:
+            packages (list): Package names, as in the package graph
+        
+        Returns:
+            str: Command for the first available package manager in
+                linux.package_managers that removes packages by name, or ""
+        """
+        names = " ".join(packages)
+        for pm in self.config.get("linux", {}).get("package_managers", []):
+            if not shutil.which(pm):
+                continue
+            if pm in ["apt", "apt-get", "yum", "dnf"]:
+                return f'sudo {pm} remove {names} -y'
+            if pm == "pacman":
+                return f'sudo pacman -R {names} --noconfirm'
+        return ""
+    
+    def remove_packages(self, packages):
+        """
+        Remove installed packages with the system package manager.
+        
+        Removed packages are recorded for later orphan plans and for
+        verification.
+        
+        Args:
+            packages (list): Package names
+        
+        Returns:
+            bool: True if the command succeeded
+        """
+        command = self.package_remove_command(packages) if self.system == "linux" else ""
+        if not command:
+            self.emit("✗ No supported package manager found")
+            return False
+        self.emit(f"Executing: {command}")
+        try:
+            result = subprocess.run(command, shell=True, capture_output=True, text=True,
+                                    timeout=PACKAGE_COMMAND_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.emit(f"✗ Package removal timed out: {command}")
+            return False
+        if result.returncode != 0:
+            self.emit(f"✗ Package removal failed: {result.stderr}")
+            return False
+        self._removed_packages.update(packages)
+        self._manifest.add_packages(packages)
+        self.emit(f"✓ {len(packages)} package(s) removed")
+        return True
+    
+    def find_sandboxed_apps(self, software_name):
+        """
+        Find installed snaps and flatpaks matching the software (Linux only).
+        
+        The installed-app lists are read from snapd/flatpak metadata once per run.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            list: sandboxed_apps.SandboxedApp tuples
+        """
+        if self.system != "linux":
+            return []
+        with self._lock:
+            if self._sandboxed_apps is None:
+                self._sandboxed_apps = sandboxed_apps.list_snaps() + sandboxed_apps.list_flatpaks()
+        return [app for app in self._sandboxed_apps if sandboxed_apps.matches(app, software_name)]
+    
+    def desktop_entries_for(self, software_name):
+        """
+        Find desktop entries for a display name (Linux only).
+        
+        The index covers the XDG application directories plus any
+        'applications' directory in linux.common_directories, and is cached
+        on disk until one of those directories changes.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            list: desktop_entries.DesktopEntry tuples
+        """
+        if self.system != "linux":
+            return []
+        with self._lock:
+            if self._desktop_index is None:
+                extra = [d for d in self.config.get("linux", {}).get("common_directories", [])
+                         if d.rstrip("/").endswith("applications")]
+                self._desktop_index = desktop_entries.DesktopEntryIndex(
+                    desktop_entries.application_dirs(extra),
+                    self.config.get("linux", {}).get("desktop_index_cache", desktop_entries.DEFAULT_CACHE_PATH)
+                )
+        return self._desktop_index.resolve(software_name)
+    
+    def ecosystem_installs_for(self, software_name):
+        """
+        Find pip, pipx, npm -g and cargo installs of the software.
+        
+        The index is read from each ecosystem's own metadata and cached on
+        disk until one of its directories changes; ecosystems.enabled
+        turns it off.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            list: ecosystems.EcosystemInstall tuples
+        """
+        if self.system not in ("linux", "darwin"):
+            return []
+        with self._lock:
+            if self._ecosystem_index is None:
+                config = self.config.get("ecosystems", {})
+                if config.get("enabled", True):
+                    self._ecosystem_index = ecosystems.EcosystemIndex(
+                        ecosystems.default_sources(config.get("site_packages", [])),
+                        config.get("index_cache", ecosystems.DEFAULT_CACHE_PATH)
+                    )
+                else:
+                    self._ecosystem_index = False
+        return self._ecosystem_index.resolve(software_name) if self._ecosystem_index else []
+    
+    def _is_installed_package(self, name):
+        """Check the package database for an installed package of that exact name."""
+        graph = self.get_package_graph()
+        if graph is not None:
+            return name in graph
+        return name in smart_match.read_installed_packages()
+    
+    def match_package(self, software_name):
+        """
+        Find the package that is the software by name rather than by guess.
+        
+        A package the user confirmed for this name, the name itself, or an
+        installed alias of it (ai_features.aliases plus the built-in ones)
+        counts; fuzzy matches never do.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            str: Installed package name, or None
+        """
+        if software_name in self._confirmed_packages:
+            return self._confirmed_packages[software_name]
+        if self._is_installed_package(software_name):
+            return software_name
+        aliases = dict(smart_match.DEFAULT_ALIASES)
+        aliases.update({smart_match.normalize(name): list(targets) for name, targets
+                        in (self.config.get("ai_features", {}).get("aliases") or {}).items()})
+        for alias in aliases.get(smart_match.normalize(software_name), []):
+            if self._is_installed_package(alias):
+                return alias
+        return None
+    
+    def resolve_package_name(self, software_name):
+        """
+        Resolve the package that owns the software.
+        
+        Only exact, alias and confirmed matches (see match_package) rewrite
+        the name; otherwise it is used as given.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            str: Package name
+        """
+        return self.match_package(software_name) or software_name
+    
+    def package_candidate(self, software_name):
+        """
+        Get the closest fuzzy package match when nothing matches by name.
+        
+        The candidate is only a suggestion: it is used once the user
+        confirms it (see _confirm_package_candidate), never on its own.
+        
+        Args:
+            software_name (str): Name of the software
+        
+        Returns:
+            smart_match.Match: The best candidate, or None
+        """
+        if not self.smart_detection_enabled() or self.match_package(software_name):
+            return None
+        matches = self.smart_matches(software_name, kind="package")
+        return matches[0] if matches else None
+    
+    def _confirm_package_candidate(self, software_name, interactive):
+        """Offer the closest package match for confirmation; without prompts it is only reported."""
+        candidate = self.package_candidate(software_name)
+        if candidate is None:
+            return
+        if not interactive:
+            self.emit(f"   ⚠️  No installed package is named '{software_name}'; the closest match "
+                      f"'{candidate.text}' ({candidate.score:.2f}) is not used without confirmation")
+            return
+        response = self.ask(f"\n   No installed package is named '{software_name}'. "
+                            f"Remove '{candidate.text}' (match {candidate.score:.2f}) instead? (y/n): ")
+        if response.lower() == 'y':
+            self._confirmed_packages[software_name] = candidate.payload
+    
+    def get_footprint_cache(self):
+        """
+        Open the learned-footprint cache if ai_features.enable_learning is on.
+        
+        Returns:
+            FootprintCache: The cache, or None if learning is disabled or unavailable
+        """
+        ai_config = self.config.get("ai_features", {})
+        if not ai_config.get("enable_learning", False):
+            return None
+        if self._footprint_cache is None:
+            try:
+                self._footprint_cache = FootprintCache(
+                    ai_config.get("learning_cache", "~/.cache/uninstall-helper/footprints.db"),
+                    ai_config.get("learning_max_entries", 500)
+                )
+            except (OSError, sqlite3.Error) as e:
+                self.emit(f"   ⚠️  Learned-footprint cache unavailable: {e}")
+                return None
+        return self._footprint_cache
+    
+    def remember_footprint(self, software_name, processes, paths):
+        """Record what this run discovered so later runs can skip discovery."""
+        cache = self.get_footprint_cache()
+        if cache is None or not (processes or paths):
+            return
+        try:
+            cache.put(
+                software_name,
+                signatures=[(proc['exe'], proc['cmdline']) for proc in processes],
+                install_paths=paths
+            )
+        except sqlite3.Error as e:
+            self.emit(f"   ⚠️  Failed to record learned footprint: {e}")
+    
+    def detect_processes_from_footprint(self, footprint):
+        """
+        Detect running processes matching a learned footprint exactly.
+        
+        A process matches when its executable lies under one of the
+        footprint's guard-approved install roots, or when both its
+        executable and its command line equal a recorded process's.  Names
+        are never compared, so a footprint that once matched python3
+        through its command line does not catch every python3.
+        
+        Args:
+            footprint (dict): Footprint returned by FootprintCache.get
+        
+        Returns:
+            list: List of dictionaries with process info
+        """
+        signatures = {(exe, tuple(cmdline)) for exe, cmdline in footprint.get("signatures", [])}
+        guard = self.get_path_guard()
+        install_paths = footprint.get("install_paths", [])
+        roots = PathSet(guard.filter(install_paths)[0] if guard else install_paths).roots()
+        prefixes = tuple(root.rstrip(os.sep) + os.sep for root in roots)
+        processes = []
+        
+        for proc in psutil.process_iter(['pid', 'name', 'exe', 'cmdline']):
+            try:
+                proc_info = proc.info
+                exe = proc_info['exe']
+                if not exe:
+                    continue
+                signature = (exe, tuple(proc_info['cmdline'] or ()))
+                if exe in roots or exe.startswith(prefixes) or signature in signatures:
+                    processes.append({
+                        'pid': proc_info['pid'],
+                        'name': proc_info['name'],
+                        'exe': exe,
+                        'cmdline': proc_info['cmdline']
+                    })
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        
+        return processes
+    
+    def map_service_units(self, processes, software_name):
+        """
+        Map matched processes to the systemd service units that own them.
+        
+        Each process dict gets a 'unit' key naming its unit (if any).
+        
+        Args:
+            processes (list): Process dicts from detect_processes
+            software_name (str): Name of the software
+        
+        Returns:
+            dict: systemd_units.Unit -> list of matched PIDs
+        """
+        if self.system != "linux" or not self.config.get("linux", {}).get("stop_service_units", True):
+            return {}
+        units = systemd_units.group_by_unit([proc['pid'] for proc in processes], software_name)
+        unit_of = {pid: unit.name for unit, pids in units.items() for pid in pids}
+        for proc in processes:
+            proc['unit'] = unit_of.get(proc['pid'])
+        return units
+    
+    def stop_service_units(self, units):
+        """
+        Stop and disable service units with one batched systemctl call.
+        
+        Args:
+            units (dict): Units from map_service_units
+        
+        Returns:
+            set: Names of the units that were stopped
+        """
+        if not units or not shutil.which("systemctl"):
+            return set()
+        
+        disable = self.config.get("linux", {}).get("disable_service_units", True)
+        outcome = systemd_units.stop_units(units, disable=disable)
+        stopped = set()
+        for name, ok in outcome.items():
+            if ok:
+                self.emit(f"✓ Service unit stopped: {name}")
+                stopped.add(name)
+            else:
+                self.emit(f"✗ Failed to stop service unit: {name}")
+        return stopped
+    
+    def start_respawn_watch(self, processes):
+        """
+        Start watching for re-spawns of terminated processes.
+        
+        Controlled by the respawn_watch config section; re-spawns are killed
+        (or only reported) as soon as they appear until the run finishes.
+        
+        Args:
+            processes (list): Process dicts that were terminated
+        """
+        watch_config = self.config.get("respawn_watch", {})
+        if not watch_config.get("enabled", False) or not processes or self._respawn_watcher:
+            return
+        
+        def report(event):
+            self.emit(f"   ♻️  Respawn detected: PID {event['pid']} ({event['name']}) "
+                      f"started by {event['supervisor']} - {event['action']}")
+        
+        self._respawn_watcher = RespawnWatcher(
+            processes=processes,
+            interval=watch_config.get("interval", 0.2),
+            action=watch_config.get("action", "kill"),
+            on_respawn=report
+        )
+        self._respawn_watcher.start()
+    
+    def stop_respawn_watch(self):
+        """
+        Stop the respawn watcher.
+        
+        Returns:
+            list: Respawn events, or None if no watcher was running
+        """
+        if self._respawn_watcher is None:
+            return None
+        events = self._respawn_watcher.stop()
+        self._respawn_watcher = None
+        return events
+    
+    def watch_install_paths(self, paths):
+        """
+        Let the respawn watcher treat binaries under the installation paths as the software's.
+        
+        Only roots the path guard allows are passed on, so a broad search
+        that picked up e.g. /usr/bin/python3.11 never makes every new
+        python3.11 process a re-spawn.
+        
+        Args:
+            paths (PathSet): Discovered installation paths
+        """
+        if self._respawn_watcher is None or not paths:
+            return
+        guard = self.get_path_guard()
+        self._respawn_watcher.watch_paths(
+            root for root in paths.roots() if guard is None or guard.check(root) is None)
+    
+    def _finish_respawn_watch(self, results):
+        """
+        Stop the respawn watcher before the package manager runs and count its events.
+        
+        The package manager's own children must never be mistaken for
+        re-spawns, so the watch ends with the file cleanup.
+        
+        Args:
+            results (dict): Summary dict to add respawns_detected/killed to
+        """
+        events = self.stop_respawn_watch()
+        if events is not None:
+            results["respawns_detected"] = len(events)
+            results["respawns_killed"] = sum(1 for event in events if event["action"] == "killed")
+    
+    def run_uninstall(self, software_name, interactive=False):
+        """
+        Main uninstallation routine.
+        
+        Args:
+            software_name (str): Name of the software to uninstall
+            interactive (bool): Whether to run in interactive mode
+        
+        Returns:
+            dict: Summary of uninstallation results
+        """
+        try:
+            results = self._run_uninstall(software_name, interactive)
+        finally:
+            self.stop_respawn_watch()
+            self.flush_desktop_caches()
+        
+        if "error" not in results:
+            self.verify_run(results)
+        return results
+    
+    def verify_run(self, results):
+        """
+        Recheck what the run removed, if verification.enabled is on.
+        
+        Only the recorded PIDs, paths and packages are looked at, so this
+        is cheap compared to a second detection pass.
+        
+        Args:
+            results (dict): Summary dict to add verified/survivors to
+        
+        Returns:
+            list: verify.Survivor tuples
+        """
+        if not self.config.get("verification", {}).get("enabled", True) or not len(self._manifest):
+            return []
+        survivors = verify.check(self._manifest)
+        results["verified"] = len(self._manifest)
+        results["survivors"] = len(survivors)
+        self.emit(f"\n🔎 Verifying removal of {len(self._manifest)} item(s)...")
+        for survivor in survivors:
+            self.emit(f"   ✗ {survivor.kind} {survivor.item} {survivor.state}")
+        if not survivors:
+            self.emit("   ✓ Everything removed is still gone")
+        return survivors
+    
+    def _run_uninstall(self, software_name, interactive):
+        """Run the uninstall steps; see run_uninstall."""
+        self.emit(f"\n🔍 Starting uninstallation analysis for: {software_name}")
+        self.emit(f"📊 System detected: {platform.system()} {platform.release()}")
+        
+        # Check permissions before starting
+        if not self.check_permissions():
+            self.emit("\n⚠️  权限警告:")
+            if self.system == "linux":
+                self.emit("   此操作需要管理员权限 (root/sudo)")
+                self.emit("   请使用以下方式运行:")
+                self.emit("   1. sudo python3 main.py '软件名'")
+                self.emit("   2. 或在sudo会话中运行")
+            elif self.system == "windows":
+                self.emit("   此操作需要管理员权限")
+                self.emit("   请以管理员身份运行命令提示符")
+            elif self.system == "darwin":
+                self.emit("   此操作需要管理员权限 (sudo)")
+                self.emit("   请使用: sudo python3 main.py '软件名'")
+            
+            if interactive:
+                response = self.ask("\n继续吗？(可能失败) (y/n): ")
+                if response.lower() != 'y':
+                    return {
+                        "software": software_name,
+                        "error": "权限不足，用户取消"
+                    }
+        
+        results = self._begin_run(software_name)
+        
+        processes = self._step_processes(software_name, results, interactive)
+        if processes is None:
+            return results
+        
+        paths = self._step_find_paths(software_name, results)
+        if not self._footprint:
+            self.remember_footprint(software_name, processes, list(paths))
+        self.watch_install_paths(paths)
+        
+        self._step_code_processes(paths, processes, results, interactive)
+        self._step_cleanup(paths, results, interactive)
+        self._finish_respawn_watch(results)
+        self._step_system_uninstall(software_name, results, interactive)
+        self._step_references(software_name, paths, results)
+        return results
+    
+    def _begin_run(self, software_name):
+        """Reset per-run state, look up the learned footprint and return the results dict."""
+        # Priorities are per thread; applying them here lets worker threads inherit them
+        self.get_governor()
+        
+        # Smart-matching index is rebuilt once per run
+        self._smart_index = None
+        self._footprint = None
+        self._sandboxed_apps = None
+        self._desktop_index = None
+        self._ecosystem_index = None
+        self._manifest = verify.Manifest()
+        
+        results = {
+            "software": software_name,
+            "processes_found": 0,
+            "processes_terminated": 0,
+            "paths_found": 0,
+            "paths_cleaned": 0,
+            "uninstall_success": False
+        }
+        
+        cache = self.get_footprint_cache()
+        if cache is not None:
+            try:
+                self._footprint = cache.get(software_name)
+            except sqlite3.Error as e:
+                self.emit(f"   ⚠️  Learned-footprint lookup failed: {e}")
+            if self._footprint:
+                self.emit("\n🧠 Using learned footprint from a previous run (discovery skipped)")
+        return results
+    
+    def _step_processes(self, software_name, results, interactive):
+        """
+        Step 1: detect and terminate processes.
+        
+        Returns:
+            list: Detected processes, or None if the user stopped the run
+        """
+        self.emit("\n1️⃣  Detecting running processes...")
+        if self._footprint:
+            processes = self.detect_processes_from_footprint(self._footprint)
+        else:
+            processes = self.detect_processes(software_name)
+        results["processes_found"] = len(processes)
+        
+        if processes:
+            self.emit(f"   Found {len(processes)} related process(es):")
+            for proc in processes:
+                score = f" (score {proc['score']:.2f})" if 'score' in proc else ""
+                self.emit(f"   - PID {proc['pid']}: {proc['name']}{score}")
+            
+            units = self.map_service_units(processes, software_name)
+            if units:
+                self.emit(f"   Owned by {len(units)} service unit(s):")
+                for unit, pids in units.items():
+                    self.emit(f"   - {unit.name} ({len(pids)} process(es))")
+            
+            if interactive:
+                response = self.ask("\n   Terminate these processes? (y/n): ")
+                if response.lower() != 'y':
+                    self.emit("   Skipping process termination.")
+                    return None
+            
+            self.emit("\n   Terminating processes...")
+            self._manifest.add_processes(proc['pid'] for proc in processes)
+            stopped = self.stop_service_units(units)
+            for proc in processes:
+                if proc.get('unit') in stopped and not psutil.pid_exists(proc['pid']):
+                    results["processes_terminated"] += 1
+                elif self.terminate_process(proc['pid']):
+                    results["processes_terminated"] += 1
+            self.start_respawn_watch(processes)
+        return processes
+    
+    def _step_find_paths(self, software_name, results):
+        """
+        Step 2: find installation paths.
+        
+        Returns:
+            PathSet: The paths; parent directories are stored once
+        """
+        self.emit("\n2️⃣  Searching for installation paths...")
+        paths = PathSet()
+        if self._footprint:
+            for path in self._footprint["install_paths"]:
+                if os.path.lexists(path) and paths.add(path):
+                    self.emit(f"   - {self.describe_path(path)}")
+        else:
+            # Show each path as soon as a provider reports it
+            for path in self.iter_installation_paths(software_name):
+                self.emit(f"   - {self.describe_path(path)}")
+                paths.add(path)
+        results["paths_found"] = len(paths)
+        if paths:
+            self.emit(f"   Found {len(paths)} installation path(s).")
+        return paths
+    
+    def _step_code_processes(self, paths, processes, results, interactive):
+        """
+        Step 2a: terminate processes running code from the installation paths.
+        
+        Catches processes whose name and command line do not mention the
+        software (e.g. /opt/acme-suite/bin/agentd) by joining the inodes of
+        running executables and mappings against the discovered files.
+        """
+        if self.system != "linux" or not paths or not self.config.get("linux", {}).get("match_by_inode", True):
+            return
+        guard = self.get_path_guard()
+        roots = [root for root in paths.roots() if guard is None or guard.check(root) is None]
+        known = {proc['pid'] for proc in processes} | {os.getpid()}
+        running = inode_join.processes_running_from(roots, exclude=known)
+        if not running:
+            return
+        
+        results["processes_found"] += len(running)
+        self.emit(f"   Found {len(running)} more process(es) running code from these paths:")
+        for pid, files in sorted(running.items()):
+            self.emit(f"   - PID {pid}: {holders.process_name(pid)} ({files[0]})")
+        
+        if interactive:
+            response = self.ask("\n   Terminate these processes? (y/n): ")
+            if response.lower() != 'y':
+                self.emit("   Skipping process termination.")
+                return
+        
+        self._manifest.add_processes(running)
+        for pid in sorted(running):
+            if self.terminate_process(pid):
+                results["processes_terminated"] += 1
+    
+    def _step_cleanup(self, paths, results, interactive):
+        """Step 2b: remove the top-level installation paths."""
+        progress = self.get_checkpoint(results["software"])
+        leftover = progress.pending if progress is not None else []
+        if not paths and not leftover:
+            return
+        allowed, blocked = self.guard_paths(paths or [])
+        results["paths_blocked"] = len(blocked)
+        if leftover:
+            self.emit(f"   🔁 Resuming interrupted cleanup: {len(leftover)} path(s) left "
+                      f"({progress.removed} entries removed before)")
+        # Removing a directory removes everything recorded below it
+        targets = PathSet(leftover + allowed).roots()
+        if not targets:
+            return
+        results["holders_found"] = self.check_open_holders(targets)
+        
+        if interactive:
+            response = self.ask("\n   Remove these files/directories? (y/n): ")
+            if response.lower() != 'y':
+                self.emit("   Skipping file cleanup.")
+                return
+        self._manifest.add_paths(targets)
+        if progress is not None:
+            progress.plan(targets)
+        results["paths_cleaned"] = self.cleanup_files(targets, progress)
+        results["links_removed"] = self.sweep_dangling_links(targets)
+    
+    def _step_system_uninstall(self, software_name, results, interactive):
+        """Step 3: run the system uninstall command."""
+        self.emit("\n3️⃣  Running system uninstall command...")
+        if self.system == "linux":
+            self._confirm_package_candidate(software_name, interactive)
+        finding = self.get_uninstall_finding(software_name)
+        uninstall_cmd = finding.value if finding else ""
+        detail = finding.detail if finding and isinstance(finding.detail, dict) else {}
+        plan = detail.get("orphans")
+        conffile_plan = detail.get("conffiles")
+        modified = []
+        
+        if uninstall_cmd:
+            self.emit(f"   Command: {uninstall_cmd}")
+            if plan and plan["orphans"]:
+                self.emit(f"   Includes {len(plan['orphans'])} orphaned dependenc"
+                          f"{'y' if len(plan['orphans']) == 1 else 'ies'}: {', '.join(plan['orphans'])}")
+            if conffile_plan:
+                audit = conffile_plan["audit"]
+                modified = [conffile for conffile, state in audit if state == conffiles.MODIFIED]
+                self.emit(f"   Conffiles: {len(audit) - len(modified)} unmodified, {len(modified)} modified")
+                for conffile in modified:
+                    self.emit(f"      {conffile.path} ({'backed up, then purged' if conffile_plan['purge'] else 'kept'})")
+            
+            purge = bool(conffile_plan and conffile_plan["purge"])
+            if interactive:
+                response = self.ask("\n   Execute this command? (y/n): ")
+                if response.lower() != 'y':
+                    self.emit("   Skipping system uninstall.")
+                    return
+                if purge:
+                    # Purging deletes /etc files, so it gets its own answer
+                    response = self.ask(f"   Also purge {len(conffile_plan['audit'])} conffile(s)? (y/n): ")
+                    if response.lower() != 'y':
+                        purge = False
+                        uninstall_cmd = conffile_plan["fallback"]
+                        self.emit(f"   Keeping conffiles: {uninstall_cmd}")
+            
+            backed_up = 0
+            if purge:
+                uninstall_cmd, backed_up = self.backup_conffiles(uninstall_cmd, modified, conffile_plan["fallback"])
+            
+            try:
+                self.emit("   Executing...")
+                result = subprocess.run(
+                    uninstall_cmd,
+                    shell=True,
+                    capture_output=True,
+                    text=True,
+                    timeout=PACKAGE_COMMAND_TIMEOUT
+                )
+                
+                if result.returncode == 0:
+                    self.emit("   ✓ System uninstall completed successfully")
+                    results["uninstall_success"] = True
+                    if plan:
+                        self._removed_packages.update([plan["package"]] + plan["orphans"])
+                        self._manifest.add_packages([plan["package"]] + plan["orphans"])
+                        results["orphans_removed"] = len(plan["orphans"])
+                        results["bytes_reclaimed"] = plan["bytes"]
+                        self.emit(f"   ✓ {user_residue.format_size(plan['bytes'])} reclaimed")
+                    if purge and uninstall_cmd != conffile_plan["fallback"]:
+                        results["conffiles_purged"] = len(conffile_plan["audit"])
+                        results["conffiles_backed_up"] = backed_up
+                else:
+                    self.emit(f"   ✗ System uninstall failed: {result.stderr}")
+            except subprocess.TimeoutExpired:
+                self.emit("   ✗ System uninstall timed out")
+            except Exception as e:
+                self.emit(f"   ✗ Error during system uninstall: {e}")
+        else:
+            self.emit("   No system-specific uninstall command available")
+    
+    def _step_references(self, software_name, paths, results):
+        """Step 4: report autostart, cron, timer and shell-rc lines left pointing at the software."""
+        self.emit("\n4️⃣  Checking autostart, cron, timer and shell references...")
+        found = self.find_references(software_name, paths or [])
+        results["references_found"] = len(found)
+        for ref in found:
+            self.emit(f"   ⚠️  {ref.kind} {ref.path}:{ref.lineno}: {ref.text}")
+        if found:
+            self.emit("   These still refer to the removed software; edit or remove them by hand.")
+        else:
+            self.emit("   ✓ No references left")
+    
+    def run_batch(self, software_names):
+        """
+        Uninstall several programs at once, without prompts.
+        
+        Each target becomes a chain of steps (processes, paths, cleanup,
+        package command) in one scheduler DAG.  Discovery for all targets
+        overlaps; cleanups only wait for each other when their directory
+        trees overlap, and package commands are serialised on the package
+        manager lock.  Desktop caches are refreshed once for the batch.
+        
+        Args:
+            software_names (list): Names of the software to uninstall
+        
+        Returns:
+            list: Summary dicts in the order of software_names
+        """
+        batch_config = self.config.get("batch", {})
+        sched = Scheduler(max_workers=batch_config.get("max_workers", 4))
+        helpers = {}
+        results = {}
+        
+        for name in dict.fromkeys(software_names):
+            # Separate helpers keep per-run state (footprint, indexes, residue info) apart
+            helper = self.spawn()
+            helpers[name] = helper
+            results[name] = helper._begin_run(name)
+            
+            stop = sched.add(f"{name}: processes", partial(helper._step_processes, name, results[name], False))
+            find = sched.add(f"{name}: paths", partial(helper._step_find_paths, name, results[name]))
+            clean = sched.add(
+                f"{name}: cleanup",
+                partial(helper._finish_batch_cleanup, name, sched, stop, find, results[name]),
+                deps=[stop, find],
+                resources=partial(helper._cleanup_resources, sched, find)
+            )
+            sched.add(f"{name}: package", partial(helper._step_system_uninstall, name, results[name], False),
+                      deps=[clean], resources=[PACKAGE_LOCK])
+        
+        try:
+            sched.run()
+        finally:
+            for name, helper in helpers.items():
+                helper._finish_respawn_watch(results[name])
+                self._pending_desktop_refresh |= helper._pending_desktop_refresh
+                self._pending_icon_refresh |= helper._pending_icon_refresh
+            self.flush_desktop_caches()
+        
+        for name, helper in helpers.items():
+            helper.verify_run(results[name])
+        for step in sched.results.values():
+            if step.status == "error":
+                self.emit(f"✗ {step.name} failed: {step.error}")
+        chain, seconds = sched.critical_path()
+        self.emit(f"\n⏱️  Batch finished in {sched.wall_time:.1f}s "
+                  f"(critical path {seconds:.1f}s: {' → '.join(chain)})")
+        return [results[name] for name in dict.fromkeys(software_names)]
+    
+    def spawn(self):
+        """
+        Create a helper for another run.
+        
+        The new helper has its own per-run state but shares the config,
+        output and prompt hooks, and this helper's governor, path guard,
+        package graph and reference index: they are built on first use, once, however many
+        helpers are spawned.  It also shares the set of removed packages, so
+        package steps see what earlier ones removed and fold shared
+        dependencies in once.
+        
+        Returns:
+            UninstallHelper: The new helper
+        """
+        helper = type(self)()
+        helper.config = self.config
+        helper.emit = self.emit
+        helper.ask = self.ask
+        helper._parent = self
+        helper._removed_packages = self._removed_packages
+        return helper
+    
+    def _cleanup_resources(self, sched, find_step):
+        """Directory trees a batch cleanup step locks."""
+        paths = sched.value(find_step) or PathSet()
+        return [tree_resource(path) for path in paths.roots()]
+    
+    def _finish_batch_cleanup(self, software_name, sched, stop_step, find_step, results):
+        """Batch cleanup step: record the footprint, then remove the paths."""
+        paths = sched.value(find_step)
+        if not self._footprint:
+            self.remember_footprint(software_name, sched.value(stop_step), list(paths))
+        self.watch_install_paths(paths)
+        self._step_code_processes(paths, sched.value(stop_step), results, False)
+        self._step_cleanup(paths, results, False)
+        self._finish_respawn_watch(results)
+        self._step_references(software_name, paths, results)
+    
+    def interactive_mode(self):
+        """Run in interactive mode with user prompts."""
+        self.emit("=" * 50)
+        self.emit("🤖 Uninstall Helper - Interactive Mode")
+        self.emit("=" * 50)
+        
+        software_name = self.ask("\nEnter the name of the software to uninstall: ").strip()
+        
+        if not software_name:
+            self.emit("No software name provided. Exiting.")
+            return
+        
+        self.emit("\nChoose uninstall mode:")
+        self.emit("1. Safe mode (detect only, no changes)")
+        self.emit("2. Standard mode (terminate processes, remove files)")
+        self.emit("3. Aggressive mode (full cleanup with system uninstall)")
+        
+        try:
+            mode = int(self.ask("\nSelect mode (1-3): "))
+        except ValueError:
+            mode = 1
+        
+        if mode == 1:
+            # Safe mode - detection only
+            self.emit(f"\n📊 Detection Results for '{software_name}':")
+            self.print_detection(software_name, indent="   ")
+        
+        elif mode == 2:
+            # Standard mode
+            results = self.run_uninstall(software_name, interactive=True)
+            self.print_summary(results)
+        
+        elif mode == 3:
+            # Aggressive mode
+            self.emit("\n⚠️  WARNING: Aggressive mode will:")
+            self.emit("   - Terminate all related processes")
+            self.emit("   - Remove all detected files and directories")
+            self.emit("   - Execute system uninstall command")
+            
+            confirm = self.ask("\nAre you sure you want to continue? (type 'yes' to confirm): ")
+            if confirm.lower() == 'yes':
+                results = self.run_uninstall(software_name, interactive=False)
+                self.print_summary(results)
+            else:
+                self.emit("Operation cancelled.")
+        
+        else:
+            self.emit("Invalid mode selected.")
+    
+    def print_summary(self, results):
+        """Print a summary of uninstallation results."""
+        self.emit("\n" + "=" * 50)
+        self.emit("📋 Uninstallation Summary")
+        self.emit("=" * 50)
+        self.emit(f"Software: {results['software']}")
+        self.emit(f"Processes found/terminated: {results['processes_found']}/{results['processes_terminated']}")
+        self.emit(f"Paths found/cleaned: {results['paths_found']}/{results['paths_cleaned']}")
+        if results.get('orphans_removed'):
+            self.emit(f"Orphaned dependencies removed: {results['orphans_removed']}")
+        if results.get('bytes_reclaimed'):
+            self.emit(f"Package space reclaimed: {user_residue.format_size(results['bytes_reclaimed'])}")
+        if results.get('conffiles_purged'):
+            self.emit(f"Conffiles purged/backed up: {results['conffiles_purged']}/{results['conffiles_backed_up']}")
+        if results.get('references_found'):
+            self.emit(f"References left to review: {results['references_found']}")
+        if results.get('links_removed'):
+            self.emit(f"Dangling links removed: {results['links_removed']}")
+        if results.get('paths_blocked'):
+            self.emit(f"Protected paths skipped: {results['paths_blocked']}")
+        if results.get('holders_found'):
+            self.emit(f"Processes still holding removed files: {results['holders_found']}")
+        if 'respawns_detected' in results:
+            self.emit(f"Respawns detected/killed: {results['respawns_detected']}/{results['respawns_killed']}")
+        self.emit(f"System uninstall: {'✓ Success' if results['uninstall_success'] else '✗ Failed/Not attempted'}")
+        if 'verified' in results:
+            if results['survivors']:
+                self.emit(f"Verification: ✗ {results['survivors']} of {results['verified']} item(s) survived or reappeared")
+            else:
+                self.emit(f"Verification: ✓ all {results['verified']} item(s) gone")
+        self.emit("=" * 50)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Inode-identity join between running code and installation paths.
+
+Name and command-line matching misses /opt/acme-suite/bin/agentd when
+searching for "acme-suite", because neither the process name nor argv
+contains the search string.  This module hashes the (device, inode) of
+every process's executable and file-backed mappings in one pass over
+/proc, then walks the discovered installation trees once and probes each
+regular file against that table, so every process running code from the
+target's install tree is found regardless of the path it was started by.
+"""
+
+import os
+import stat
+from collections import namedtuple
+
+CodeMatch = namedtuple("CodeMatch", ["pid", "path"])
+
+DEFAULT_MAX_FILES = 200000
+
+
+def _pids(proc_root):
+    try:
+        return [int(entry) for entry in os.listdir(proc_root) if entry.isdigit()]
+    except OSError:
+        return []
+
+
+def _parse_dev(field):
+    major, minor = field.split(":")
+    return os.makedev(int(major, 16), int(minor, 16))
+
+
+def process_identities(proc_root="/proc", exclude=()):
+    """
+    Build the hash side of the join: file identities of running code.
+    
+    Args:
+        proc_root (str): procfs mount point
+        exclude (iterable): PIDs to skip
+    
+    Returns:
+        dict: (st_dev, st_ino) -> set of PIDs executing or mapping that file
+    """
+    exclude = set(exclude)
+    table = {}
+    for pid in _pids(proc_root):
+        if pid in exclude:
+            continue
+        try:
+            st = os.stat(f"{proc_root}/{pid}/exe")
+            table.setdefault((st.st_dev, st.st_ino), set()).add(pid)
+        except OSError:
+            pass
+        try:
+            with open(f"{proc_root}/{pid}/maps", "r", errors="replace") as f:
+                for line in f:
+                    # address perms offset dev inode path
+                    fields = line.split(None, 5)
+                    if len(fields) < 6 or fields[4] == "0":
+                        continue
+                    try:
+                        key = (_parse_dev(fields[3]), int(fields[4]))
+                    except ValueError:
+                        continue
+                    table.setdefault(key, set()).add(pid)
+        except OSError:
+            continue
+    return table
+
+
+def _iter_files(roots, max_files):
+    """Yield (path, stat) for regular files below the roots, without following symlinks."""
+    seen = 0
+    stack = list(roots)
+    while stack and seen < max_files:
+        path = stack.pop()
+        try:
+            st = os.lstat(path)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            seen += 1
+            yield path, st
+            continue
+        if not stat.S_ISDIR(st.st_mode):
+            continue
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            seen += 1
+                            yield entry.path, entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def join(identities, roots, max_files=DEFAULT_MAX_FILES):
+    """
+    Probe every regular file below the roots against the identity table.
+    
+    Args:
+        identities (dict): Output of process_identities()
+        roots (iterable): Installation paths
+        max_files (int): Upper bound on files probed
+    
+    Returns:
+        list: CodeMatch tuples, one per (pid, file)
+    """
+    matches = []
+    if not identities:
+        return matches
+    for path, st in _iter_files(roots, max_files):
+        for pid in identities.get((st.st_dev, st.st_ino), ()):
+            matches.append(CodeMatch(pid, path))
+    return matches
+
+
+def processes_running_from(roots, proc_root="/proc", exclude=(), max_files=DEFAULT_MAX_FILES):
+    """
+    Find processes whose executable or mapped files live below the roots.
+    
+    Args:
+        roots (iterable): Installation paths
+        proc_root (str): procfs mount point
+        exclude (iterable): PIDs to ignore (e.g. already handled ones)
+        max_files (int): Upper bound on files probed
+    
+    Returns:
+        dict: PID -> sorted list of matched files
+    """
+    by_pid = {}
+    for match in join(process_identities(proc_root, exclude), roots, max_files):
+        by_pid.setdefault(match.pid, set()).add(match.path)
+    return {pid: sorted(paths) for pid, paths in by_pid.items()}
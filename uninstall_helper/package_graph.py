@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+In-memory package dependency graph for Uninstall Helper.
+
+Removing a package leaves the dependencies that were only installed for
+it behind, and running "apt autoremove" afterwards re-runs the whole
+resolver on every host.  This module loads the package database once
+(dpkg status plus apt's extended_states, or pacman's local database) into
+a graph and computes, with one mark-and-sweep from the manually installed
+packages, which auto-installed packages a removal batch leaves orphaned,
+so they can go in the same removal transaction.
+
+rpm's database is a binary format that cannot be read without the rpm
+bindings; on rpm systems no orphans are computed.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+Package = namedtuple("Package", ["name", "depends", "provides", "size", "auto", "essential"])
+
+DPKG_STATUS_FILE = "/var/lib/dpkg/status"
+APT_EXTENDED_STATES = "/var/lib/apt/extended_states"
+PACMAN_LOCAL_DIR = "/var/lib/pacman/local"
+
+# Relationships that keep a package installed (apt treats Recommends and
+# Suggests as important for autoremove by default)
+_DPKG_KEEP_FIELDS = ("Pre-Depends", "Depends", "Recommends", "Suggests")
+
+_VERSION_SUFFIX = re.compile(r"[<>=(].*$")
+
+
+def read_stanzas(path):
+    """Yield the fields of each blank-line separated stanza of a deb822 file."""
+    fields = {}
+    key = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if not line.strip():
+                if fields:
+                    yield fields
+                fields = {}
+                key = None
+            elif line[0].isspace():
+                if key:
+                    fields[key] += " " + line.strip()
+            elif ":" in line:
+                key, value = line.split(":", 1)
+                fields[key] = value.strip()
+    if fields:
+        yield fields
+
+
+def _dep_name(text):
+    return _VERSION_SUFFIX.sub("", text).strip().split(":")[0]
+
+
+def parse_relations(value):
+    """
+    Parse a Depends-style field into alternative groups.
+    
+    Args:
+        value (str): e.g. "libc6 (>= 2.34), foo | bar, baz:any"
+    
+    Returns:
+        list: Lists of package names, one list per comma-separated group
+    """
+    groups = []
+    for group in (value or "").split(","):
+        names = [_dep_name(alternative) for alternative in group.split("|")]
+        names = [name for name in names if name]
+        if names:
+            groups.append(names)
+    return groups
+
+
+def load_dpkg(status_file=DPKG_STATUS_FILE, extended_states=APT_EXTENDED_STATES):
+    """
+    Load installed packages from dpkg, with apt's auto-installed marks.
+    
+    Args:
+        status_file (str): dpkg status database
+        extended_states (str): apt extended_states file
+    
+    Returns:
+        list: Package tuples (sizes in bytes)
+    """
+    auto = set()
+    try:
+        for fields in read_stanzas(extended_states):
+            if fields.get("Auto-Installed") == "1":
+                auto.add(fields.get("Package"))
+    except OSError:
+        pass
+    
+    packages = []
+    try:
+        for fields in read_stanzas(status_file):
+            if not fields.get("Status", "").endswith(" installed"):
+                continue
+            name = fields.get("Package")
+            depends = []
+            for field in _DPKG_KEEP_FIELDS:
+                depends += parse_relations(fields.get(field))
+            provides = [group[0] for group in parse_relations(fields.get("Provides"))]
+            try:
+                size = int(fields.get("Installed-Size", "0")) * 1024
+            except ValueError:
+                size = 0
+            essential = (fields.get("Essential") == "yes"
+                         or fields.get("Priority") in ("required", "important"))
+            packages.append(Package(name, depends, provides, size, name in auto, essential))
+    except OSError:
+        return []
+    return packages
+
+
+def _read_desc(path):
+    sections = {}
+    current = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("%") and line.endswith("%"):
+                current = sections.setdefault(line.strip("%"), [])
+            elif line and current is not None:
+                current.append(line)
+    return sections
+
+
+def load_pacman(local_dir=PACMAN_LOCAL_DIR):
+    """
+    Load installed packages from pacman's local database.
+    
+    Args:
+        local_dir (str): Directory of <name>-<version>/desc entries
+    
+    Returns:
+        list: Package tuples
+    """
+    try:
+        entries = sorted(os.listdir(local_dir))
+    except OSError:
+        return []
+    packages = []
+    for entry in entries:
+        try:
+            desc = _read_desc(os.path.join(local_dir, entry, "desc"))
+        except OSError:
+            continue
+        if not desc.get("NAME"):
+            continue
+        try:
+            size = int((desc.get("SIZE") or ["0"])[0])
+        except ValueError:
+            size = 0
+        packages.append(Package(
+            desc["NAME"][0],
+            [[_dep_name(dep)] for dep in desc.get("DEPENDS", [])],
+            [_dep_name(provided) for provided in desc.get("PROVIDES", [])],
+            size,
+            (desc.get("REASON") or ["0"])[0] == "1",
+            False
+        ))
+    return packages
+
+
+def load_system():
+    """Load the package database of this system (dpkg or pacman), or an empty list."""
+    if os.path.exists(DPKG_STATUS_FILE):
+        return load_dpkg()
+    if os.path.isdir(PACMAN_LOCAL_DIR):
+        return load_pacman()
+    return []
+
+
+class PackageGraph:
+    """
+    Dependency graph over installed packages.
+    
+    Args:
+        packages (iterable): Package tuples
+    """
+    
+    def __init__(self, packages):
+        self.packages = {package.name: package for package in packages}
+        providers = {}
+        for package in self.packages.values():
+            for provided in package.provides:
+                providers.setdefault(provided, set()).add(package.name)
+        # Resolve every dependency to installed package names once
+        self.edges = {}
+        for package in self.packages.values():
+            targets = set()
+            for group in package.depends:
+                for name in group:
+                    if name in self.packages:
+                        targets.add(name)
+                    targets |= providers.get(name, set())
+            targets.discard(package.name)
+            self.edges[package.name] = targets
+    
+    def __contains__(self, name):
+        return name in self.packages
+    
+    def _reachable(self, removed):
+        roots = [name for name, package in self.packages.items()
+                 if name not in removed and (not package.auto or package.essential)]
+        marked = set(roots)
+        stack = list(roots)
+        while stack:
+            for dep in self.edges[stack.pop()]:
+                if dep not in marked and dep not in removed:
+                    marked.add(dep)
+                    stack.append(dep)
+        return marked
+    
+    def _orphans(self, removed):
+        marked = self._reachable(removed)
+        return {name for name in self.packages if name not in marked and name not in removed}
+    
+    def orphaned_by(self, removed, already_removed=()):
+        """
+        Auto-installed packages left unneeded by removing a set of packages.
+        
+        Packages that were already orphaned before the removal are not
+        included (those are the admin's business, not this removal's).
+        
+        Args:
+            removed (iterable): Packages being removed
+            already_removed (iterable): Packages removed earlier in the batch
+        
+        Returns:
+            list: Sorted names of newly orphaned packages
+        """
+        before = set(already_removed)
+        after = before | set(removed)
+        return sorted(self._orphans(after) - self._orphans(before))
+    
+    def size(self, names):
+        """Total installed size in bytes of the named packages."""
+        return sum(self.packages[name].size for name in names if name in self.packages)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Protected-path guard for Uninstall Helper.
+
+Substring discovery happily matches /usr/bin/python3 when asked for
+"python", and cleanup deletes whatever it is given.  The guard compiles a
+deny/allow list, the files of essential packages and the running
+interpreter into a prefix trie of path components, so every candidate is
+checked in O(path depth) before it is touched:
+
+- a protected path can be neither removed nor contained in a removed tree;
+- a path below a deny rule is blocked unless a deeper allow rule covers it.
+"""
+
+import itertools
+import os
+import sys
+
+DPKG_STATUS_FILE = "/var/lib/dpkg/status"
+DPKG_INFO_DIR = "/var/lib/dpkg/info"
+
+ESSENTIAL_PRIORITIES = ("required", "important")
+
+DEFAULT_DENY = ["/boot", "/dev", "/proc", "/sys", "/run", "/etc/ssl", "/etc/pam.d",
+                "/etc/sudoers.d", "/lib/modules", "/usr/lib/modules"]
+
+DEFAULT_PROTECT = ["/", "/bin", "/sbin", "/lib", "/lib64", "/usr", "/usr/bin", "/usr/sbin",
+                   "/usr/lib", "/usr/lib64", "/usr/share", "/usr/local", "/usr/local/bin",
+                   "/usr/local/share", "/etc", "/var", "/var/lib", "/opt", "/home", "/root",
+                   "/snap", "/var/lib/flatpak", "/var/lib/flatpak/app",
+                   "~", "~/.config", "~/.cache", "~/.local", "~/.local/share", "~/.local/bin",
+                   "~/.local/state", "~/.local/share/applications",
+                   # Interpreters and tools the system (and this helper) cannot run without
+                   "/usr/bin/python3", "/usr/bin/perl", "/usr/bin/env", "/usr/bin/sudo", "/bin/sh"]
+
+
+class _Node:
+    __slots__ = ("children", "rule", "protected", "protects_below")
+    
+    def __init__(self):
+        self.children = {}
+        self.rule = None          # "deny" or "allow" for the whole subtree
+        self.protected = False    # this exact path must stay
+        self.protects_below = False
+
+
+def _components(path):
+    return [part for part in os.path.normpath(path).split(os.sep) if part]
+
+
+class PathGuard:
+    """Prefix trie of deny/allow rules and protected paths."""
+    
+    def __init__(self):
+        self.root = _Node()
+    
+    def _node(self, path):
+        node = self.root
+        for part in _components(path):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _Node()
+            node = child
+        return node
+    
+    def deny(self, path):
+        """Block the path and everything below it."""
+        self._node(path).rule = "deny"
+    
+    def allow(self, path):
+        """Re-allow a subtree below a deny rule."""
+        self._node(path).rule = "allow"
+    
+    def protect(self, path):
+        """Block removing the path itself or any directory containing it."""
+        node = self.root
+        node.protects_below = True
+        for part in _components(path):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _Node()
+            child.protects_below = True
+            node = child
+        node.protected = True
+    
+    def check(self, path):
+        """
+        Check whether a path may be removed.
+        
+        Args:
+            path (str): Absolute path
+        
+        Returns:
+            str: Reason the path is blocked, or None if it may be removed
+        """
+        if not os.path.isabs(path):
+            return "not an absolute path"
+        node = self.root
+        rule = node.rule
+        for part in _components(path):
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.rule is not None:
+                rule = node.rule
+        else:
+            if node.protected:
+                return "protected path"
+            if node.protects_below:
+                return "contains protected paths"
+        if rule == "deny":
+            return "denied by rule"
+        return None
+    
+    def filter(self, paths):
+        """
+        Split paths into removable and blocked ones.
+        
+        Args:
+            paths (iterable): Candidate paths
+        
+        Returns:
+            tuple: (list of removable paths, list of (path, reason) tuples)
+        """
+        allowed = []
+        blocked = []
+        for path in paths:
+            reason = self.check(path)
+            if reason is None:
+                allowed.append(path)
+            else:
+                blocked.append((path, reason))
+        return allowed, blocked
+
+
+def essential_packages(status_file=DPKG_STATUS_FILE, priorities=ESSENTIAL_PRIORITIES):
+    """
+    List installed dpkg packages that are Essential or of an essential priority.
+    
+    Args:
+        status_file (str): dpkg status database
+        priorities (tuple): Priorities treated as essential
+    
+    Returns:
+        list: Package names as used by the info/*.list files
+    """
+    packages = []
+    fields = {}
+    try:
+        with open(status_file, "r", encoding="utf-8", errors="replace") as f:
+            for line in itertools.chain(f, ["\n"]):
+                if line.strip():
+                    if not line[0].isspace() and ":" in line:
+                        key, value = line.split(":", 1)
+                        fields[key] = value.strip()
+                    continue
+                if fields.get("Status", "").endswith(" installed") and (
+                        fields.get("Essential") == "yes" or fields.get("Priority") in priorities):
+                    name = fields.get("Package")
+                    if fields.get("Multi-Arch") == "same" and fields.get("Architecture"):
+                        name = f"{name}:{fields['Architecture']}"
+                    packages.append(name)
+                fields = {}
+    except OSError:
+        return []
+    return packages
+
+
+def essential_package_files(status_file=DPKG_STATUS_FILE, info_dir=DPKG_INFO_DIR):
+    """
+    Yield every path owned by an essential dpkg package.
+    
+    Args:
+        status_file (str): dpkg status database
+        info_dir (str): Directory holding <package>.list files
+    
+    Yields:
+        str: Owned path
+    """
+    for package in essential_packages(status_file):
+        try:
+            with open(os.path.join(info_dir, package + ".list"), "r",
+                      encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    path = line.rstrip("\n")
+                    if path.startswith("/") and path != "/.":
+                        yield path
+        except OSError:
+            continue
+
+
+def build_guard(deny=DEFAULT_DENY, allow=(), protect=DEFAULT_PROTECT, essentials=True,
+                status_file=DPKG_STATUS_FILE, info_dir=DPKG_INFO_DIR):
+    """
+    Compile the rules into a PathGuard.
+    
+    The running interpreter and its prefix are always protected.
+    
+    Args:
+        deny (iterable): Trees that must never be touched
+        allow (iterable): Subtrees of denied trees that may be removed
+        protect (iterable): Paths that must survive (with their ancestors)
+        essentials (bool): Protect the files of essential dpkg packages
+        status_file (str): dpkg status database
+        info_dir (str): dpkg info directory
+    
+    Returns:
+        PathGuard: The guard
+    """
+    guard = PathGuard()
+    for path in deny:
+        guard.deny(os.path.expanduser(path))
+    for path in allow:
+        guard.allow(os.path.expanduser(path))
+    for path in protect:
+        guard.protect(os.path.expanduser(path))
+    for path in (sys.executable, sys.prefix, sys.base_prefix):
+        if path:
+            guard.protect(path)
+            guard.protect(os.path.realpath(path))
+    if essentials:
+        for path in essential_package_files(status_file, info_dir):
+            guard.protect(path)
+    return guard
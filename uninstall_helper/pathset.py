@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Compact path set for Uninstall Helper.
+
+A broad query can match hundreds of thousands of files below a few
+directories.  Instead of keeping every full path string alive, each path
+is stored as (parent id, name) with parent directories interned once in
+a string table, so siblings share their prefix.  The set answers
+membership in O(1), "is this already under a matched directory?" in
+O(depth), reduces itself to the top-level roots that actually need
+deleting, and serializes to a small JSON-friendly dict.
+"""
+
+import os
+import sys
+
+
+class PathSet:
+    """
+    Insertion-ordered set of absolute paths with interned parent directories.
+    
+    Args:
+        paths (iterable): Initial paths
+    """
+    
+    def __init__(self, paths=()):
+        self._dir_ids = {}  # parent directory -> id
+        self._dirs = []     # id -> parent directory
+        self._entries = {}  # (parent id, name) -> None, in insertion order
+        for path in paths:
+            self.add(path)
+    
+    @staticmethod
+    def _split(path):
+        parent, name = os.path.split(os.path.normpath(path))
+        return parent, sys.intern(name)
+    
+    def _key(self, path):
+        parent, name = self._split(path)
+        dir_id = self._dir_ids.get(parent)
+        return None if dir_id is None else (dir_id, name)
+    
+    def add(self, path):
+        """
+        Add a path.
+        
+        Args:
+            path (str): Absolute path
+        
+        Returns:
+            bool: True if the path was not in the set yet
+        """
+        parent, name = self._split(path)
+        dir_id = self._dir_ids.get(parent)
+        if dir_id is None:
+            dir_id = len(self._dirs)
+            self._dir_ids[parent] = dir_id
+            self._dirs.append(parent)
+        key = (dir_id, name)
+        if key in self._entries:
+            return False
+        self._entries[key] = None
+        return True
+    
+    def discard(self, path):
+        """Remove a path if present."""
+        key = self._key(path)
+        if key is not None:
+            self._entries.pop(key, None)
+    
+    def __contains__(self, path):
+        key = self._key(path)
+        return key is not None and key in self._entries
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __iter__(self):
+        dirs = self._dirs
+        for dir_id, name in self._entries:
+            yield os.path.join(dirs[dir_id], name) if name else dirs[dir_id]
+    
+    def covers(self, path):
+        """
+        Check whether a path or one of its ancestors is in the set.
+        
+        Args:
+            path (str): Absolute path
+        
+        Returns:
+            bool: True if removing the set's members would remove the path
+        """
+        path = os.path.normpath(path)
+        while True:
+            if path in self:
+                return True
+            parent = os.path.dirname(path)
+            if parent == path:
+                return False
+            path = parent
+    
+    def roots(self):
+        """
+        Return the members that are not below another member.
+        
+        Returns:
+            list: Top-level paths in insertion order
+        """
+        roots = []
+        for path in self:
+            parent = os.path.dirname(path)
+            if parent == path or not self.covers(parent):
+                roots.append(path)
+        return roots
+    
+    def to_dict(self):
+        """Serialize to a JSON-compatible dict sharing the parent table."""
+        return {"dirs": list(self._dirs), "entries": [[dir_id, name] for dir_id, name in self._entries]}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a PathSet from to_dict() output."""
+        paths = cls()
+        dirs = data.get("dirs", [])
+        for dir_id, name in data.get("entries", []):
+            paths.add(os.path.join(dirs[dir_id], name))
+        return paths
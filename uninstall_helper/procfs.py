@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Lazy /proc reader for Uninstall Helper.
+
+psutil.process_iter(['name', 'exe', 'cmdline']) builds a Process object
+and reads every field for every PID, including an exe readlink that is
+wasted on the processes a name check rejects anyway.  This reader goes
+straight to /proc with raw os.open/readv calls into one reused buffer,
+reads comm first, and only reads cmdline and exe when the caller still
+needs them.  It is Linux-only; callers fall back to psutil elsewhere.
+"""
+
+import os
+import platform
+
+# comm is truncated to TASK_COMM_LEN - 1 characters
+_COMM_LEN = 15
+
+
+def available(proc_root="/proc"):
+    """Check whether the /proc fast path can be used on this system."""
+    return platform.system() == "Linux" and os.path.isdir(os.path.join(proc_root, "self"))
+
+
+class ProcReader:
+    """
+    Reads process fields from /proc on demand.
+    
+    Args:
+        proc_root (str): procfs mount point
+        bufsize (int): Initial size of the reused read buffer
+    """
+    
+    def __init__(self, proc_root="/proc", bufsize=4096):
+        self.proc_root = proc_root
+        self._buf = bytearray(bufsize)
+    
+    def _read(self, path):
+        """Read a whole (small) file into the shared buffer; None on error."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            total = 0
+            while True:
+                view = memoryview(self._buf)[total:]
+                count = os.readv(fd, [view])
+                view.release()
+                if count == 0:
+                    break
+                total += count
+                if total == len(self._buf):
+                    grown = bytearray(len(self._buf) * 2)
+                    grown[:total] = self._buf
+                    self._buf = grown
+            return bytes(self._buf[:total])
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+    
+    def pids(self):
+        """Return the current PIDs in ascending order."""
+        try:
+            return sorted(int(name) for name in os.listdir(self.proc_root) if name.isdigit())
+        except OSError:
+            return []
+    
+    def comm(self, pid):
+        """Return the kernel's (possibly truncated) command name, or None if the process is gone."""
+        data = self._read(f"{self.proc_root}/{pid}/comm")
+        if data is None:
+            return None
+        return data.rstrip(b"\n").decode("utf-8", "replace")
+    
+    def cmdline(self, pid):
+        """Return argv as a list ([] for kernel threads), or None if unreadable."""
+        data = self._read(f"{self.proc_root}/{pid}/cmdline")
+        if data is None:
+            return None
+        if not data:
+            return []
+        return data.rstrip(b"\0").decode("utf-8", "replace").split("\0")
+    
+    def exe(self, pid):
+        """Return the executable path, or None if it cannot be read."""
+        try:
+            exe = os.readlink(f"{self.proc_root}/{pid}/exe")
+        except OSError:
+            return None
+        if exe.endswith(" (deleted)"):
+            exe = exe[:-len(" (deleted)")]
+        return exe
+    
+    @staticmethod
+    def full_name(comm, cmdline):
+        """
+        Undo comm truncation the way psutil does.
+        
+        Args:
+            comm (str): Value of /proc/<pid>/comm
+            cmdline (list): argv, or None
+        
+        Returns:
+            str: The untruncated name when argv[0] extends comm, else comm
+        """
+        if len(comm) >= _COMM_LEN and cmdline:
+            base = os.path.basename(cmdline[0])
+            if base.startswith(comm):
+                return base
+        return comm
+
+
+def iter_matching(target_name, names=(), proc_root="/proc"):
+    """
+    Yield processes whose name contains the target, or is one of names, or
+    whose command line contains the target.
+    
+    comm is read for every PID, cmdline only when the name does not decide
+    (or may be truncated), and exe only for matches.
+    
+    Args:
+        target_name (str): Lower-case search string
+        names (iterable): Exact process names that also match
+        proc_root (str): procfs mount point
+    
+    Yields:
+        dict: Process info with pid, name, exe and cmdline
+    """
+    names = set(names)
+    reader = ProcReader(proc_root)
+    for pid in reader.pids():
+        comm = reader.comm(pid)
+        if comm is None:
+            continue
+        cmdline = reader.cmdline(pid) if len(comm) >= _COMM_LEN else None
+        name = reader.full_name(comm, cmdline)
+        
+        matched = target_name in name.lower() or name in names
+        if not matched:
+            if cmdline is None:
+                cmdline = reader.cmdline(pid)
+            matched = bool(cmdline) and target_name in " ".join(cmdline).lower()
+        if not matched:
+            continue
+        
+        if cmdline is None:
+            cmdline = reader.cmdline(pid)
+        yield {
+            'pid': pid,
+            'name': name,
+            'exe': reader.exe(pid),
+            'cmdline': cmdline
+        }
+
+
+def snapshot(proc_root="/proc"):
+    """
+    Read name, exe and cmdline of every process.
+    
+    Returns:
+        dict: PID -> process info dict
+    """
+    reader = ProcReader(proc_root)
+    processes = {}
+    for pid in reader.pids():
+        comm = reader.comm(pid)
+        if comm is None:
+            continue
+        cmdline = reader.cmdline(pid)
+        processes[pid] = {
+            'pid': pid,
+            'name': reader.full_name(comm, cmdline),
+            'exe': reader.exe(pid),
+            'cmdline': cmdline
+        }
+    return processes
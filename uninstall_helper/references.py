@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Reference index for Uninstall Helper.
+
+Removed software often stays wired into the system by file contents
+rather than file names: XDG autostart entries, crontab lines, systemd user
+timers and services, and PATH entries or aliases in shell rc files, which
+then fire against missing binaries.  This module reads all of those
+locations once, tokenizes the lines that run or configure commands, and
+indexes the tokens both as bare names (binaries, aliases) and as absolute
+paths, so the references to any number of targets are found by lookups
+instead of grepping every file per target.
+"""
+
+import bisect
+import glob
+import os
+import re
+from collections import namedtuple
+
+Reference = namedtuple("Reference", ["kind", "path", "lineno", "text", "token"])
+
+# Per-home locations, relative to each home directory
+HOME_FILES = {
+    "autostart": [".config/autostart/*.desktop"],
+    "shell-rc": [".bashrc", ".bash_profile", ".bash_login", ".profile", ".zshrc", ".zprofile", ".zshenv",
+                 ".config/fish/config.fish"],
+    "systemd": [".config/systemd/user/*.service", ".config/systemd/user/*.timer"],
+}
+
+SYSTEM_FILES = {
+    "autostart": ["/etc/xdg/autostart/*.desktop"],
+    "cron": ["/etc/crontab", "/etc/cron.d/*", "/etc/cron.hourly/*", "/etc/cron.daily/*",
+             "/etc/cron.weekly/*", "/etc/cron.monthly/*", "/var/spool/cron/crontabs/*",
+             "/var/spool/cron/*", "/var/at/tabs/*"],
+    "shell-rc": ["/etc/profile", "/etc/bash.bashrc", "/etc/zsh/zshrc", "/etc/zsh/zprofile",
+                 "/etc/profile.d/*.sh"],
+    "systemd": ["/etc/systemd/user/*.service", "/etc/systemd/user/*.timer"],
+}
+
+MAX_FILE_SIZE = 1024 * 1024
+
+_SEPARATORS = re.compile(r"""[\s'"=:;|&()`<>,{}\[\]]+""")
+_WORD = re.compile(r"^[\w.+@-]+$")
+_HOME_PREFIX = re.compile(r"(?<![\w~])~(?=/|$)")
+
+
+def tokenize(line, home=None):
+    """
+    Split a command or assignment line into the names and paths it refers to.
+    
+    ~, $HOME and ${HOME} are expanded when the file belongs to a home.
+    
+    Args:
+        line (str): Line of the file
+        home (str): Home directory the file belongs to, or None
+    
+    Returns:
+        tuple: (set of bare names, set of normalized absolute paths); a
+            path's basename is also a name
+    """
+    if home:
+        line = line.replace("${HOME}", home).replace("$HOME", home)
+        line = _HOME_PREFIX.sub(home, line)
+    names = set()
+    paths = set()
+    for token in _SEPARATORS.split(line):
+        if token.startswith("/"):
+            path = os.path.normpath(token)
+            paths.add(path)
+            if os.path.basename(path):
+                names.add(os.path.basename(path))
+        elif _WORD.match(token) and not token.startswith("-"):
+            names.add(token)
+    return names, paths
+
+
+def _read_lines(path):
+    try:
+        if os.path.getsize(path) > MAX_FILE_SIZE:
+            return []
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read().splitlines()
+    except OSError:
+        return []
+
+
+def _unit_value(lines, key):
+    for line in lines:
+        line = line.strip()
+        if line.startswith(key + "="):
+            return line.split("=", 1)[1].strip()
+    return None
+
+
+def collect_files(homes=()):
+    """
+    List the files the index reads.
+    
+    Args:
+        homes (iterable): (user, home) tuples whose per-user files are included
+    
+    Returns:
+        list: (kind, path, home) tuples; home is None for system files
+    """
+    files = []
+    seen = set()
+    
+    def add(kind, pattern, home):
+        for path in sorted(glob.glob(pattern)):
+            if path not in seen and os.path.isfile(path):
+                seen.add(path)
+                files.append((kind, path, home))
+    
+    for kind, patterns in SYSTEM_FILES.items():
+        for pattern in patterns:
+            add(kind, pattern, None)
+    for _user, home in homes:
+        for kind, patterns in HOME_FILES.items():
+            for pattern in patterns:
+                add(kind, os.path.join(glob.escape(home), pattern), home)
+    return files
+
+
+class ReferenceIndex:
+    """
+    Token index over autostart, cron, systemd user unit and shell rc files.
+    
+    Args:
+        files (list): (kind, path, home) tuples (defaults to collect_files())
+    """
+    
+    def __init__(self, files=None):
+        self.names = {}  # name -> list of (kind, path, lineno, text)
+        self.paths = {}  # absolute path -> list of (kind, path, lineno, text)
+        self.files = collect_files() if files is None else list(files)
+        
+        units = []
+        timer_units = set()
+        for kind, path, home in self.files:
+            lines = _read_lines(path)
+            if kind == "systemd":
+                if path.endswith(".timer"):
+                    unit = _unit_value(lines, "Unit") or os.path.basename(path)[:-len(".timer")] + ".service"
+                    timer_units.add(unit)
+                else:
+                    units.append((path, home, lines))
+            elif kind == "autostart":
+                self._add_lines(kind, path, home, lines, ("Exec=", "TryExec="))
+            else:
+                self._add_lines(kind, path, home, lines)
+        
+        # A service started by a timer is reported as such
+        for path, home, lines in units:
+            kind = "systemd-timer" if os.path.basename(path) in timer_units else "systemd-user"
+            self._add_lines(kind, path, home, lines, ("Exec",))
+        self.sorted_paths = sorted(self.paths)
+    
+    def _add_lines(self, kind, path, home, lines, prefixes=None):
+        for lineno, line in enumerate(lines, 1):
+            text = line.strip()
+            if not text or text.startswith(("#", ";")):
+                continue
+            if prefixes is not None and not text.startswith(prefixes):
+                continue
+            entry = (kind, path, lineno, text)
+            if home and kind.startswith("systemd"):
+                # %h is systemd's specifier for the user's home
+                text = text.replace("%h", home)
+            names, paths = tokenize(text, home)
+            for name in names:
+                self.names.setdefault(name.lower(), []).append(entry)
+            for token in paths:
+                self.paths.setdefault(token, []).append(entry)
+    
+    def _paths_under(self, path):
+        found = [(path, entry) for entry in self.paths.get(path, ())]
+        prefix = path.rstrip("/") + "/"
+        for i in range(bisect.bisect_left(self.sorted_paths, prefix), len(self.sorted_paths)):
+            token = self.sorted_paths[i]
+            if not token.startswith(prefix):
+                break
+            found.extend((token, entry) for entry in self.paths[token])
+        return found
+    
+    def find(self, names=(), paths=()):
+        """
+        Find lines that refer to any of the binary names or into any of the paths.
+        
+        Args:
+            names (iterable): Binary or command names (compared case-insensitively)
+            paths (iterable): Installed files or directories
+        
+        Returns:
+            list: Reference tuples, one per referring line
+        """
+        found = {}
+        for name in names:
+            for entry in self.names.get(name.lower(), ()):
+                found.setdefault(entry[1:3], Reference(*entry, name))
+        for path in paths:
+            for token, entry in self._paths_under(os.path.normpath(path)):
+                found.setdefault(entry[1:3], Reference(*entry, token))
+        return sorted(found.values(), key=lambda ref: (ref.path, ref.lineno))
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Respawn watcher for Uninstall Helper.
+
+After processes are terminated, supervisors (systemd, launchd, cron,
+application updaters) often start them again.  RespawnWatcher keeps an
+incremental diff of the process table and only inspects PIDs that were
+not present on the previous tick, so its cost per tick is one directory
+listing plus a few reads per new process.
+
+A new process only counts as a re-spawn if its binary lives under one of
+the software's install paths, or if both its executable and its command
+line equal those of a terminated process.  A matching name alone is not
+enough (names are short and shared), and descendants of this process -
+such as the package manager run later - are never touched.
+"""
+
+import os
+import sys
+import threading
+
+import psutil
+
+# Parents that typically restart what we kill
+SUPERVISORS = {
+    "systemd", "init", "launchd", "cron", "crond", "anacron", "atd",
+    "supervisord", "runsv", "runsvdir", "s6-supervise", "monit",
+    "upstart", "services.exe", "svchost.exe", "taskeng.exe", "taskhostw.exe",
+}
+
+
+def _read(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return b""
+
+
+class ProcSource:
+    """Reads the bits of a process the watcher needs straight from /proc."""
+    
+    def __init__(self, proc_root="/proc"):
+        self.proc_root = proc_root
+    
+    def pids(self):
+        """Return the set of current PIDs."""
+        try:
+            return {int(name) for name in os.listdir(self.proc_root) if name.isdigit()}
+        except OSError:
+            return set()
+    
+    def name(self, pid):
+        return _read(f"{self.proc_root}/{pid}/comm").strip().decode("utf-8", "replace")
+    
+    def exe(self, pid):
+        try:
+            exe = os.readlink(f"{self.proc_root}/{pid}/exe")
+        except OSError:
+            return None
+        # The binary itself may already be gone
+        if exe.endswith(" (deleted)"):
+            exe = exe[:-len(" (deleted)")]
+        return exe
+    
+    def cmdline(self, pid):
+        args = _read(f"{self.proc_root}/{pid}/cmdline").split(b"\0")
+        if args and not args[-1]:
+            args.pop()
+        return [arg.decode("utf-8", "replace") for arg in args]
+    
+    def ppid(self, pid):
+        data = _read(f"{self.proc_root}/{pid}/stat")
+        # Fields after the parenthesised comm: state ppid ...
+        fields = data[data.rfind(b")") + 2:].split()
+        try:
+            return int(fields[1])
+        except (IndexError, ValueError):
+            return 0
+
+
+class PsutilSource:
+    """Portable fallback for systems without /proc."""
+    
+    def pids(self):
+        return set(psutil.pids())
+    
+    def name(self, pid):
+        try:
+            return psutil.Process(pid).name()
+        except psutil.Error:
+            return ""
+    
+    def exe(self, pid):
+        try:
+            return psutil.Process(pid).exe() or None
+        except psutil.Error:
+            return None
+    
+    def cmdline(self, pid):
+        try:
+            return psutil.Process(pid).cmdline()
+        except psutil.Error:
+            return []
+    
+    def ppid(self, pid):
+        try:
+            return psutil.Process(pid).ppid()
+        except psutil.Error:
+            return 0
+
+
+def default_source():
+    """Return the cheapest process source for this platform."""
+    if sys.platform.startswith("linux") and os.path.isdir("/proc/self"):
+        return ProcSource()
+    return PsutilSource()
+
+
+class RespawnWatcher(threading.Thread):
+    """
+    Background thread that catches re-spawns of terminated software.
+    
+    Args:
+        processes (iterable): Terminated process dicts (exe and cmdline are used)
+        prefixes (iterable): Install paths whose binaries count as the software's
+        interval (float): Seconds between process-table diffs
+        action (str): 'kill' to kill re-spawns immediately, 'report' to only record them
+        on_respawn (callable): Called with each event dict as it happens
+        source: Process source (defaults to /proc on Linux, psutil elsewhere)
+    """
+    
+    def __init__(self, processes=(), prefixes=(), interval=0.2, action="kill", on_respawn=None, source=None):
+        super().__init__(name="respawn-watcher", daemon=True)
+        self.signatures = {(proc["exe"], tuple(proc["cmdline"] or ()))
+                           for proc in processes if proc.get("exe")}
+        self.exes = {exe for exe, _cmdline in self.signatures}
+        self.prefixes = ()
+        self.watch_paths(prefixes)
+        self.interval = interval
+        self.action = action
+        self.on_respawn = on_respawn
+        self.source = source or default_source()
+        self.events = []
+        self._own_pid = os.getpid()
+        self._stop_event = threading.Event()
+        self._known = self.source.pids()
+    
+    def watch_paths(self, paths):
+        """
+        Treat binaries under these install paths as the software's.
+        
+        Args:
+            paths (iterable): Install files or directories
+        """
+        prefixes = set(self.prefixes)
+        prefixes.update(os.path.normpath(path) for path in paths if path and os.path.isabs(path))
+        prefixes.discard("/")
+        # Replaced in one assignment, so the watcher thread never sees a partial set
+        self.prefixes = tuple(sorted(prefixes))
+    
+    def stop(self):
+        """
+        Stop watching and return the recorded events.
+        
+        Returns:
+            list: Event dicts with pid, name, exe, ppid, supervisor and action
+        """
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=max(1.0, self.interval * 5))
+        # One last diff so a respawn racing the stop is not missed
+        self.poll()
+        return self.events
+    
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.poll()
+    
+    def poll(self):
+        """Diff the process table once and handle any new matching PIDs."""
+        current = self.source.pids()
+        new_pids = current - self._known
+        self._known = current
+        for pid in sorted(new_pids):
+            self._inspect(pid)
+    
+    def matches(self, pid):
+        """
+        Tell whether a new process is a re-spawn of the watched software.
+        
+        Args:
+            pid (int): Process ID
+        
+        Returns:
+            str: The process's executable if it matches, else None
+        """
+        exe = self.source.exe(pid)
+        if not exe:
+            return None
+        if not any(exe == prefix or exe.startswith(prefix.rstrip("/") + "/") for prefix in self.prefixes):
+            if exe not in self.exes or (exe, tuple(self.source.cmdline(pid))) not in self.signatures:
+                return None
+        if self.is_own_descendant(pid):
+            return None
+        return exe
+    
+    def is_own_descendant(self, pid):
+        """
+        Tell whether a process was started (directly or not) by this process.
+        
+        Args:
+            pid (int): Process ID
+        
+        Returns:
+            bool: True for our own children, e.g. the package manager
+        """
+        for _ in range(32):
+            pid = self.source.ppid(pid)
+            if pid == self._own_pid:
+                return True
+            if pid <= 1:
+                break
+        return False
+    
+    def _inspect(self, pid):
+        exe = self.matches(pid)
+        if exe is None:
+            return
+        name = self.source.name(pid)
+        ppid = self.source.ppid(pid)
+        event = {
+            "pid": pid,
+            "name": name,
+            "exe": exe,
+            "ppid": ppid,
+            "supervisor": self.find_supervisor(ppid),
+            "action": "reported"
+        }
+        if self.action == "kill":
+            try:
+                psutil.Process(pid).kill()
+                event["action"] = "killed"
+            except psutil.Error:
+                event["action"] = "kill failed"
+        
+        self.events.append(event)
+        if self.on_respawn:
+            self.on_respawn(event)
+    
+    def find_supervisor(self, ppid):
+        """
+        Walk the parent chain to the nearest known supervisor.
+        
+        Args:
+            ppid (int): Parent PID of the re-spawned process
+        
+        Returns:
+            str: Supervisor description, e.g. 'systemd (PID 1)'
+        """
+        first = None
+        pid = ppid
+        for _ in range(32):
+            if pid <= 0:
+                break
+            name = self.source.name(pid)
+            if not name:
+                break
+            if first is None:
+                first = f"{name} (PID {pid})"
+            if name in SUPERVISORS:
+                return f"{name} (PID {pid})"
+            if pid == 1:
+                break
+            pid = self.source.ppid(pid)
+        return first or "unknown"
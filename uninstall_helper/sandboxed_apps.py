@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Snap and Flatpak discovery for Uninstall Helper.
+
+Resolves installed snaps and flatpaks from their package metadata
+(snapd's state.json, flatpak's app/<id>/current deployments) instead of
+walking the mounted squashfs revisions and runtimes under /snap and
+/var/lib/flatpak, which can hold millions of entries.
+"""
+
+import configparser
+import json
+import os
+from collections import namedtuple
+
+SandboxedApp = namedtuple("SandboxedApp", ["kind", "app_id", "name", "installation", "install_dir", "data_dirs"])
+
+SNAP_STATE_FILE = "/var/lib/snapd/state.json"
+SNAP_MOUNT_DIR = "/snap"
+SNAP_BLOBS_DIR = "/var/lib/snapd/snaps"
+FLATPAK_SYSTEM_DIR = "/var/lib/flatpak"
+
+# Entries under /snap that are not snaps
+_SNAP_MOUNT_EXTRAS = {"bin", "README"}
+
+
+def _snap_names_from_state(state_file):
+    with open(state_file, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    return sorted(state.get("data", {}).get("snaps", {}))
+
+
+def _snap_names_from_disk(mount_dir, blobs_dir):
+    names = set()
+    try:
+        for blob in os.listdir(blobs_dir):
+            # <name>_<revision>.snap
+            if blob.endswith(".snap") and "_" in blob:
+                names.add(blob.rsplit("_", 1)[0])
+    except OSError:
+        pass
+    if not names:
+        try:
+            names = {entry for entry in os.listdir(mount_dir) if entry not in _SNAP_MOUNT_EXTRAS}
+        except OSError:
+            pass
+    return sorted(names)
+
+
+def list_snaps(state_file=SNAP_STATE_FILE, mount_dir=SNAP_MOUNT_DIR, blobs_dir=SNAP_BLOBS_DIR,
+               home=None):
+    """
+    List installed snaps from snapd metadata.
+    
+    state.json is only readable by root; otherwise the snap blob names
+    (one directory listing) are used.  Nothing under the mounts is read.
+    
+    Args:
+        state_file (str): snapd state file
+        mount_dir (str): Snap mount directory
+        blobs_dir (str): Directory holding <name>_<rev>.snap blobs
+        home (str): Home directory for per-user data (defaults to ~)
+    
+    Returns:
+        list: SandboxedApp tuples
+    """
+    try:
+        names = _snap_names_from_state(state_file)
+    except (OSError, ValueError):
+        names = _snap_names_from_disk(mount_dir, blobs_dir)
+    
+    home = home or os.path.expanduser("~")
+    apps = []
+    for name in names:
+        data_dirs = [os.path.join("/var/snap", name), os.path.join(home, "snap", name)]
+        apps.append(SandboxedApp("snap", name, name, "system",
+                                 os.path.join(mount_dir, name), data_dirs))
+    return apps
+
+
+def _flatpak_display_name(app_dir):
+    metadata = os.path.join(app_dir, "current", "active", "metadata")
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read(metadata, encoding="utf-8")
+        return parser.get("Application", "name", fallback=None)
+    except (configparser.Error, OSError):
+        return None
+
+
+def list_flatpaks(installations=None, home=None):
+    """
+    List installed flatpak applications from their deployment metadata.
+    
+    Only app/<id>/current (the deployed ref) and the small metadata file
+    are read for each app.
+    
+    Args:
+        installations (dict): Installation name -> flatpak directory
+        home (str): Home directory for per-user data (defaults to ~)
+    
+    Returns:
+        list: SandboxedApp tuples
+    """
+    home = home or os.path.expanduser("~")
+    if installations is None:
+        installations = {
+            "system": FLATPAK_SYSTEM_DIR,
+            "user": os.path.join(home, ".local", "share", "flatpak"),
+        }
+    
+    apps = []
+    for installation, base in installations.items():
+        app_root = os.path.join(base, "app")
+        try:
+            app_ids = sorted(os.listdir(app_root))
+        except OSError:
+            continue
+        for app_id in app_ids:
+            app_dir = os.path.join(app_root, app_id)
+            if not os.path.lexists(os.path.join(app_dir, "current")):
+                continue
+            name = _flatpak_display_name(app_dir) or app_id
+            apps.append(SandboxedApp("flatpak", app_id, name, installation, app_dir,
+                                     [os.path.join(home, ".var", "app", app_id)]))
+    return apps
+
+
+def matches(app, software_name):
+    """
+    Check whether an app corresponds to the requested software.
+    
+    The id or display name must equal the name (ignoring case).  Flatpak
+    ids are reverse-DNS, so their last component counts as well: 'firefox'
+    matches 'org.mozilla.firefox', but 'core' does not match 'core22'.
+    
+    Args:
+        app (SandboxedApp): Installed app
+        software_name (str): Name of the software
+    
+    Returns:
+        bool: True if the app matches
+    """
+    software_name = software_name.strip().lower()
+    candidates = {app.app_id.lower(), app.name.lower(), app.app_id.lower().rsplit(".", 1)[-1]}
+    return software_name in candidates
+
+
+def find_apps(software_name, snaps=None, flatpaks=None):
+    """
+    Find installed snaps and flatpaks matching a name.
+    
+    Args:
+        software_name (str): Name of the software
+        snaps (list): Pre-loaded snap list (loaded from disk if None)
+        flatpaks (list): Pre-loaded flatpak list (loaded from disk if None)
+    
+    Returns:
+        list: Matching SandboxedApp tuples
+    """
+    if snaps is None:
+        snaps = list_snaps()
+    if flatpaks is None:
+        flatpaks = list_flatpaks()
+    return [app for app in snaps + flatpaks if matches(app, software_name)]
+
+
+def uninstall_command(app):
+    """Return the native uninstall command for a snap or flatpak."""
+    if app.kind == "snap":
+        return f"sudo snap remove {app.app_id}"
+    if app.installation == "user":
+        return f"flatpak uninstall --user {app.app_id} -y"
+    return f"sudo flatpak uninstall --system {app.app_id} -y"
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware step scheduler for Uninstall Helper.
+
+A batch of uninstall targets becomes a DAG of steps (stop processes, find
+paths, remove files, run the package command).  Steps whose dependencies
+are done run concurrently on a thread pool; only steps that claim a
+conflicting resource are serialised - the package manager lock, or
+directory trees where one contains the other.  After a run the scheduler
+reports the critical path, the longest dependency chain, which is the
+lower bound on the batch's wall time.
+"""
+
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+StepResult = namedtuple("StepResult", ["name", "status", "started", "finished", "value", "error"])
+
+PACKAGE_LOCK = "package-manager"
+
+
+def tree_resource(path):
+    """Return the resource name that locks a directory tree."""
+    return "tree:" + os.path.normpath(path)
+
+
+def conflicts(first, second):
+    """
+    Check whether two resources cannot be held at the same time.
+    
+    Tree resources conflict when one tree contains the other; any other
+    resource only conflicts with itself.
+    
+    Args:
+        first (str): Resource name
+        second (str): Resource name
+    
+    Returns:
+        bool: True if the resources conflict
+    """
+    if first == second:
+        return True
+    if first.startswith("tree:") and second.startswith("tree:"):
+        a, b = first[len("tree:"):], second[len("tree:"):]
+        return (b + "/").startswith(a.rstrip("/") + "/") or (a + "/").startswith(b.rstrip("/") + "/")
+    return False
+
+
+class _Step:
+    def __init__(self, name, func, deps, resources):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.resources = resources
+        self.claimed = None
+
+
+class Scheduler:
+    """
+    Runs a DAG of steps concurrently under resource locks.
+    
+    Args:
+        max_workers (int): Upper bound on concurrently running steps
+    """
+    
+    def __init__(self, max_workers=4):
+        self.max_workers = max(1, max_workers)
+        self.steps = {}
+        self.results = {}
+        self.wall_time = 0.0
+    
+    def add(self, name, func, deps=(), resources=()):
+        """
+        Add a step.
+        
+        Args:
+            name (str): Unique step name
+            func (callable): Called with no arguments; its return value is kept
+            deps (iterable): Names of steps that must succeed first
+            resources (iterable or callable): Resource names held while the
+                step runs, or a callable returning them once the deps are done
+        
+        Returns:
+            str: The step name
+        """
+        if name in self.steps:
+            raise ValueError(f"Duplicate step: {name}")
+        self.steps[name] = _Step(name, func, deps, resources)
+        return name
+    
+    def value(self, name):
+        """Return the value a finished step returned (None if it did not succeed)."""
+        result = self.results.get(name)
+        return result.value if result is not None else None
+    
+    def _check_graph(self):
+        for step in self.steps.values():
+            for dep in step.deps:
+                if dep not in self.steps:
+                    raise ValueError(f"Step {step.name} depends on unknown step {dep}")
+        indegree = {name: len(step.deps) for name, step in self.steps.items()}
+        ready = [name for name, count in indegree.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for other in self.steps.values():
+                if name in other.deps:
+                    indegree[other.name] -= 1
+                    if indegree[other.name] == 0:
+                        ready.append(other.name)
+        if visited != len(self.steps):
+            raise ValueError("Step dependencies contain a cycle")
+    
+    def run(self):
+        """
+        Run every step.
+        
+        A step whose dependency failed or was skipped is skipped as well.
+        
+        Returns:
+            dict: Step name -> StepResult
+        """
+        self._check_graph()
+        self.results = {}
+        pending = dict(self.steps)
+        running = {}
+        held = []  # (step name, resource)
+        start = time.monotonic()
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name, step in list(pending.items()):
+                    if len(running) >= self.max_workers:
+                        break
+                    deps = [self.results.get(dep) for dep in step.deps]
+                    if any(dep is None for dep in deps):
+                        continue
+                    now = time.monotonic() - start
+                    if any(dep.status != "ok" for dep in deps):
+                        del pending[name]
+                        self.results[name] = StepResult(name, "skipped", now, now, None, None)
+                        continue
+                    if step.claimed is None:
+                        try:
+                            resources = step.resources() if callable(step.resources) else step.resources
+                            step.claimed = list(resources)
+                        except Exception as e:
+                            del pending[name]
+                            self.results[name] = StepResult(name, "error", now, now, None, str(e))
+                            continue
+                    if any(conflicts(mine, theirs) for mine in step.claimed for _owner, theirs in held):
+                        continue
+                    
+                    del pending[name]
+                    held.extend((name, resource) for resource in step.claimed)
+                    running[pool.submit(step.func)] = (step, now)
+                
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step, started = running.pop(future)
+                    held = [(owner, resource) for owner, resource in held if owner != step.name]
+                    finished = time.monotonic() - start
+                    try:
+                        value = future.result()
+                        self.results[step.name] = StepResult(step.name, "ok", started, finished, value, None)
+                    except Exception as e:
+                        self.results[step.name] = StepResult(step.name, "error", started, finished, None, str(e))
+        
+        self.wall_time = time.monotonic() - start
+        return self.results
+    
+    def critical_path(self):
+        """
+        Find the longest chain of dependent steps by run time.
+        
+        Returns:
+            tuple: (list of step names, total seconds)
+        """
+        memo = {}
+        
+        def longest(name):
+            if name not in memo:
+                result = self.results.get(name)
+                own = (result.finished - result.started) if result else 0.0
+                best = ([], 0.0)
+                for dep in self.steps[name].deps:
+                    chain = longest(dep)
+                    if chain[1] > best[1]:
+                        best = chain
+                memo[name] = (best[0] + [name], best[1] + own)
+            return memo[name]
+        
+        path = ([], 0.0)
+        for name in self.steps:
+            chain = longest(name)
+            if chain[1] > path[1] or not path[0]:
+                path = chain
+        return path
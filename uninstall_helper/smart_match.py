@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Smart matching engine for Uninstall Helper.
+
+Builds a trigram/token index over process names, executable paths,
+installation directory names and package names so that fuzzy target
+resolution ("vscode" -> "code") is a posting-list lookup instead of a
+substring scan over every candidate.
+"""
+
+import os
+import re
+from collections import defaultdict, namedtuple
+
+Match = namedtuple("Match", ["score", "text", "kind", "payload"])
+
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+
+# How far below the best match other candidates may score and still be returned
+DEFAULT_MAX_GAP = 0.2
+
+# Well-known names whose executable or package differs from what users type.
+DEFAULT_ALIASES = {
+    "vscode": ["code"],
+    "visual studio code": ["code"],
+    "chrome": ["google-chrome", "google-chrome-stable"],
+    "google chrome": ["google-chrome", "google-chrome-stable", "chrome"],
+    "edge": ["microsoft-edge", "msedge"],
+    "teams": ["teams-for-linux", "ms-teams"],
+    "libreoffice": ["soffice"],
+    "sublime": ["sublime_text", "subl"],
+    "intellij": ["idea"],
+}
+
+
+def normalize(text):
+    """Lowercase a name and strip common executable suffixes."""
+    text = text.lower().strip()
+    for suffix in (".exe", ".app", ".desktop"):
+        if text.endswith(suffix):
+            text = text[:-len(suffix)]
+    return text
+
+
+def tokenize(text):
+    """Split a normalized name into alphanumeric tokens."""
+    return [token for token in _TOKEN_SPLIT.split(text) if token]
+
+
+def trigrams(text):
+    """Return the padded trigram set of a normalized name."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted trigram and token index with ranked fuzzy lookup."""
+    
+    def __init__(self, aliases=None):
+        self._entries = []
+        self._grams = defaultdict(set)
+        self._tokens = defaultdict(set)
+        self._exact = defaultdict(set)
+        self._seen = set()
+        self.aliases = dict(DEFAULT_ALIASES)
+        if aliases:
+            self.aliases.update({normalize(k): list(v) for k, v in aliases.items()})
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def add(self, text, kind, payload=None):
+        """
+        Add a name to the index.
+        
+        Args:
+            text (str): Name to index (process name, basename, package, ...)
+            kind (str): Category of the entry ('process', 'path', 'package')
+            payload: Arbitrary object returned with matches
+        
+        Returns:
+            int: Entry id, or -1 if the exact (text, kind, payload) was already indexed
+        """
+        norm = normalize(text)
+        if not norm:
+            return -1
+        key = (norm, kind, _hashable(payload))
+        if key in self._seen:
+            return -1
+        self._seen.add(key)
+        
+        entry_id = len(self._entries)
+        grams = trigrams(norm)
+        self._entries.append((text, norm, kind, payload, len(grams)))
+        for gram in grams:
+            self._grams[gram].add(entry_id)
+        for token in tokenize(norm):
+            self._tokens[token].add(entry_id)
+        self._exact[norm].add(entry_id)
+        return entry_id
+    
+    def search(self, query, kind=None, limit=50, min_score=0.5, max_gap=None):
+        """
+        Return ranked candidates for a query.
+        
+        Only entries sharing a trigram, token or alias with the query are
+        scored, so lookups touch the posting lists rather than the whole index.
+        
+        Args:
+            query (str): What the user typed
+            kind (str): Restrict results to one entry category
+            limit (int): Maximum number of matches returned
+            min_score (float): Minimum score in [0, 1] for a match
+            max_gap (float): Drop matches scoring more than this below the
+                best one, so helpers such as chrome_crashpad_handler fall
+                away once "chrome" itself matched (default: keep all)
+        
+        Returns:
+            list: Match tuples sorted by descending score
+        """
+        best = {}
+        for variant, weight in self._variants(query):
+            for entry_id, score in self._score_variant(variant).items():
+                score *= weight
+                if score > best.get(entry_id, 0.0):
+                    best[entry_id] = score
+        
+        matches = []
+        for entry_id, score in best.items():
+            text, _norm, entry_kind, payload, _size = self._entries[entry_id]
+            if kind is not None and entry_kind != kind:
+                continue
+            if score >= min_score:
+                matches.append(Match(round(score, 3), text, entry_kind, payload))
+        
+        matches.sort(key=lambda m: (-m.score, len(m.text), m.text))
+        if max_gap is not None and matches:
+            floor = matches[0].score - max_gap
+            matches = [match for match in matches if match.score >= floor]
+        return matches[:limit]
+    
+    def _variants(self, query):
+        norm = normalize(query)
+        variants = [(norm, 1.0)]
+        for alias in self.aliases.get(norm, []):
+            variants.append((normalize(alias), 0.95))
+        return variants
+    
+    def _score_variant(self, norm):
+        scores = {}
+        if not norm:
+            return scores
+        
+        # Exact name
+        for entry_id in self._exact.get(norm, ()):
+            scores[entry_id] = 1.0
+        
+        # Whole-token hits, penalised by how much of the name the token
+        # leaves unexplained, so that "chrome" outranks "chrome_crashpad_handler"
+        # (also when the query is an alias such as "google-chrome")
+        query_tokens = tokenize(norm)
+        for token in query_tokens:
+            for entry_id in self._tokens.get(token, ()):
+                entry_norm = self._entries[entry_id][1]
+                score = 0.6 + 0.4 * (len(token) / max(len(entry_norm), len(token)))
+                if score > scores.get(entry_id, 0.0):
+                    scores[entry_id] = score
+        
+        # Trigram similarity (Dice coefficient) over shared posting lists
+        query_grams = trigrams(norm)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for entry_id in self._grams.get(gram, ()):
+                shared[entry_id] += 1
+        for entry_id, count in shared.items():
+            size = self._entries[entry_id][4]
+            score = 2.0 * count / (len(query_grams) + size)
+            if score > scores.get(entry_id, 0.0):
+                scores[entry_id] = score
+        
+        return scores
+
+
+def _hashable(payload):
+    try:
+        hash(payload)
+        return payload
+    except TypeError:
+        return id(payload)
+
+
+def read_installed_packages(status_file="/var/lib/dpkg/status"):
+    """
+    Read installed package names from the dpkg status database.
+    
+    Args:
+        status_file (str): Path to the dpkg status file
+    
+    Returns:
+        list: Installed package names (empty if the database is unavailable)
+    """
+    packages = []
+    if not os.path.exists(status_file):
+        return packages
+    
+    name = None
+    try:
+        with open(status_file, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith("Package:"):
+                    name = line[8:].strip()
+                elif line.startswith("Status:") and name:
+                    if line.rstrip().endswith(" installed"):
+                        packages.append(name)
+                    name = None
+    except OSError:
+        pass
+    return packages
+
+
+def build_index(processes=(), roots=(), packages=(), aliases=None):
+    """
+    Build a TrigramIndex over the current system in one pass.
+    
+    Args:
+        processes (iterable): Process dicts with 'name' and 'exe' keys
+        roots (iterable): Directories whose immediate children are indexed
+        packages (iterable): Installed package names
+        aliases (dict): Extra name aliases (query -> list of names)
+    
+    Returns:
+        TrigramIndex: The populated index
+    """
+    index = TrigramIndex(aliases)
+    
+    for proc in processes:
+        if proc.get("name"):
+            index.add(proc["name"], "process", proc["pid"])
+        if proc.get("exe"):
+            index.add(os.path.basename(proc["exe"]), "process", proc["pid"])
+    
+    for root in roots:
+        try:
+            with os.scandir(root) as it:
+                for entry in it:
+                    index.add(entry.name, "path", entry.path)
+        except OSError:
+            continue
+    
+    for package in packages:
+        index.add(package, "package", package)
+    
+    return index
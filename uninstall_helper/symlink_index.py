@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Reverse symlink index for Uninstall Helper.
+
+Removing /opt/<app> leaves the links that pointed into it dangling in
+/usr/local/bin, /etc/alternatives, the desktop and autostart directories,
+and discovery only finds them when the link name happens to contain the
+search string.  This module scans the link directories once, calling
+readlink only on symlink dirents, and indexes link target -> link paths,
+so every link pointing into a removed tree (and links to those links,
+such as /usr/bin/java -> /etc/alternatives/java) is found with one
+sorted-range lookup per removed path.
+
+Links in /etc/alternatives, and the links leading to them, belong to
+update-alternatives, whose database would go out of sync if they were
+unlinked directly, so dangling alternatives are unregistered through
+update-alternatives instead, which also removes or re-points their links.
+"""
+
+import bisect
+import os
+import shutil
+import subprocess
+from collections import deque
+
+DEFAULT_LINK_ROOTS = [
+    "/usr/local/bin",
+    "/usr/bin",
+    "/etc/alternatives",
+    "/usr/local/share/applications",
+    "/etc/xdg/autostart",
+    "~/.local/bin",
+    "~/.local/share/applications",
+    "~/.config/autostart",
+]
+
+ALTERNATIVES_DIR = "/etc/alternatives"
+
+
+def link_target(path, target):
+    """Return a link's target as a normalized absolute path (not resolved further)."""
+    if not os.path.isabs(target):
+        target = os.path.join(os.path.dirname(path), target)
+    return os.path.normpath(target)
+
+
+class SymlinkIndex:
+    """
+    Target -> links index over a set of directories.
+    
+    Args:
+        roots (iterable): Directories to scan (subdirectories included)
+        max_depth (int): How deep to descend below each root
+    """
+    
+    def __init__(self, roots=DEFAULT_LINK_ROOTS, max_depth=3):
+        self.links = {}  # target -> list of link paths
+        for root in roots:
+            self._scan(os.path.expanduser(root), max_depth)
+        self.targets = sorted(self.links)
+    
+    def _scan(self, directory, depth):
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.is_symlink():
+                    target = link_target(entry.path, os.readlink(entry.path))
+                    self.links.setdefault(target, []).append(entry.path)
+                elif depth > 0 and entry.is_dir(follow_symlinks=False):
+                    self._scan(entry.path, depth - 1)
+            except OSError:
+                continue
+    
+    def __len__(self):
+        return sum(len(links) for links in self.links.values())
+    
+    def _links_under(self, path):
+        found = list(self.links.get(path, ()))
+        prefix = path.rstrip("/") + "/"
+        for i in range(bisect.bisect_left(self.targets, prefix), len(self.targets)):
+            if not self.targets[i].startswith(prefix):
+                break
+            found.extend(self.links[self.targets[i]])
+        return found
+    
+    def links_into(self, paths):
+        """
+        Find links pointing at or into the paths, following chains of links.
+        
+        Args:
+            paths (iterable): Removed files or directories
+        
+        Returns:
+            list: Link paths in discovery order
+        """
+        found = {}
+        queue = deque(os.path.normpath(path) for path in paths)
+        while queue:
+            path = queue.popleft()
+            for link in self._links_under(path):
+                if link not in found:
+                    found[link] = None
+                    queue.append(link)
+        return list(found)
+
+
+def remove_alternative(name, path):
+    """
+    Unregister an alternative with update-alternatives.
+    
+    update-alternatives drops it from its database and re-points the link
+    group to the next best alternative, or removes the group's links if it
+    was the last one.
+    
+    Args:
+        name (str): Link group name (the link's name in /etc/alternatives)
+        path (str): The alternative, i.e. the link's target
+    
+    Returns:
+        bool: True if update-alternatives succeeded
+    """
+    if not shutil.which("update-alternatives"):
+        return False
+    try:
+        result = subprocess.run(["update-alternatives", "--remove", name, path],
+                                capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def sweep(index, removed_paths, guard=None, remove=os.unlink, alternatives_dir=ALTERNATIVES_DIR,
+          unregister=remove_alternative):
+    """
+    Remove links into removed trees that are now dangling.
+    
+    Links whose target still exists (e.g. it was re-created) are kept.
+    Links in the alternatives directory are unregistered instead, and
+    links into it (such as /usr/bin/editor) are left to update-alternatives.
+    
+    Args:
+        index (SymlinkIndex): Index built over the link directories
+        removed_paths (iterable): Paths that were removed
+        guard (path_guard.PathGuard): Optional guard every link is checked against
+        remove (callable): Unlink function
+        alternatives_dir (str): Directory managed by update-alternatives
+        unregister (callable): unregister(name, target) -> bool for those links
+    
+    Returns:
+        list: (link, target) tuples that were removed or unregistered
+    """
+    alternatives_dir = os.path.normpath(alternatives_dir)
+    links = index.links_into(removed_paths)
+    alternatives = [link for link in links if os.path.dirname(link) == alternatives_dir]
+    
+    removed = []
+    for link in links:
+        if not os.path.islink(link) or os.path.exists(link):
+            continue
+        if guard is not None and guard.check(link):
+            continue
+        try:
+            target = os.readlink(link)
+            if os.path.dirname(link_target(link, target)) == alternatives_dir:
+                continue
+            if link in alternatives:
+                if not unregister(os.path.basename(link), target):
+                    continue
+            else:
+                remove(link)
+            removed.append((link, target))
+        except OSError:
+            continue
+    return removed
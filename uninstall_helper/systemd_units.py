@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+systemd unit discovery for Uninstall Helper.
+
+Maps matched PIDs to the systemd units that own them by reading
+/proc/<pid>/cgroup, so a service can be stopped and disabled as a whole
+with one batched systemctl call instead of killing its workers one by one
+(which systemd would simply restart).
+"""
+
+import os
+import subprocess
+from collections import namedtuple
+
+Unit = namedtuple("Unit", ["name", "manager", "cgroup"])
+
+# Units that must never be stopped on behalf of an uninstall
+PROTECTED_PREFIXES = (
+    "systemd-", "dbus", "user@", "user-runtime-dir@", "getty@", "serial-getty@",
+    "ssh", "sshd", "polkit", "NetworkManager", "networkd", "udisks2", "login",
+)
+
+_UNIT_SUFFIXES = (".service", ".scope")
+
+
+def parse_cgroup(data):
+    """
+    Extract the owning unit from the contents of /proc/<pid>/cgroup.
+    
+    Args:
+        data (str): File contents
+    
+    Returns:
+        Unit: The unit, or None if the process is not in a stoppable unit.
+              manager is 'system' or the uid of a user manager ('1000').
+    """
+    path = None
+    for line in data.splitlines():
+        parts = line.split(":", 2)
+        if len(parts) != 3:
+            continue
+        # cgroup v2 unified line, or the v1 named systemd hierarchy
+        if parts[0] == "0" and parts[1] == "":
+            path = parts[2]
+            break
+        if parts[1] == "name=systemd":
+            path = parts[2]
+    if not path:
+        return None
+    
+    components = [c for c in path.split("/") if c]
+    manager = "system"
+    unit = None
+    for component in components:
+        if component.startswith("user@") and component.endswith(".service"):
+            # Everything below belongs to that user's systemd instance
+            manager = component[len("user@"):-len(".service")]
+            unit = None
+            continue
+        if component.endswith(_UNIT_SUFFIXES):
+            unit = component
+    if unit is None:
+        return None
+    # Session and manager scopes are not owned by the software
+    if unit == "init.scope" or unit.startswith("session-") or not unit.endswith(".service"):
+        return None
+    return Unit(unit, manager, path)
+
+
+def read_unit(pid, proc_root="/proc"):
+    """Return the Unit owning a PID, or None."""
+    try:
+        with open(f"{proc_root}/{pid}/cgroup", "r") as f:
+            return parse_cgroup(f.read())
+    except OSError:
+        return None
+
+
+def cgroup_pids(cgroup, cgroup_root="/sys/fs/cgroup"):
+    """
+    Read every PID in a unit's cgroup (including child cgroups).
+    
+    Args:
+        cgroup (str): cgroup path as found in /proc/<pid>/cgroup
+        cgroup_root (str): Mount point of the unified hierarchy
+    
+    Returns:
+        set: PIDs, or None if the cgroup filesystem cannot be read
+    """
+    base = os.path.join(cgroup_root, cgroup.lstrip("/"))
+    if not os.path.isdir(base):
+        return None
+    pids = set()
+    for root, _dirs, files in os.walk(base):
+        if "cgroup.procs" in files:
+            try:
+                with open(os.path.join(root, "cgroup.procs"), "r") as f:
+                    pids.update(int(line) for line in f if line.strip())
+            except (OSError, ValueError):
+                continue
+    return pids
+
+
+def is_protected(unit_name):
+    """Check whether a unit must never be stopped."""
+    return unit_name.startswith(PROTECTED_PREFIXES)
+
+
+def group_by_unit(pids, target_name, proc_root="/proc", cgroup_root="/sys/fs/cgroup"):
+    """
+    Group matched PIDs by owning service unit in one pass over /proc.
+    
+    A unit is only returned when it is safe to stop on the target's behalf:
+    its name contains the target, or every process in its cgroup was
+    matched.  That keeps e.g. cron.service alive when one of its jobs
+    happens to run the target.
+    
+    Args:
+        pids (iterable): Matched PIDs
+        target_name (str): Name of the software being removed
+        proc_root (str): procfs mount point
+        cgroup_root (str): cgroup2 mount point
+    
+    Returns:
+        dict: Unit -> sorted list of matched PIDs
+    """
+    matched = set(pids)
+    by_unit = {}
+    for pid in matched:
+        unit = read_unit(pid, proc_root)
+        if unit is not None and not is_protected(unit.name):
+            by_unit.setdefault(unit, []).append(pid)
+    
+    target_name = target_name.lower()
+    stoppable = {}
+    for unit, unit_pids in by_unit.items():
+        if target_name not in unit.name.lower():
+            members = cgroup_pids(unit.cgroup, cgroup_root)
+            if members is None or not members <= matched:
+                continue
+        stoppable[unit] = sorted(unit_pids)
+    return stoppable
+
+
+def _user_name(uid):
+    try:
+        import pwd
+        return pwd.getpwuid(int(uid)).pw_name
+    except (ImportError, KeyError, ValueError):
+        return uid
+
+
+def stop_units(units, disable=True, timeout=60, runner=subprocess.run):
+    """
+    Stop (and optionally disable) units with one systemctl call per manager.
+    
+    Args:
+        units (iterable): Unit tuples
+        disable (bool): Also disable the units so they do not come back at boot
+        timeout (int): Seconds to wait for each systemctl invocation
+        runner (callable): subprocess.run compatible callable
+    
+    Returns:
+        dict: Unit name -> True if stopped, False otherwise
+    """
+    by_manager = {}
+    for unit in units:
+        by_manager.setdefault(unit.manager, []).append(unit.name)
+    
+    outcome = {}
+    for manager, names in by_manager.items():
+        cmd = ["systemctl", "--no-ask-password"]
+        if manager != "system":
+            cmd += ["--user", "-M", f"{_user_name(manager)}@"]
+        cmd += ["disable", "--now"] if disable else ["stop"]
+        cmd += sorted(set(names))
+        try:
+            result = runner(cmd, capture_output=True, text=True, timeout=timeout)
+            ok = result.returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            ok = False
+        for name in names:
+            outcome[name] = ok
+    return outcome
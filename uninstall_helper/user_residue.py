@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Per-user residue scanner for Uninstall Helper.
+
+When run as root, '~' only means root's home, so leftovers in every other
+account (~/.config/<app>, ~/.cache/<app>, ~/.local/share/<app>, ...) were
+never found.  This module enumerates home directories from the passwd
+database and checks each user's XDG locations concurrently with a
+bounded thread pool.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+Residue = namedtuple("Residue", ["user", "path", "size"])
+
+# Relative to each home; "" is the home itself, where only dot-entries count
+DEFAULT_LOCATIONS = [".config", ".cache", ".local/share", ".local/state", ".local/bin", ""]
+
+_NO_LOGIN_SHELLS = ("nologin", "false")
+
+
+def uid_min(login_defs="/etc/login.defs"):
+    """Return the first regular-user UID from login.defs (default 1000)."""
+    try:
+        with open(login_defs, "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[0] == "UID_MIN":
+                    return int(parts[1])
+    except (OSError, ValueError):
+        pass
+    return 1000
+
+
+def list_homes(passwd_entries=None, min_uid=None):
+    """
+    Enumerate the home directories of login accounts.
+    
+    Args:
+        passwd_entries (iterable): pwd.struct_passwd-like entries (defaults to pwd.getpwall())
+        min_uid (int): Lowest regular-user UID (defaults to login.defs UID_MIN)
+    
+    Returns:
+        list: (user, home) tuples, root first, without duplicate homes
+    """
+    if passwd_entries is None:
+        try:
+            import pwd
+        except ImportError:
+            return []
+        passwd_entries = pwd.getpwall()
+    if min_uid is None:
+        min_uid = uid_min()
+    
+    homes = []
+    seen = set()
+    for entry in sorted(passwd_entries, key=lambda e: e.pw_uid):
+        if entry.pw_uid != 0 and entry.pw_uid < min_uid:
+            continue
+        if entry.pw_shell.endswith(_NO_LOGIN_SHELLS) and entry.pw_uid != 0:
+            continue
+        home = os.path.normpath(entry.pw_dir or "")
+        if home in seen or home == "/" or not os.path.isdir(home):
+            continue
+        seen.add(home)
+        homes.append((entry.pw_name, home))
+    return homes
+
+
+def tree_size(path):
+    """
+    Total size in bytes of a file or directory tree (symlinks not followed).
+    
+    Args:
+        path (str): Path to measure
+    
+    Returns:
+        int: Size in bytes
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return 0
+    if not os.path.isdir(path) or os.path.islink(path):
+        return st.st_size
+    
+    total = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def scan_home(user, home, software_name, locations=DEFAULT_LOCATIONS, sizes=True):
+    """
+    Find entries matching the software in one user's residue locations.
+    
+    Args:
+        user (str): Account name
+        home (str): Home directory
+        software_name (str): Name of the software
+        locations (list): Directories relative to the home
+        sizes (bool): Whether to measure each match
+    
+    Returns:
+        list: Residue tuples
+    """
+    software_name = software_name.lower()
+    found = []
+    for location in locations:
+        directory = os.path.join(home, location) if location else home
+        try:
+            with os.scandir(directory) as it:
+                names = [entry.name for entry in it]
+        except OSError:
+            continue
+        for name in names:
+            if not location and not name.startswith("."):
+                continue
+            if software_name in name.lower():
+                path = os.path.join(directory, name)
+                found.append(Residue(user, path, tree_size(path) if sizes else None))
+    return found
+
+
+def scan_all_users(software_name, homes=None, locations=DEFAULT_LOCATIONS, max_workers=8, sizes=True):
+    """
+    Scan every user's residue locations concurrently.
+    
+    Args:
+        software_name (str): Name of the software
+        homes (list): (user, home) tuples (defaults to list_homes())
+        locations (list): Directories relative to each home
+        max_workers (int): Upper bound on concurrent scans
+        sizes (bool): Whether to measure each match
+    
+    Returns:
+        list: Residue tuples in home order
+    """
+    if homes is None:
+        homes = list_homes()
+    if not homes:
+        return []
+    
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(homes)))) as pool:
+        futures = [pool.submit(scan_home, user, home, software_name, locations, sizes)
+                   for user, home in homes]
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+
+def format_size(size):
+    """Format a byte count for display."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024.0
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Post-uninstall verification for Uninstall Helper.
+
+Confirming a removal used to mean running --safe again: a full process
+scan and filesystem walk.  Instead, the run records what it acted on in a
+manifest (PIDs with their start times, lstat fingerprints of removed
+paths, removed packages) and rechecks exactly those items in one batched
+pass afterwards, so verification costs O(items removed).
+"""
+
+import os
+from collections import namedtuple
+
+import psutil
+
+from . import package_graph
+
+Fingerprint = namedtuple("Fingerprint", ["dev", "ino", "mode", "mtime_ns"])
+Survivor = namedtuple("Survivor", ["kind", "item", "state"])
+
+
+def fingerprint(path):
+    """Return the lstat fingerprint of a path, or None if it does not exist."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None
+    return Fingerprint(st.st_dev, st.st_ino, st.st_mode, st.st_mtime_ns)
+
+
+def installed_packages():
+    """Return the names of the packages installed on this system (dpkg or pacman)."""
+    return {package.name for package in package_graph.load_system()}
+
+
+class Manifest:
+    """Record of the processes, paths and packages a run removed."""
+    
+    def __init__(self):
+        self.processes = {}  # pid -> create_time
+        self.paths = {}      # path -> Fingerprint
+        self.packages = set()
+    
+    def __len__(self):
+        return len(self.processes) + len(self.paths) + len(self.packages)
+    
+    def add_processes(self, pids):
+        """Record processes about to be terminated (with start times, so reused PIDs are not confused)."""
+        for pid in pids:
+            try:
+                self.processes[pid] = psutil.Process(pid).create_time()
+            except psutil.Error:
+                continue
+    
+    def add_paths(self, paths):
+        """Record paths about to be removed."""
+        for path in paths:
+            fp = fingerprint(path)
+            if fp is not None:
+                self.paths[path] = fp
+    
+    def add_packages(self, names):
+        """Record packages that were removed."""
+        self.packages.update(names)
+
+
+def check(manifest, list_packages=installed_packages):
+    """
+    Recheck every item of a manifest once.
+    
+    A process survived if its PID still runs with the same start time.  A
+    path survived if the same inode is still there, and reappeared if
+    something else now exists at it.  A package survived if it is still
+    installed.
+    
+    Args:
+        manifest (Manifest): What the run removed
+        list_packages (callable): Returns the set of installed package names
+    
+    Returns:
+        list: Survivor tuples; empty when everything is gone
+    """
+    survivors = []
+    for pid, create_time in sorted(manifest.processes.items()):
+        try:
+            proc = psutil.Process(pid)
+            if proc.create_time() == create_time and proc.status() != psutil.STATUS_ZOMBIE:
+                survivors.append(Survivor("process", pid, "survived"))
+        except psutil.Error:
+            continue
+    for path, recorded in sorted(manifest.paths.items()):
+        current = fingerprint(path)
+        if current is None:
+            continue
+        same = (current.dev, current.ino) == (recorded.dev, recorded.ino)
+        survivors.append(Survivor("path", path, "survived" if same else "reappeared"))
+    if manifest.packages:
+        installed = list_packages()
+        for name in sorted(manifest.packages & installed):
+            survivors.append(Survivor("package", name, "survived"))
+    return survivors